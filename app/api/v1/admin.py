@@ -0,0 +1,63 @@
+import asyncio
+import secrets
+import tracemalloc
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from app.core.profiling import get_profiling_settings, memory_snapshots
+from app.schemas.admin import MemoryDiff, MemorySnapshot, TracemallocStatus
+
+def require_admin_token(x_admin_token: Optional[str] = Header(default=None)):
+    expected = get_profiling_settings().admin_token
+    # Without ADMIN_TOKEN configured the admin endpoints do not exist
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin_token)])
+
+GROUP_BY_PATTERN = "^(lineno|filename|traceback)$"
+
+def tracemalloc_status() -> TracemallocStatus:
+    if not memory_snapshots.tracing:
+        return TracemallocStatus(tracing=False)
+    current, peak = tracemalloc.get_traced_memory()
+    return TracemallocStatus(tracing=True, traced_current_kib=round(current / 1024, 1), traced_peak_kib=round(peak / 1024, 1))
+
+@router.post("/tracemalloc/start", response_model=TracemallocStatus)
+async def start_tracemalloc(frames: int = Query(default=1, ge=1, le=100, description="Frames kept per allocation traceback")):
+    """Start tracing allocations; tracing slows the worker down, so stop it when done."""
+    memory_snapshots.start(frames)
+    return tracemalloc_status()
+
+@router.post("/tracemalloc/stop", response_model=TracemallocStatus)
+async def stop_tracemalloc():
+    memory_snapshots.stop()
+    return tracemalloc_status()
+
+@router.post("/tracemalloc/snapshots", response_model=MemorySnapshot)
+async def take_memory_snapshot(
+    limit: int = Query(default=20, ge=1, le=500),
+    group_by: str = Query(default="lineno", pattern=GROUP_BY_PATTERN),
+):
+    if not memory_snapshots.tracing:
+        raise HTTPException(status_code=409, detail="tracemalloc is not running; start it first")
+    snapshot_id, snapshot = await asyncio.to_thread(memory_snapshots.take)
+    top = await asyncio.to_thread(memory_snapshots.top, snapshot, limit, group_by)
+    return MemorySnapshot(id=snapshot_id, top=top, **tracemalloc_status().model_dump())
+
+@router.get("/tracemalloc/diff", response_model=MemoryDiff)
+async def diff_memory_snapshots(
+    base: int = Query(description="Earlier snapshot ID"),
+    current: Optional[int] = Query(default=None, description="Later snapshot ID; defaults to the latest"),
+    limit: int = Query(default=20, ge=1, le=500),
+    group_by: str = Query(default="lineno", pattern=GROUP_BY_PATTERN),
+):
+    current = current if current is not None else memory_snapshots.latest_id()
+    if current is None:
+        raise HTTPException(status_code=404, detail="No snapshots have been taken")
+    try:
+        total, top = await asyncio.to_thread(memory_snapshots.diff, base, current, limit, group_by)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    return MemoryDiff(base=base, current=current, total_diff_kib=round(total / 1024, 1), top=top)
@@ -1,12 +1,35 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
-from app.schemas.blacklist import BlacklistCreate, Blacklist as BlacklistOut
+from app.schemas.blacklist import BlacklistCreate, Blacklist as BlacklistOut, BlacklistImportReport
 from app.services import blacklist as service
+from app.services import blacklist_import as import_service
 
 router = APIRouter(prefix="/blacklist", tags=["Blacklist"])
 
 @router.post("/", response_model=BlacklistOut)
-async def create_blacklist_entry(blacklist_entry: BlacklistCreate, db: Session = Depends(get_db)):
-    return service.create_new_blacklist(db, blacklist_entry)
+async def create_blacklist_entry(blacklist_entry: BlacklistCreate, db: AsyncSession = Depends(get_db)):
+    return await service.create_new_blacklist(db, blacklist_entry)
 
+@router.post(
+    "/import",
+    response_model=BlacklistImportReport,
+    openapi_extra={"requestBody": {"required": True, "content": {
+        "text/csv": {"schema": {"type": "string"}},
+        "application/x-ndjson": {"schema": {"type": "string"}},
+    }}},
+)
+async def import_blacklist_entries(
+    request: Request,
+    import_format: Optional[str] = Query(default=None, alias="format", pattern="^(csv|ndjson)$", description="Overrides the Content-Type"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Bulk import from the raw request body (e.g. `curl --data-binary @list.csv -H "Content-Type: text/csv"`).
+    The body is parsed while it streams in; CSV files need a header row with name, email, phone and date_of_birth.
+    """
+    fmt = import_format or import_service.format_from_content_type(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(status_code=415, detail="Upload the file as text/csv or application/x-ndjson")
+    return await import_service.import_blacklist(db, request.stream(), fmt)
@@ -1,46 +1,195 @@
 import logging
 import time
-from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.schemas.customer import CustomerCreate, CustomerUpdate, Customer as CustomerOut
+import httpx
+from typing import Any, Optional
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.database import get_db, get_read_db, get_session_factory
+from app.core.http_client import get_fraud_client
+from app.schemas.customer import CustomerCreate, CustomerUpdate, CustomerPage, BatchOnboardingResult, Customer as CustomerOut
+from app.schemas.onboarding_job import OnboardingJob
+from app.schemas.risk_assessment import CustomerRisk
 from app.services import customer as service
+from app.services import customer_batch as batch_service
+from app.services import onboarding_jobs
+from app.services.idempotency import IdempotencyKeyReuseError, StoredResponse, get_idempotency_store, request_fingerprint
+from app.services import customer_export as exporter
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/customers", tags=["Customers"])
 
-@router.get("/", response_model=list[CustomerOut])
-async def list_customers(db: Session = Depends(get_db)):
-    logger.info("Attempting to list all customers.")
-    customers = service.get_all_customers(db)
-    logger.info(f"Successfully retrieved {len(customers)} customers.")
-    return customers
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_BATCH_SIZE = 5000
+
+@router.get("/", response_model=CustomerPage)
+async def list_customers(
+    response: Response,
+    cursor: Optional[int] = Query(default=None, ge=0, description="`next_cursor` from the previous page"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    name: Optional[str] = None,
+    email: Optional[str] = None,
+    phone: Optional[str] = None,
+    national_id: Optional[str] = None,
+    country: Optional[str] = Query(default=None, description="Customers with at least one address in this country"),
+    if_none_match: Optional[str] = Header(default=None, alias="If-None-Match"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    logger.info("Attempting to list customers.")
+    etag, page = await service.get_customers_page(
+        db, cursor, limit, if_none_match, name=name, email=email, phone=phone, national_id=national_id, country=country
+    )
+    if page is None:
+        logger.info("Customer page unchanged since %s.", etag)
+        return Response(status_code=304, headers={"ETag": etag})
+    logger.info("Successfully retrieved %s customers.", len(page.items))
+    response.headers["ETag"] = etag
+    return page
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_customers(
+    export_format: str = Query(default="ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    since_id: Optional[int] = Query(default=None, ge=0, description="Only export customers with a greater id (incremental pulls)"),
+    db: AsyncSession = Depends(get_read_db, scope="request"),
+):
+    # The session must stay open until the last chunk has been streamed
+    logger.info("Exporting customers as %s since id %s.", export_format, since_id)
+    return StreamingResponse(
+        exporter.EXPORTERS[export_format](db, since_id),
+        media_type=exporter.MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="customers.{export_format}"'},
+    )
+
+@router.get("/jobs/{job_id}", response_model=OnboardingJob)
+async def get_onboarding_job(
+    job_id: str,
+    wait: float = Query(default=0, ge=0, description="Seconds to wait for a PENDING job to finish (long-poll), capped by ONBOARDING_STATUS_MAX_WAIT"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return await onboarding_jobs.wait_for_job(db, job_id, wait)
 
 @router.get("/{customer_id}", response_model=CustomerOut)
-async def get_customer(customer_id: int, db: Session = Depends(get_db)):
-    return service.get_customer_by_id(db, customer_id)
+async def get_customer(
+    customer_id: int,
+    if_none_match: Optional[str] = Header(default=None, alias="If-None-Match"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    etag, body = await service.get_customer_json(db, customer_id, if_none_match)
+    if body is None:
+        return Response(status_code=304, headers={"ETag": etag})
+    # Already serialized (and possibly cached), so skip response_model validation
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+@router.get("/{customer_id}/risk", response_model=CustomerRisk)
+async def get_customer_risk(customer_id: int, db: AsyncSession = Depends(get_read_db)):
+    """Onboarding status and risk score, with the stored result of each risk tier."""
+    return await service.get_customer_risk(db, customer_id)
 
-@router.post("/", response_model=CustomerOut)
-async def create_customer(customer: CustomerCreate, db: Session = Depends(get_db)):
+def prefers_async(prefer: Optional[str]) -> bool:
+    return prefer is not None and any(
+        preference.split(";")[0].strip().lower() == "respond-async" for preference in prefer.split(",")
+    )
+
+def accepted_job_response(body: dict) -> JSONResponse:
+    return JSONResponse(
+        status_code=202,
+        content=body,
+        headers={"Location": router.url_path_for("get_onboarding_job", job_id=body["id"]), "Preference-Applied": "respond-async"},
+    )
+
+@router.post("/", response_model=CustomerOut, responses={202: {"model": OnboardingJob, "description": "Queued (`Prefer: respond-async`)"}})
+async def create_customer(
+    customer: CustomerCreate,
+    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+    fraud_client: httpx.AsyncClient = Depends(get_fraud_client),
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key", min_length=1, max_length=255),
+    prefer: Optional[str] = Header(default=None, description="`respond-async` queues the onboarding and answers 202 with a job"),
+):
     start_time = time.perf_counter()
+    respond_async = prefers_async(prefer)
 
-    create_response = await service.create_new_customer(db, customer)
+    if idempotency_key is not None:
+        create_response = await create_customer_idempotently(idempotency_key, customer, session_factory, fraud_client, respond_async)
+    elif respond_async:
+        job = await onboarding_jobs.submit_onboarding(db, customer, fraud_client)
+        create_response = accepted_job_response(OnboardingJob.model_validate(job).model_dump(mode="json"))
+    else:
+        create_response = await service.create_new_customer(db, customer, fraud_client)
 
     process_time = time.perf_counter() - start_time
 
-    logger.info(f"Customer creation took {process_time:.2f} seconds.")
+    logger.info("Customer creation took %.2f seconds.", process_time)
 
     return create_response
 
+async def create_customer_idempotently(
+    key: str, customer: CustomerCreate, session_factory: async_sessionmaker, fraud_client: httpx.AsyncClient, respond_async: bool = False
+):
+    fingerprint = request_fingerprint(customer.model_dump(mode="json"))
+
+    async def onboard() -> StoredResponse:
+        # Runs detached from the request, so it must not use the request's session
+        try:
+            async with session_factory() as db:
+                if respond_async:
+                    # A retried submission gets the same job back instead of queueing another
+                    job = await onboarding_jobs.submit_onboarding(db, customer, fraud_client)
+                    return StoredResponse(status_code=202, body=OnboardingJob.model_validate(job).model_dump(mode="json"))
+                created = await service.create_new_customer(db, customer, fraud_client)
+                return StoredResponse(status_code=200, body=CustomerOut.model_validate(created).model_dump(mode="json"))
+        except HTTPException as e:
+            return StoredResponse(status_code=e.status_code, body={"detail": e.detail}, headers=e.headers)
+
+    try:
+        stored, replayed = await get_idempotency_store().execute(key, fingerprint, onboard)
+    except IdempotencyKeyReuseError as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request payload")
+
+    if stored.status_code == 202:
+        response = accepted_job_response(stored.body)
+    else:
+        response = JSONResponse(status_code=stored.status_code, content=stored.body, headers=stored.headers)
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+@router.post("/batch", response_model=BatchOnboardingResult)
+async def create_customers_batch(
+    items: list[dict[str, Any]] = Body(max_length=MAX_BATCH_SIZE, description="CustomerCreate payloads, validated one by one"),
+    db: AsyncSession = Depends(get_db),
+    fraud_client: httpx.AsyncClient = Depends(get_fraud_client),
+):
+    start_time = time.perf_counter()
+
+    batch_response = await batch_service.onboard_customers_batch(db, items, fraud_client)
+
+    process_time = time.perf_counter() - start_time
+
+    logger.info("Batch onboarding of %s customers took %.2f seconds.", len(items), process_time)
+
+    return batch_response
+
 @router.put("/{customer_id}", response_model=CustomerOut)
-async def update_customer(customer_id: int, customer: CustomerUpdate, db: Session = Depends(get_db)):
-    return service.update_existing_customer(db, customer_id, customer)
+async def update_customer(
+    customer_id: int,
+    customer: CustomerUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(default=None, alias="If-Match", description="ETag from a previous GET; 412 if the customer changed since"),
+    db: AsyncSession = Depends(get_db),
+    fraud_client: httpx.AsyncClient = Depends(get_fraud_client),
+):
+    # Tiers whose inputs changed are re-assessed; 422 if the updated customer fails
+    updated = await service.update_existing_customer(db, customer_id, customer, if_match, fraud_client)
+    response.headers["ETag"] = service.customer_etag(updated)
+    return updated
 
 @router.delete("/{customer_id}", status_code=204)
-async def delete_customer(customer_id: int, db: Session = Depends(get_db)):
-    service.delete_customer_by_id(db, customer_id)
+async def delete_customer(customer_id: int, db: AsyncSession = Depends(get_db)):
+    await service.delete_customer_by_id(db, customer_id)
     return JSONResponse (
         status_code=204,
         content={"message" : "Customer deleted successfully !"}
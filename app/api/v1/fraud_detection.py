@@ -2,18 +2,23 @@
 Fraud Detection API: Mock implementation
 
 Provides a POST endpoint to assess customer fraud risk based on name, address, DOB, and email.
+- A batch variant scores a list of requests in one round trip, returning results in request order,
+  using the columnar engine in app/services/fraud_scoring.py (same results as `mock_score`)
 - Returns a numeric risk score and a category (LOW, MEDIUM, HIGH)
-- Entirely self-contained in this file (no outside dependencies except FastAPI/Pydantic)
+- `mock_score` needs nothing beyond FastAPI/Pydantic; only the batch variant needs numpy
 - Designed for NFRs: Input validation, error handling, security best practices, readable and extensible
 """
 
 import logging
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Body, HTTPException, status
 from pydantic import BaseModel, Field, EmailStr
 from datetime import date
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 import re
 
+if TYPE_CHECKING:
+    from app.services.fraud_scoring import ColumnarFraudScorer
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/fraud", tags=["Fraud Detection"])
@@ -36,6 +41,8 @@ HIGH_RISK_COUNTRIES = {"Narnia", "Fraudland", "Scamistan"}
 MIN_AGE = 18
 MAX_AGE = 99
 
+MAX_BATCH_SIZE = 500
+
 def calculate_age(dob: date) -> int:
     today = date.today()
     return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
@@ -74,6 +81,29 @@ def mock_score(request: FraudRequest) -> FraudResult:
         category = "LOW"
     return FraudResult(score=capped_score, category=category, reason=reasons)
 
+def _score_row(name: str, address: str, date_of_birth: date, email: str):
+    result = mock_score(FraudRequest.model_construct(name=name, address=address, date_of_birth=date_of_birth, email=email))
+    return result.score, result.reason
+
+_batch_scorer: Optional["ColumnarFraudScorer"] = None
+
+def get_batch_scorer() -> "ColumnarFraudScorer":
+    # Built on first use so importing the app does not import NumPy
+    global _batch_scorer
+    if _batch_scorer is None:
+        from app.services.fraud_scoring import ColumnarFraudScorer
+        _batch_scorer = ColumnarFraudScorer(HIGH_RISK_NAMES, HIGH_RISK_COUNTRIES, SUSPICIOUS_EMAIL_DOMAINS, MIN_AGE, MAX_AGE, _score_row)
+    return _batch_scorer
+
+def score_batch(requests: List[FraudRequest]) -> List[FraudResult]:
+    scored = get_batch_scorer().score(
+        [r.name for r in requests], [r.address for r in requests], [r.date_of_birth for r in requests], [r.email for r in requests],
+    )
+    return [
+        FraudResult(score=int(score), category=str(category), reason=reason)
+        for score, category, reason in zip(scored.scores, scored.categories, scored.reasons)
+    ]
+
 @router.post("/fraud-detection", response_model=FraudResult, status_code=status.HTTP_200_OK, tags=["Fraud Detection"], summary="Detect customer fraud risk", responses={400: {"description": "Invalid input"}})
 def detect_customer_fraud(request: FraudRequest):
     """
@@ -84,8 +114,19 @@ def detect_customer_fraud(request: FraudRequest):
     - **email**: Validated email address
     """
     try:
-        logger.info(f"Received fraud detection request for email: {request.email}")
+        logger.info("Received fraud detection request for email: %s", request.email)
         result = mock_score(request)
         return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Fraud assessment failed: {str(e)}")
+
+@router.post("/fraud-detection/batch", response_model=List[FraudResult], status_code=status.HTTP_200_OK, tags=["Fraud Detection"], summary="Detect fraud risk for a batch of customers", responses={400: {"description": "Invalid input"}})
+def detect_customer_fraud_batch(requests: List[FraudRequest] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE)):
+    """
+    Scores each request like `/fraud-detection`; the i-th result belongs to the i-th request.
+    """
+    try:
+        logger.info("Received fraud detection batch of %s requests", len(requests))
+        return score_batch(requests)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Fraud assessment failed: {str(e)}")
@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.core.startup import startup_state
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+@router.get("/live")
+async def liveness():
+    """The process is up; says nothing about whether it can serve onboardings yet."""
+    return {"status": "ok"}
+
+@router.get("/ready")
+async def readiness():
+    """200 once every startup phase has finished; 503 while starting or shutting down."""
+    if not startup_state.ready:
+        return JSONResponse(status_code=503, content={"status": startup_state.status})
+    return {
+        "status": startup_state.status,
+        "startup_ms": round(startup_state.total * 1000, 1),  # type: ignore[operator]
+        "phases_ms": {name: round(elapsed * 1000, 1) for name, elapsed in startup_state.phases.items()},
+    }
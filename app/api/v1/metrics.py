@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import CONTENT_TYPE, REGISTRY
+
+router = APIRouter(tags=["Metrics"])
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint; see app/core/metrics.py for what is recorded."""
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,79 @@
+"""Micro-batching of concurrent async calls: one `send_batch` call per key for items submitted within `max_wait`."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+SendBatch = Callable[[Any, List[Any]], Awaitable[Sequence[Any]]]
+
+
+class MicroBatcher:
+    def __init__(self, send_batch: SendBatch, max_batch_size: int = 50, max_wait: float = 0.005):
+        self._send_batch = send_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[Hashable, List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._in_flight: set = set()
+        self.batches_sent = 0
+        self.items_sent = 0
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Futures and timers belong to one event loop; start fresh on a new one
+            self._loop = loop
+            self._pending = {}
+            self._timers = {}
+            self._in_flight = set()
+        return loop
+
+    async def submit(self, key: Hashable, item: Any) -> Any:
+        loop = self._bind_loop()
+        future = loop.create_future()
+        queue = self._pending.setdefault(key, [])
+        queue.append((item, future))
+        if len(queue) >= self.max_batch_size:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.max_wait, self._flush, key)
+        return await future
+
+    def _flush(self, key: Hashable):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, [])
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._send(key, batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, key: Hashable, batch: List[Tuple[Any, asyncio.Future]]):
+        # Submitters that were cancelled while queued are dropped from the batch
+        live = [(item, future) for item, future in batch if not future.done()]
+        if not live:
+            return
+        self.batches_sent += 1
+        self.items_sent += len(live)
+        logger.debug("Sending batch of %s item(s)", len(live))
+        try:
+            results = await self._send_batch(key, [item for item, _ in live])
+            if len(results) != len(live):
+                raise RuntimeError(f"Batch returned {len(results)} results for {len(live)} items")
+        except Exception as e:
+            for _, future in live:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(live, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,73 @@
+"""Size-bounded LRU cache with per-entry TTL; expired entries stay readable via `get_stale` for `stale_ttl`."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float, stale_ttl: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a fresh value, or None. Expired entries stay around for get_stale."""
+        item = self._data.get(key)
+        if item is not None:
+            expires_at, value = item
+            now = self._clock()
+            if now < expires_at:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            if now >= expires_at + self.stale_ttl:
+                del self._data[key]
+        self.misses += 1
+        return None
+
+    def get_stale(self, key: Hashable) -> Optional[Any]:
+        """Return a value that has expired but is still inside the stale window."""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if self._clock() >= expires_at + self.stale_ttl:
+            del self._data[key]
+            return None
+        self.stale_hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        self._data[key] = (self._clock() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,248 @@
+"""Settings are read in `from_env` when a subsystem starts (after `.env` is loaded), not at import time."""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+
+def env_str(name: str, default: Optional[str] = None) -> Optional[str]:
+    value = os.getenv(name)
+    return value if value not in (None, "") else default
+
+
+def env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class FraudClientSettings:
+    """Connection pool and timeout tuning for the shared fraud API client."""
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    timeout: float = 30.0
+    connect_timeout: float = 5.0
+    http2: bool = False
+
+    @classmethod
+    def from_env(cls) -> "FraudClientSettings":
+        return cls(
+            max_connections=env_int("FRAUD_CLIENT_MAX_CONNECTIONS", cls.max_connections),
+            max_keepalive_connections=env_int("FRAUD_CLIENT_MAX_KEEPALIVE", cls.max_keepalive_connections),
+            keepalive_expiry=env_float("FRAUD_CLIENT_KEEPALIVE_EXPIRY", cls.keepalive_expiry),
+            timeout=env_float("FRAUD_CLIENT_TIMEOUT", cls.timeout),
+            connect_timeout=env_float("FRAUD_CLIENT_CONNECT_TIMEOUT", cls.connect_timeout),
+            http2=env_bool("FRAUD_CLIENT_HTTP2", cls.http2),
+        )
+
+
+@dataclass(frozen=True)
+class FraudCacheSettings:
+    """Caching of fraud API decisions keyed by the normalized request payload."""
+    enabled: bool = True
+    max_size: int = 10_000
+    ttl: float = 300.0
+    serve_stale: bool = False
+    stale_ttl: float = 3600.0
+
+    @classmethod
+    def from_env(cls) -> "FraudCacheSettings":
+        return cls(
+            enabled=env_bool("FRAUD_CACHE_ENABLED", cls.enabled),
+            max_size=env_int("FRAUD_CACHE_MAX_SIZE", cls.max_size),
+            ttl=env_float("FRAUD_CACHE_TTL", cls.ttl),
+            serve_stale=env_bool("FRAUD_CACHE_SERVE_STALE", cls.serve_stale),
+            stale_ttl=env_float("FRAUD_CACHE_STALE_TTL", cls.stale_ttl),
+        )
+
+
+@dataclass(frozen=True)
+class CustomerCacheSettings:
+    """Caching of serialized `GET /customers/{id}` responses, invalidated on update and delete."""
+    enabled: bool = True
+    max_size: int = 10_000
+    ttl: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "CustomerCacheSettings":
+        return cls(
+            enabled=env_bool("CUSTOMER_CACHE_ENABLED", cls.enabled),
+            max_size=env_int("CUSTOMER_CACHE_MAX_SIZE", cls.max_size),
+            ttl=env_float("CUSTOMER_CACHE_TTL", cls.ttl),
+        )
+
+
+@dataclass(frozen=True)
+class FraudResilienceSettings:
+    """Retry budget and circuit breaker for the fraud API."""
+    max_attempts: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+    attempt_timeout: float = 5.0
+    total_timeout: float = 10.0
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "FraudResilienceSettings":
+        return cls(
+            max_attempts=env_int("FRAUD_RETRY_MAX_ATTEMPTS", cls.max_attempts),
+            base_delay=env_float("FRAUD_RETRY_BASE_DELAY", cls.base_delay),
+            max_delay=env_float("FRAUD_RETRY_MAX_DELAY", cls.max_delay),
+            attempt_timeout=env_float("FRAUD_ATTEMPT_TIMEOUT", cls.attempt_timeout),
+            total_timeout=env_float("FRAUD_TOTAL_TIMEOUT", cls.total_timeout),
+            breaker_failure_threshold=env_int("FRAUD_BREAKER_FAILURE_THRESHOLD", cls.breaker_failure_threshold),
+            breaker_reset_timeout=env_float("FRAUD_BREAKER_RESET_TIMEOUT", cls.breaker_reset_timeout),
+        )
+
+
+@dataclass(frozen=True)
+class FraudBatchSettings:
+    """Coalescing of concurrent fraud API calls into batch requests (off by default)."""
+    enabled: bool = False
+    max_batch_size: int = 50
+    max_wait: float = 0.005
+    url: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> "FraudBatchSettings":
+        return cls(
+            enabled=env_bool("FRAUD_BATCH_ENABLED", cls.enabled),
+            max_batch_size=env_int("FRAUD_BATCH_MAX_SIZE", cls.max_batch_size),
+            max_wait=env_float("FRAUD_BATCH_MAX_WAIT", cls.max_wait),
+            url=env_str("FRAUD_BATCH_API_URL"),
+        )
+
+
+@dataclass(frozen=True)
+class RiskRulesSettings:
+    """Location of the customer-data risk rules and how often to check it for changes."""
+    path: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services", "risk_rules.json")
+    reload_interval: float = 5.0
+
+    @classmethod
+    def from_env(cls) -> "RiskRulesSettings":
+        return cls(
+            path=env_str("RISK_RULES_PATH", cls.path),  # type: ignore[arg-type]
+            reload_interval=env_float("RISK_RULES_RELOAD_INTERVAL", cls.reload_interval),
+        )
+
+
+@dataclass(frozen=True)
+class IdempotencySettings:
+    """Retention of responses for requests sent with an Idempotency-Key header."""
+    ttl: float = 86_400.0
+    max_entries: int = 10_000
+
+    @classmethod
+    def from_env(cls) -> "IdempotencySettings":
+        return cls(
+            ttl=env_float("IDEMPOTENCY_TTL", cls.ttl),
+            max_entries=env_int("IDEMPOTENCY_MAX_ENTRIES", cls.max_entries),
+        )
+
+
+@dataclass(frozen=True)
+class OnboardingSettings:
+    """Asynchronous onboarding (`Prefer: respond-async`): worker pool, queue bound and long-poll cap."""
+    workers: int = 4
+    queue_size: int = 1000
+    max_wait: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "OnboardingSettings":
+        return cls(
+            workers=env_int("ONBOARDING_WORKERS", cls.workers),
+            queue_size=env_int("ONBOARDING_QUEUE_SIZE", cls.queue_size),
+            max_wait=env_float("ONBOARDING_STATUS_MAX_WAIT", cls.max_wait),
+        )
+
+
+@dataclass(frozen=True)
+class LoggingSettings:
+    """Application log level, log file and the bounded queue between loggers and handlers."""
+    level: str = "INFO"
+    file: str = "app.log"
+    queue_size: int = 10_000
+    mask_sensitive: bool = True
+
+    @classmethod
+    def from_env(cls) -> "LoggingSettings":
+        return cls(
+            level=(env_str("LOG_LEVEL", cls.level) or cls.level).upper(),
+            file=env_str("LOG_FILE", cls.file),  # type: ignore[arg-type]
+            queue_size=env_int("LOG_QUEUE_SIZE", cls.queue_size),
+            mask_sensitive=env_bool("LOG_MASK_SENSITIVE", cls.mask_sensitive),
+        )
+
+
+@dataclass(frozen=True)
+class ProfilingSettings:
+    """Opt-in per-request profiling and the token guarding the admin endpoints."""
+    enabled: bool = False
+    directory: str = "profiles"
+    admin_token: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> "ProfilingSettings":
+        return cls(
+            enabled=env_bool("PROFILING_ENABLED", cls.enabled),
+            directory=env_str("PROFILING_DIR", cls.directory),  # type: ignore[arg-type]
+            admin_token=env_str("ADMIN_TOKEN"),
+        )
+
+
+@dataclass(frozen=True)
+class StartupSettings:
+    """Optional startup work: schema upgrade and pre-warming of caches and pools."""
+    schema_upgrade: bool = True
+    warmup: bool = True
+
+    @classmethod
+    def from_env(cls) -> "StartupSettings":
+        return cls(
+            schema_upgrade=env_bool("STARTUP_SCHEMA_UPGRADE", cls.schema_upgrade),
+            warmup=env_bool("STARTUP_WARMUP", cls.warmup),
+        )
+
+
+@dataclass(frozen=True)
+class StorageSettings:
+    """Database URL, connection pools and the SQLite pragmas applied to every connection."""
+    url: str = "sqlite+aiosqlite:///./customer.db"
+    write_pool_size: int = 1
+    read_pool_size: int = 8
+    pool_timeout: float = 30.0
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size: int = 256 * 1024 * 1024
+    # Negative values are KiB, as in PRAGMA cache_size
+    cache_size: int = -64 * 1024
+    busy_timeout: int = 5_000
+
+    @classmethod
+    def from_env(cls) -> "StorageSettings":
+        return cls(
+            url=env_str("DATABASE_URL", cls.url),  # type: ignore[arg-type]
+            write_pool_size=env_int("DB_WRITE_POOL_SIZE", cls.write_pool_size),
+            read_pool_size=env_int("DB_READ_POOL_SIZE", cls.read_pool_size),
+            pool_timeout=env_float("DB_POOL_TIMEOUT", cls.pool_timeout),
+            journal_mode=(env_str("SQLITE_JOURNAL_MODE", cls.journal_mode) or cls.journal_mode).upper(),
+            synchronous=(env_str("SQLITE_SYNCHRONOUS", cls.synchronous) or cls.synchronous).upper(),
+            mmap_size=env_int("SQLITE_MMAP_SIZE", cls.mmap_size),
+            cache_size=env_int("SQLITE_CACHE_SIZE", cls.cache_size),
+            busy_timeout=env_int("SQLITE_BUSY_TIMEOUT", cls.busy_timeout),
+        )
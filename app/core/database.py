@@ -1,15 +1,137 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import time
+from datetime import timezone
+from typing import List, Optional
+from sqlalchemy import DateTime, event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.types import TypeDecorator
+from app.core.config import StorageSettings
+from app.core.metrics import Histogram
 
-DATABASE_URL = "sqlite:///./customer.db"
-
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+class UTCDateTime(TypeDecorator):
+    """Timestamp stored as UTC and always loaded timezone-aware; SQLite keeps no offset."""
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
+JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+DB_COMMIT_SECONDS = Histogram("db_commit_duration_seconds", "Time spent in session commits, including the final flush")
+
+# Registered on the Session class so every session (the app's and the tests') is timed
+@event.listens_for(Session, "before_commit")
+def _commit_started(session):
+    session.info["commit_started"] = time.perf_counter()
+
+@event.listens_for(Session, "after_commit")
+def _commit_finished(session):
+    started = session.info.pop("commit_started", None)
+    if started is not None:
+        DB_COMMIT_SECONDS.observe(time.perf_counter() - started)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _commit_failed(session, previous_transaction):
+    session.info.pop("commit_started", None)
+
+def is_sqlite_file(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:") and url.query.get("mode") != "memory"
+
+def sqlite_pragmas(settings: StorageSettings, read_only: bool) -> List[str]:
+    if settings.journal_mode not in JOURNAL_MODES:
+        raise ValueError(f"Unsupported SQLITE_JOURNAL_MODE '{settings.journal_mode}'")
+    if settings.synchronous not in SYNCHRONOUS_MODES:
+        raise ValueError(f"Unsupported SQLITE_SYNCHRONOUS '{settings.synchronous}'")
+    pragmas = [
+        f"PRAGMA busy_timeout={int(settings.busy_timeout)}",
+        f"PRAGMA cache_size={int(settings.cache_size)}",
+        f"PRAGMA mmap_size={int(settings.mmap_size)}",
+    ]
+    if read_only:
+        return pragmas + ["PRAGMA query_only=ON"]
+    # The journal mode is stored in the file, so only the writer sets it
+    return pragmas + [f"PRAGMA journal_mode={settings.journal_mode}", f"PRAGMA synchronous={settings.synchronous}"]
+
+def _on_connect(engine: AsyncEngine, pragmas: List[str]):
+    @event.listens_for(engine.sync_engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+class Database:
+    """
+    Writer and reader engines for one database.
+
+    SQLite takes one writer at a time, so writes share `write_pool_size`
+    connections (1 by default: writers queue in the pool instead of retrying
+    on SQLITE_BUSY). Reads use a separate pool of read-only connections; in
+    WAL mode they run alongside the writer instead of queueing behind it.
+    For in-memory databases both sides share one engine.
+    """
+
+    def __init__(self, settings: StorageSettings):
+        self.settings = settings
+        url = make_url(settings.url)
+        if is_sqlite_file(url):
+            self.engine = create_async_engine(
+                url, poolclass=AsyncAdaptedQueuePool, pool_size=max(1, settings.write_pool_size),
+                max_overflow=0, pool_timeout=settings.pool_timeout,
+            )
+            _on_connect(self.engine, sqlite_pragmas(settings, read_only=False))
+            read_url = url.set(database=f"file:{url.database}?mode=ro", query={**url.query, "uri": "true"})
+            self.read_engine = create_async_engine(
+                read_url, poolclass=AsyncAdaptedQueuePool, pool_size=max(1, settings.read_pool_size),
+                max_overflow=0, pool_timeout=settings.pool_timeout,
+            )
+            _on_connect(self.read_engine, sqlite_pragmas(settings, read_only=True))
+        else:
+            self.engine = create_async_engine(url)
+            self.read_engine = self.engine
+        self.session_factory = async_sessionmaker(bind=self.engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+        self.read_session_factory = async_sessionmaker(bind=self.read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+    async def dispose(self):
+        await self.engine.dispose()
+        if self.read_engine is not self.engine:
+            await self.read_engine.dispose()
+
+_database: Optional[Database] = None
+
+def configure_database(settings: Optional[StorageSettings] = None) -> Database:
+    """(Re)build the engines from settings; used at startup, by CLIs and by tests."""
+    global _database
+    _database = Database(settings or StorageSettings.from_env())
+    return _database
+
+def get_database() -> Database:
+    if _database is None:
+        configure_database()
+    return _database  # type: ignore[return-value]
+
+async def get_db():
+    async with get_database().session_factory() as db:
+        yield db
+
+def get_session_factory() -> async_sessionmaker:
+    """Writer session factory, for work that may outlive the request and so cannot use its session."""
+    return get_database().session_factory
+
+async def get_read_db():
+    """Session on the read-only pool, for routes that never write."""
+    async with get_database().read_session_factory() as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,36 @@
+"""ETags are built from row ids and versions, so a 304 or 412 is decided before anything is serialized."""
+
+import hashlib
+from typing import Iterable, Optional, Tuple
+
+
+def make_etag(*parts) -> str:
+    return '"' + ".".join(str(part) for part in parts) + '"'
+
+
+def digest_etag(parts: Iterable[Tuple]) -> str:
+    """ETag for a collection: a hash over the (id, version) of every item."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(repr(part).encode())
+    return '"' + digest.hexdigest()[:32] + '"'
+
+
+def _tags(header: str):
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def none_match(header: Optional[str], etag: str) -> bool:
+    """True when `If-None-Match` names the current ETag (weak comparison), i.e. answer 304."""
+    if not header:
+        return False
+    tags = _tags(header)
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+def match(header: Optional[str], etag: str) -> bool:
+    """True when `If-Match` allows the write (strong comparison); a missing header allows it."""
+    if header is None:
+        return True
+    tags = _tags(header)
+    return "*" in tags or etag in tags
@@ -0,0 +1,86 @@
+"""One pooled fraud API client for the whole process, so keep-alive connections are reused."""
+
+import importlib.util
+import logging
+from typing import Dict, Optional, Tuple
+import httpx
+from app.core.config import FraudClientSettings
+from app.core.metrics import Gauge
+
+logger = logging.getLogger(__name__)
+
+_fraud_client: Optional[httpx.AsyncClient] = None
+
+
+def create_fraud_client(
+    settings: Optional[FraudClientSettings] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> httpx.AsyncClient:
+    settings = settings or FraudClientSettings.from_env()
+
+    http2 = settings.http2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("FRAUD_CLIENT_HTTP2 is enabled but the 'h2' package is not installed; falling back to HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(settings.timeout, connect=settings.connect_timeout),
+        http2=http2,
+        transport=transport,
+        headers={
+            'Content-Type': 'application/json',
+            'Accept': 'application/json'
+        },
+    )
+
+
+async def start_fraud_client(settings: Optional[FraudClientSettings] = None) -> httpx.AsyncClient:
+    global _fraud_client
+    if _fraud_client is None or _fraud_client.is_closed:
+        _fraud_client = create_fraud_client(settings)
+        logger.info("Fraud API client started")
+    return _fraud_client
+
+
+async def close_fraud_client():
+    global _fraud_client
+    if _fraud_client is not None:
+        await _fraud_client.aclose()
+        logger.info("Fraud API client closed")
+    _fraud_client = None
+
+
+def fraud_pool_usage() -> Dict[Tuple[str, ...], float]:
+    """Connections and queued requests in the shared client's pool (empty for custom transports)."""
+    pool = getattr(getattr(_fraud_client, "_transport", None), "_pool", None)
+    if pool is None:
+        return {}
+    connections = list(pool.connections)
+    idle = sum(1 for connection in connections if connection.is_idle())
+    waiting = sum(1 for request in list(getattr(pool, "_requests", [])) if request.is_queued())
+    return {("active",): len(connections) - idle, ("idle",): idle, ("waiting",): waiting}
+
+
+Gauge(
+    "fraud_client_pool_connections",
+    "Fraud API client pool: active and idle connections, and requests waiting for one",
+    labelnames=("state",),
+    callback=fraud_pool_usage,
+)
+
+
+def get_fraud_client() -> httpx.AsyncClient:
+    """FastAPI dependency returning the app-scoped client.
+
+    Falls back to creating the client on first use when the lifespan hook has
+    not run (e.g. a `TestClient` used without a `with` block).
+    """
+    global _fraud_client
+    if _fraud_client is None or _fraud_client.is_closed:
+        _fraud_client = create_fraud_client()
+    return _fraud_client
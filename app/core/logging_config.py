@@ -0,0 +1,112 @@
+"""Records are masked on the caller's side, then formatted and written by a listener thread so I/O never blocks a request."""
+
+import atexit
+import logging
+import queue
+import re
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+from asgi_correlation_id import CorrelationIdFilter
+from app.core.config import LoggingSettings
+from app.core.metrics import Counter
+
+DETAILED_FORMAT = "%(asctime)s [%(correlation_id)s] [%(name)s] %(levelname)s: %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_EMAIL = re.compile(r"\b([A-Za-z0-9._%+-])[A-Za-z0-9._%+-]*@([A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,})\b")
+# The format CustomerCreate accepts (0 + 10 digits) and E.164; other digit runs (ids, amounts) are left alone
+_PHONE = re.compile(r"(?<![\w+])(?:0\d{7}|\+[1-9]\d{4,11})(\d{3})(?!\w)")
+# Quoted phone values in logged dicts/JSON, whatever their format
+_PHONE_FIELD = re.compile(r"""(['"]phone['"]\s*:\s*['"])[^'"]*?(\d{0,3})(?=['"])""")
+_NINO = re.compile(r"\b[A-CEGHJ-PR-TW-Z]{2}\d{6}[A-D]\b", re.IGNORECASE)
+_NATIONAL_ID_FIELD = re.compile(r"""(['"]?national_id['"]?\s*[:=]\s*['"]?)([^'",\s)}]+)""")
+
+
+def mask_sensitive(message: str) -> str:
+    message = _NATIONAL_ID_FIELD.sub(r"\1***", message)
+    message = _NINO.sub("*********", message)
+    message = _EMAIL.sub(r"\1***@\2", message)
+    message = _PHONE_FIELD.sub(r"\1********\2", message)
+    return _PHONE.sub(r"********\1", message)
+
+
+class SensitiveDataFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = record.getMessage()
+        record.msg = mask_sensitive(message)
+        record.args = ()
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[DroppingQueueHandler] = None
+
+
+def configure_logging(settings: Optional[LoggingSettings] = None) -> DroppingQueueHandler:
+    """Install the queue handler on the app, uvicorn and root loggers and start the listener (once)."""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        return _queue_handler
+    settings = settings or LoggingSettings.from_env()
+
+    formatter = logging.Formatter(DETAILED_FORMAT, datefmt=DATE_FORMAT)
+    console = logging.StreamHandler(sys.stdout)
+    console.setLevel(logging.INFO)
+    console.setFormatter(formatter)
+    file = logging.FileHandler(settings.file, mode="a")
+    file.setLevel(logging.DEBUG)
+    file.setFormatter(formatter)
+    # Only the application's own records go to the log file
+    file.addFilter(logging.Filter("app"))
+
+    _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=settings.queue_size))
+    _queue_handler.addFilter(CorrelationIdFilter(uuid_length=32, default_value="-"))
+    if settings.mask_sensitive:
+        _queue_handler.addFilter(SensitiveDataFilter())
+
+    for name, level in (("app", settings.level), ("uvicorn", "INFO"), ("uvicorn.access", "INFO")):
+        logger = logging.getLogger(name)
+        logger.handlers = [_queue_handler]
+        logger.setLevel(level)
+        logger.propagate = False
+    root = logging.getLogger()
+    root.handlers = [_queue_handler]
+    root.setLevel(logging.INFO)
+
+    _listener = QueueListener(_queue_handler.queue, console, file, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _queue_handler
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    if _queue_handler is not None and _queue_handler.dropped:
+        sys.stderr.write(f"{_queue_handler.dropped} log record(s) were dropped because the log queue was full\n")
+
+
+def dropped_log_records() -> int:
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+Counter("log_records_dropped_total", "Log records dropped because the log queue was full", callback=dropped_log_records)
@@ -0,0 +1,106 @@
+"""`create_all` never alters existing tables, so missing columns and indexes are added here on each start."""
+
+import argparse
+import asyncio
+import logging
+from sqlalchemy import inspect, select, func, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from app.core.config import StorageSettings
+from app.core.database import Base
+
+logger = logging.getLogger(__name__)
+
+
+def _find_duplicates(connection: Connection, index, limit: int = 5):
+    columns = list(index.columns)
+    query = (
+        select(*columns, func.count())
+        .where(*(column.isnot(None) for column in columns))
+        .group_by(*columns)
+        .having(func.count() > 1)
+        .limit(limit)
+    )
+    return connection.execute(query).all()
+
+
+def add_missing_columns(connection: Connection) -> list[str]:
+    inspector = inspect(connection)
+    added = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable and column.server_default is None:
+                logger.error("Cannot add NOT NULL column %s.%s without a server default", table.name, column.name)
+                continue
+            definition = column.type.compile(dialect=connection.dialect)
+            if column.server_default is not None:
+                default = column.server_default.arg
+                definition += f" DEFAULT {default.text if hasattr(default, 'text') else repr(str(default))}"
+            if not column.nullable:
+                definition += " NOT NULL"
+            connection.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {definition}'))
+            added.append(f"{table.name}.{column.name}")
+            logger.info("Added column %s to %s", column.name, table.name)
+    return added
+
+
+def create_missing_indexes(connection: Connection) -> list[str]:
+    inspector = inspect(connection)
+    created = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            if index.unique:
+                duplicates = _find_duplicates(connection, index)
+                if duplicates:
+                    logger.error("Cannot create unique index %s: duplicate values in %s (e.g. %s)", index.name, table.name, duplicates)
+                    continue
+            index.create(connection)
+            created.append(index.name)
+            logger.info("Created index %s on %s", index.name, table.name)
+    return created
+
+
+async def upgrade_schema(engine: AsyncEngine) -> list[str]:
+    """Bring an existing database up to date; returns the added columns and created indexes."""
+    # Import models so their tables and indexes are registered on Base.metadata
+    import app.models.blacklist  # noqa: F401
+    import app.models.customer  # noqa: F401
+    import app.models.onboarding_job  # noqa: F401
+    import app.models.risk_assessment  # noqa: F401
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        added = await conn.run_sync(add_missing_columns)
+        return added + await conn.run_sync(create_missing_indexes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upgrade an existing onboarding database in place")
+    parser.add_argument("--database-url", default=StorageSettings.from_env().url, help="Defaults to $DATABASE_URL")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    engine = create_async_engine(args.database_url)
+
+    async def run():
+        try:
+            applied = await upgrade_schema(engine)
+        finally:
+            await engine.dispose()
+        print(f"Applied {len(applied)} change(s): {', '.join(applied) or '-'}")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
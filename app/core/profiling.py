@@ -0,0 +1,155 @@
+"""cProfile sees everything on the event loop thread, so only one request is profiled at a time."""
+
+import asyncio
+import cProfile
+import logging
+import os
+import re
+import tracemalloc
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from asgi_correlation_id import correlation_id
+from app.core.config import ProfilingSettings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9._-]")
+
+_settings: Optional[ProfilingSettings] = None
+
+
+def configure_profiling(settings: Optional[ProfilingSettings] = None):
+    """Replace the settings (default: the environment); called at startup once .env is loaded, and by tests."""
+    global _settings
+    _settings = settings or ProfilingSettings.from_env()
+
+
+def get_profiling_settings() -> ProfilingSettings:
+    if _settings is None:
+        configure_profiling()
+    return _settings  # type: ignore[return-value]
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests that ask for it; must run inside CorrelationIdMiddleware."""
+
+    def __init__(self, app, settings: Optional[ProfilingSettings] = None):
+        self.app = app
+        self._settings = settings
+        self._active = False
+
+    @property
+    def settings(self) -> ProfilingSettings:
+        # Looked up per request: Starlette builds the middleware before the lifespan has loaded .env
+        return self._settings or get_profiling_settings()
+
+    def _wants_profile(self, scope) -> bool:
+        if not self.settings.enabled or scope["type"] != "http":
+            return False
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return value.strip().lower() in (b"1", b"true", b"yes", b"on")
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        if self._active:
+            logger.info("Profile requested for %s %s while another request is being profiled; skipping", scope["method"], scope["path"])
+            await self.app(scope, receive, send)
+            return
+
+        self._active = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.disable()
+            self._active = False
+            path = await asyncio.to_thread(self._dump, profiler)
+            logger.info("Profile of %s %s written to %s", scope["method"], scope["path"], path)
+
+    def _dump(self, profiler: cProfile.Profile) -> str:
+        os.makedirs(self.settings.directory, exist_ok=True)
+        name = _UNSAFE_FILENAME.sub("_", correlation_id.get() or "no-correlation-id")
+        path = os.path.join(self.settings.directory, f"{name}.prof")
+        profiler.dump_stats(path)
+        return path
+
+
+# Allocations made by tracemalloc itself and by the import machinery are noise in every diff
+_NOISE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _stat_row(stat) -> Dict:
+    frame = stat.traceback[0]
+    row = {"location": f"{frame.filename}:{frame.lineno}", "size_kib": round(stat.size / 1024, 1), "count": stat.count}
+    if isinstance(stat, tracemalloc.StatisticDiff):
+        row["size_diff_kib"] = round(stat.size_diff / 1024, 1)
+        row["count_diff"] = stat.count_diff
+    return row
+
+
+class MemorySnapshots:
+    """Numbered tracemalloc snapshots, keeping only the most recent `keep`."""
+
+    def __init__(self, keep: int = 5):
+        self.keep = keep
+        self._snapshots: "OrderedDict[int, tracemalloc.Snapshot]" = OrderedDict()
+        self._next_id = 1
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            logger.info("tracemalloc started with %s frame(s) per traceback", frames)
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logger.info("tracemalloc stopped")
+        self._snapshots.clear()
+
+    def take(self) -> Tuple[int, tracemalloc.Snapshot]:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not running")
+        snapshot = tracemalloc.take_snapshot().filter_traces(_NOISE_FILTERS)
+        snapshot_id = self._next_id
+        self._next_id += 1
+        self._snapshots[snapshot_id] = snapshot
+        while len(self._snapshots) > self.keep:
+            self._snapshots.popitem(last=False)
+        return snapshot_id, snapshot
+
+    def get(self, snapshot_id: int) -> tracemalloc.Snapshot:
+        try:
+            return self._snapshots[snapshot_id]
+        except KeyError:
+            raise KeyError(f"Snapshot {snapshot_id} does not exist (kept: {list(self._snapshots)})") from None
+
+    def latest_id(self) -> Optional[int]:
+        return next(reversed(self._snapshots), None)
+
+    @staticmethod
+    def top(snapshot: tracemalloc.Snapshot, limit: int = 20, group_by: str = "lineno") -> List[Dict]:
+        return [_stat_row(stat) for stat in snapshot.statistics(group_by)[:limit]]
+
+    def diff(self, base_id: int, current_id: int, limit: int = 20, group_by: str = "lineno") -> Tuple[int, List[Dict]]:
+        """Largest allocation changes from `base_id` to `current_id`, and the total change in bytes."""
+        stats = self.get(current_id).compare_to(self.get(base_id), group_by)
+        total = sum(stat.size_diff for stat in stats)
+        return total, [_stat_row(stat) for stat in stats[:limit]]
+
+
+memory_snapshots = MemorySnapshots()
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker rejects a call without attempting it."""
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            # Let exactly one probe through; its outcome closes or re-opens the circuit
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        if self._state != self.CLOSED:
+            logger.info("Circuit breaker '%s' closed", self.name)
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def release_probe(self):
+        # A probe that ended without an outcome (e.g. cancelled) lets the next call probe instead
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self._failures += 1
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                logger.warning("Circuit breaker '%s' opened after %s failure(s)", self.name, self._failures)
+            self._state = self.OPEN
+            self._opened_at = self._clock()
+            self._probe_in_flight = False
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+    attempt_timeout: float = 5.0
+    total_timeout: float = 10.0
+
+
+def decorrelated_jitter(previous: float, base: float, cap: float) -> float:
+    """Next backoff delay: uniform between base and 3x the previous delay, capped."""
+    return min(cap, random.uniform(base, max(base, previous * 3)))
+
+
+async def call_with_retries(
+    operation: Callable[[], Awaitable[T]],
+    policy: RetryPolicy,
+    breaker: CircuitBreaker,
+    is_retryable: Callable[[BaseException], bool],
+) -> T:
+    deadline = time.monotonic() + policy.total_timeout
+    delay = policy.base_delay
+    attempt = 0
+    while True:
+        attempt += 1
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"Circuit breaker '{breaker.name}' is open")
+
+        remaining = deadline - time.monotonic()
+        try:
+            async with asyncio.timeout(min(policy.attempt_timeout, remaining)):
+                result = await operation()
+        except Exception as e:
+            if not is_retryable(e):
+                # The dependency answered; a client-side error says nothing about its health
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            delay = decorrelated_jitter(delay, policy.base_delay, policy.max_delay)
+            if attempt >= policy.max_attempts or time.monotonic() + delay >= deadline:
+                raise
+            logger.warning("Attempt %s/%s against '%s' failed (%s); retrying in %.2fs", attempt, policy.max_attempts, breaker.name, type(e).__name__, delay)
+            await asyncio.sleep(delay)
+        except BaseException:
+            breaker.release_probe()
+            raise
+        else:
+            breaker.record_success()
+            return result
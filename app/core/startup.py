@@ -0,0 +1,63 @@
+"""`/health/ready` answers 503 until every startup phase has finished and again during shutdown."""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from app.core.metrics import Gauge
+
+logger = logging.getLogger(__name__)
+
+STARTUP_PHASE_SECONDS = Gauge(
+    "startup_phase_duration_seconds",
+    "Time spent in each startup phase of this worker",
+    labelnames=("phase",),
+)
+
+
+class StartupState:
+    STARTING = "starting"
+    READY = "ready"
+    STOPPING = "stopping"
+
+    def __init__(self):
+        self.status = self.STARTING
+        self.phases: Dict[str, float] = {}
+        self.total: Optional[float] = None
+        self._started = time.perf_counter()
+
+    @property
+    def ready(self) -> bool:
+        return self.status == self.READY
+
+    def begin(self):
+        self.status = self.STARTING
+        self.phases = {}
+        self.total = None
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.phases[name] = elapsed
+            STARTUP_PHASE_SECONDS.labels(name).set(elapsed)
+            logger.debug("Startup phase '%s' took %.1fms", name, elapsed * 1000)
+
+    def mark_ready(self):
+        self.status = self.READY
+        self.total = time.perf_counter() - self._started
+        logger.info(
+            "Application ready in %.1fms (%s)",
+            self.total * 1000,
+            ", ".join(f"{name}={elapsed * 1000:.1f}ms" for name, elapsed in self.phases.items()),
+        )
+
+    def mark_stopping(self):
+        self.status = self.STOPPING
+
+
+startup_state = StartupState()
@@ -1,10 +1,10 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, and_, select, text, insert
 from app.models.blacklist import BlacklistModel
 from app.schemas.blacklist import BlacklistCreate
 from app.schemas.customer import CustomerCreate
 
-def create_blacklist_entry(db: Session, blacklist_entry: BlacklistCreate):
+async def create_blacklist_entry(db: AsyncSession, blacklist_entry: BlacklistCreate):
     db_blacklist = BlacklistModel(
         name=blacklist_entry.name,
         email=blacklist_entry.email,
@@ -12,12 +12,24 @@ def create_blacklist_entry(db: Session, blacklist_entry: BlacklistCreate):
         date_of_birth=blacklist_entry.date_of_birth,
     )
     db.add(db_blacklist)
-    db.commit()
-    db.refresh(db_blacklist)
+    await db.commit()
+    await db.refresh(db_blacklist)
     return db_blacklist
 
-def search_blacklist_by_customer_data(db: Session, customer_data: CustomerCreate):
-    query = db.query(BlacklistModel)
+async def get_blacklist_keys_by_names(db: AsyncSession, names: list[str]):
+    result = await db.execute(
+        select(BlacklistModel.name, BlacklistModel.email, BlacklistModel.phone, BlacklistModel.date_of_birth)
+        .where(BlacklistModel.name.in_(names))
+    )
+    return set(result.all())
+
+async def insert_blacklist_entries(db: AsyncSession, entries: list[dict]):
+    # executemany in a single transaction per chunk
+    await db.execute(insert(BlacklistModel), entries)
+    await db.commit()
+
+async def search_blacklist_by_customer_data(db: AsyncSession, customer_data: CustomerCreate):
+    query = select(BlacklistModel)
 
     name_and_email_condition = and_(BlacklistModel.name == customer_data.name, BlacklistModel.email == customer_data.email)
     name_and_phone_condition = text('1=0')  # Default to false
@@ -29,6 +41,7 @@ def search_blacklist_by_customer_data(db: Session, customer_data: CustomerCreate
     if customer_data.date_of_birth:
         name_and_date_of_birth_condition = and_(BlacklistModel.name == customer_data.name, BlacklistModel.date_of_birth == customer_data.date_of_birth)
 
-    query = query.filter(or_(name_and_email_condition, name_and_phone_condition, name_and_date_of_birth_condition))
+    query = query.where(or_(name_and_email_condition, name_and_phone_condition, name_and_date_of_birth_condition))
 
-    return query.first()
\ No newline at end of file
+    result = await db.execute(query.limit(1))
+    return result.scalars().first()
\ No newline at end of file
@@ -1,23 +1,57 @@
-from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+from sqlalchemy import select, or_
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.customer import CustomerModel, AddressModel
 from app.schemas.customer import CustomerCreate, CustomerUpdate
+from app.schemas.risk_assessment import TierAssessment
+from app.crud.risk_assessment import build_risk_assessment_models, delete_risk_assessments, save_risk_assessments
 
-def get_customers(db: Session):
-    return db.query(CustomerModel).all()
+async def get_customers(
+    db: AsyncSession,
+    after_id: Optional[int] = None,
+    limit: int = 50,
+    name: Optional[str] = None,
+    email: Optional[str] = None,
+    phone: Optional[str] = None,
+    national_id: Optional[str] = None,
+    country: Optional[str] = None,
+):
+    # Keyset pagination: seek past the last seen id instead of OFFSET, and load
+    # the page's addresses in one batched IN query
+    query = select(CustomerModel).options(selectinload(CustomerModel.addresses)).order_by(CustomerModel.id)
+    if after_id is not None:
+        query = query.where(CustomerModel.id > after_id)
+    if name is not None:
+        query = query.where(CustomerModel.name == name)
+    if email is not None:
+        query = query.where(CustomerModel.email == email)
+    if phone is not None:
+        query = query.where(CustomerModel.phone == phone)
+    if national_id is not None:
+        query = query.where(CustomerModel.national_id == national_id)
+    if country is not None:
+        query = query.where(CustomerModel.addresses.any(AddressModel.country == country))
+    result = await db.execute(query.limit(limit))
+    return result.scalars().all()
 
-def get_customer_by_id(db: Session, customer_id: int):
-    return db.query(CustomerModel).filter(CustomerModel.id == customer_id).first()
+async def get_customer_by_id(db: AsyncSession, customer_id: int):
+    result = await db.execute(select(CustomerModel).where(CustomerModel.id == customer_id))
+    return result.scalars().first()
 
-def get_customer_by_email(db: Session, email: str):
-    return db.query(CustomerModel).filter(CustomerModel.email == email).first()
+async def get_customer_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(CustomerModel).where(CustomerModel.email == email))
+    return result.scalars().first()
 
-def create_customer(db: Session, customer: CustomerCreate):
-    db_customer = CustomerModel(
+def build_customer_model(customer: CustomerCreate, assessment: Optional[Dict[str, TierAssessment]] = None):
+    return CustomerModel(
         name=customer.name,
         email=customer.email,
         phone=customer.phone,
         date_of_birth=customer.date_of_birth,
         national_id=customer.national_id,
+        risk_score=customer.score,
+        risk_rules_version=customer.rules_version,
         addresses=[
             AddressModel(
                 street=addr.street,
@@ -27,15 +61,39 @@ def create_customer(db: Session, customer: CustomerCreate):
                 country=addr.country
             )
             for addr in customer.addresses
-        ] if customer.addresses else []
+        ] if customer.addresses else [],
+        risk_assessments=build_risk_assessment_models(assessment) if assessment else [],
     )
+
+async def create_customer(db: AsyncSession, customer: CustomerCreate, assessment: Optional[Dict[str, TierAssessment]] = None):
+    db_customer = build_customer_model(customer, assessment)
     db.add(db_customer)
-    db.commit()
-    db.refresh(db_customer)
+    await db.commit()
+    await db.refresh(db_customer)
     return db_customer
 
-def update_customer(db: Session, db_customer: CustomerModel, updates: CustomerUpdate):
-    update_data = updates.model_dump(exclude_unset=True)
+async def create_customers(db: AsyncSession, customers: list[CustomerCreate], assessments: Optional[List[Dict[str, TierAssessment]]] = None):
+    # Single transaction for the whole batch
+    assessments = assessments or [None] * len(customers)
+    db_customers = [build_customer_model(customer, assessment) for customer, assessment in zip(customers, assessments)]
+    db.add_all(db_customers)
+    await db.commit()
+    return db_customers
+
+async def get_existing_emails_and_national_ids(db: AsyncSession, emails: list[str], national_ids: list[str]):
+    result = await db.execute(
+        select(CustomerModel.email, CustomerModel.national_id).where(
+            or_(CustomerModel.email.in_(emails), CustomerModel.national_id.in_(national_ids))
+        )
+    )
+    rows = result.all()
+    return {email for email, _ in rows}, {national_id for _, national_id in rows if national_id}
+
+async def update_customer(
+    db: AsyncSession, db_customer: CustomerModel, updates: CustomerUpdate, assessment: Optional[Dict[str, TierAssessment]] = None
+):
+    # The score and rules version are only ever set by risk assessment
+    update_data = updates.model_dump(exclude_unset=True, exclude={"score", "rules_version"})
     
     if 'addresses' in update_data:
         addresses_data = update_data.pop('addresses')
@@ -43,21 +101,30 @@ def update_customer(db: Session, db_customer: CustomerModel, updates: CustomerUp
         if addresses_data:
             for addr_data in addresses_data:
                 db_address = AddressModel(
-                    street=addr_data.street,
-                    city=addr_data.city,
-                    state=addr_data.state,
-                    zip_code=addr_data.zip_code,
-                    country=addr_data.country
+                    street=addr_data['street'],
+                    city=addr_data['city'],
+                    state=addr_data['state'],
+                    zip_code=addr_data['zip_code'],
+                    country=addr_data['country']
                 )
                 db_customer.addresses.append(db_address)
     
     for field, value in update_data.items():
         setattr(db_customer, field, value)
-    
-    db.commit()
-    db.refresh(db_customer)
+
+    if assessment:
+        db_customer.risk_score = assessment["customer_data"].score
+        db_customer.risk_rules_version = assessment["customer_data"].rules_version
+        await save_risk_assessments(db, db_customer.id, assessment)
+
+    # Also forces an UPDATE of the customer row when only addresses changed,
+    # which checks the version read above
+    db_customer.version = db_customer.version + 1
+    await db.commit()
+    await db.refresh(db_customer)
     return db_customer
 
-def delete_customer(db: Session, db_customer: CustomerModel):
-    db.delete(db_customer)
-    db.commit()
+async def delete_customer(db: AsyncSession, db_customer: CustomerModel):
+    await delete_risk_assessments(db, db_customer.id)
+    await db.delete(db_customer)
+    await db.commit()
@@ -0,0 +1,63 @@
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.onboarding_job import OnboardingJobModel
+from app.schemas.customer import CustomerCreate
+
+async def create_job(db: AsyncSession, customer: CustomerCreate) -> OnboardingJobModel:
+    job = OnboardingJobModel(id=uuid.uuid4().hex, status="PENDING", payload=customer.model_dump(mode="json"))
+    db.add(job)
+    await db.commit()
+    return job
+
+async def get_job(db: AsyncSession, job_id: str) -> Optional[OnboardingJobModel]:
+    # populate_existing: a long-poll reads the same job repeatedly in one session
+    result = await db.execute(
+        select(OnboardingJobModel).where(OnboardingJobModel.id == job_id).execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+async def get_pending_job_ids(db: AsyncSession, idle_since: Optional[datetime] = None) -> List[str]:
+    """PENDING jobs; with `idle_since`, only those neither submitted nor claimed after it."""
+    query = select(OnboardingJobModel.id).where(OnboardingJobModel.status == "PENDING")
+    if idle_since is not None:
+        query = query.where(func.coalesce(OnboardingJobModel.started_at, OnboardingJobModel.created_at) < idle_since)
+    result = await db.execute(query.order_by(OnboardingJobModel.created_at))
+    return list(result.scalars().all())
+
+async def claim_job(db: AsyncSession, job_id: str, abandoned_before: datetime) -> bool:
+    """Mark a PENDING job as started unless another worker claimed it after `abandoned_before`."""
+    result = await db.execute(
+        update(OnboardingJobModel)
+        .where(
+            OnboardingJobModel.id == job_id,
+            OnboardingJobModel.status == "PENDING",
+            or_(OnboardingJobModel.started_at.is_(None), OnboardingJobModel.started_at < abandoned_before),
+        )
+        .values(started_at=datetime.now(timezone.utc))
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+async def release_job(db: AsyncSession, job_id: str):
+    """Drop the claim on a job that was interrupted, so it can be claimed again at once."""
+    await db.execute(
+        update(OnboardingJobModel)
+        .where(OnboardingJobModel.id == job_id, OnboardingJobModel.status == "PENDING")
+        .values(started_at=None)
+    )
+    await db.commit()
+
+async def complete_job(db: AsyncSession, job: OnboardingJobModel, status: str, customer_id: Optional[int] = None, reason: Optional[str] = None):
+    job.status = status
+    job.customer_id = customer_id
+    job.reason = reason
+    job.payload = None
+    job.completed_at = datetime.now(timezone.utc)
+    await db.commit()
+
+async def delete_job(db: AsyncSession, job: OnboardingJobModel):
+    await db.delete(job)
+    await db.commit()
@@ -0,0 +1,33 @@
+from typing import Dict, List
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.risk_assessment import RiskAssessmentModel
+from app.schemas.risk_assessment import TierAssessment
+
+STORED_FIELDS = ("input_hash", "score", "detail", "rules_version", "assessed_at")
+
+async def get_risk_assessments(db: AsyncSession, customer_id: int) -> List[RiskAssessmentModel]:
+    result = await db.execute(
+        select(RiskAssessmentModel).where(RiskAssessmentModel.customer_id == customer_id).order_by(RiskAssessmentModel.id)
+    )
+    return list(result.scalars().all())
+
+def build_risk_assessment_models(assessment: Dict[str, TierAssessment]) -> List[RiskAssessmentModel]:
+    return [
+        RiskAssessmentModel(tier=tier, **{field: getattr(result, field) for field in STORED_FIELDS})
+        for tier, result in assessment.items()
+    ]
+
+async def save_risk_assessments(db: AsyncSession, customer_id: int, assessment: Dict[str, TierAssessment]):
+    # Rows are updated in place; a reused tier assigns its own values back, so no UPDATE is emitted for it
+    existing = {row.tier: row for row in await get_risk_assessments(db, customer_id)}
+    for tier, result in assessment.items():
+        row = existing.get(tier)
+        if row is None:
+            row = RiskAssessmentModel(customer_id=customer_id, tier=tier)
+            db.add(row)
+        for field in STORED_FIELDS:
+            setattr(row, field, getattr(result, field))
+
+async def delete_risk_assessments(db: AsyncSession, customer_id: int):
+    await db.execute(delete(RiskAssessmentModel).where(RiskAssessmentModel.customer_id == customer_id))
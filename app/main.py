@@ -1,88 +1,111 @@
 import logging
-import logging.config
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
 from asgi_correlation_id import CorrelationIdMiddleware
 from fastapi import FastAPI
 from dotenv import load_dotenv
-from app.core.database import Base, engine
+from app.core.config import RiskRulesSettings, StartupSettings, env_float
+from app.core.logging_config import configure_logging
+from app.core.metrics import MetricsMiddleware
+from app.core.profiling import ProfilingMiddleware, configure_profiling
+from app.core.database import configure_database
+from app.core.migrations import upgrade_schema
+from app.core.http_client import start_fraud_client, close_fraud_client
+from app.core.startup import startup_state
+from app.services.blacklist_matcher import blacklist_matcher, resync_periodically
+from app.services.fraud_batcher import get_fraud_batcher
+from app.services.customer_cache import get_customer_cache
+from app.services.onboarding_jobs import configure_onboarding_workers
+from app.services.fraud_cache import get_fraud_cache
+from app.services.fraud_resilience import get_fraud_breaker
+from app.services.idempotency import get_idempotency_store
+from app.services.risk_rules import configure_risk_rules, get_risk_rules, watch_risk_rules
 from app.api.v1.customer import router as customer_router
 from app.api.v1.blacklist import router as blacklist_router
-from app.api.v1.fraud_detection import router as fraud_router
-
-load_dotenv()
-
-# Use dictConfig for advanced logging configuration with correlation ID filter
-logging_config = {
-    "version": 1,
-    "disable_existing_loggers": False,
-    "formatters": {
-        "detailed": {
-            "format": "%(asctime)s [%(correlation_id)s] [%(name)s] %(levelname)s: %(message)s",
-            "datefmt": "%Y-%m-%d %H:%M:%S",
-        },
-        "simple": {
-            "format": "%(levelname)s: %(message)s",
-        },
-    },
-    "filters": {
-        "correlation_id": {
-            "()": "asgi_correlation_id.CorrelationIdFilter",
-            "uuid_length": 32,
-            "default_value": "-",
-        },
-    },
-    "handlers": {
-        "console": {
-            "class": "logging.StreamHandler",
-            "level": "INFO",
-            "formatter": "detailed",
-            "filters": ["correlation_id"],
-            "stream": "ext://sys.stdout",
-        },
-        "file": {
-            "class": "logging.FileHandler",
-            "level": "DEBUG",
-            "formatter": "detailed",
-            "filters": ["correlation_id"],
-            "filename": "app.log",
-            "mode": "a",
-        },
-    },
-    "loggers": {
-        "app": {
-            "level": "DEBUG",
-            "handlers": ["console", "file"],
-            "propagate": False,
-        },
-        "uvicorn": {
-            "level": "INFO",
-            "handlers": ["console"],
-            "propagate": False,
-        },
-        "uvicorn.access": {
-            "level": "INFO",
-            "handlers": ["console"],
-            "propagate": False,
-        },
-    },
-    "root": {
-        "level": "INFO",
-        "handlers": ["console"],
-    },
-}
-logging.config.dictConfig(logging_config)
+from app.api.v1.fraud_detection import router as fraud_router, get_batch_scorer
+from app.api.v1.metrics import router as metrics_router
+from app.api.v1.admin import router as admin_router
+from app.api.v1.health import router as health_router
 
 # Get logger for this module
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Onboard Customer")
-app.add_middleware(CorrelationIdMiddleware)
+def warm_up():
+    """Build the lazily created subsystems now rather than on the first onboarding."""
+    get_fraud_cache()
+    get_customer_cache()
+    get_fraud_breaker()
+    get_fraud_batcher()
+    get_idempotency_store()
+    get_batch_scorer()
 
-# Test logging to verify configuration
-logger.info("FastAPI application starting up with logging configuration")
-logger.debug("Debug logging is enabled")
+async def cancel_and_wait(task: asyncio.Task):
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
 
-Base.metadata.create_all(bind=engine)
+# .env loading, logging and DB work happen here rather than at import time, so
+# tests and tools that import app.main do not pay for them. Each phase registers
+# its teardown as it starts, so a failed startup still releases what came before
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    startup_state.begin()
+    async with AsyncExitStack() as teardown:
+        with startup_state.phase("environment"):
+            load_dotenv()
+            settings = StartupSettings.from_env()
+            configure_profiling()
+        # Loggers enqueue records; a listener thread formats and writes them (see app/core/logging_config.py)
+        with startup_state.phase("logging"):
+            configure_logging()
+        with startup_state.phase("database"):
+            database = configure_database()
+            teardown.push_async_callback(database.dispose)
+        if settings.schema_upgrade:
+            with startup_state.phase("schema"):
+                await upgrade_schema(database.engine)
+        else:
+            logger.info("Skipping schema upgrade (STARTUP_SCHEMA_UPGRADE is off)")
+        with startup_state.phase("fraud_client"):
+            teardown.push_async_callback(close_fraud_client)
+            await start_fraud_client()
+        # Also opens the first pooled read connection
+        with startup_state.phase("blacklist"):
+            async with database.read_session_factory() as db:
+                await blacklist_matcher.sync(db)
+        with startup_state.phase("risk_rules"):
+            rules_settings = RiskRulesSettings.from_env()
+            configure_risk_rules(rules_settings)
+            get_risk_rules()
+        if settings.warmup:
+            with startup_state.phase("warmup"):
+                warm_up()
+        # After the fraud client, blacklist and rules: resumed jobs may start right away
+        with startup_state.phase("onboarding_workers"):
+            onboarding_workers = configure_onboarding_workers(database.session_factory)
+            teardown.push_async_callback(onboarding_workers.stop)
+            await onboarding_workers.start()
+        resync_task = asyncio.create_task(
+            resync_periodically(database.read_session_factory, env_float("BLACKLIST_RESYNC_INTERVAL", 30.0))
+        )
+        teardown.push_async_callback(cancel_and_wait, resync_task)
+        rules_task = asyncio.create_task(watch_risk_rules(rules_settings.reload_interval))
+        teardown.push_async_callback(cancel_and_wait, rules_task)
+        startup_state.mark_ready()
+        try:
+            yield
+        finally:
+            startup_state.mark_stopping()
+
+app = FastAPI(title="Onboard Customer", lifespan=lifespan)
+# Added first so it runs inside CorrelationIdMiddleware and can name profiles after the request ID
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(CorrelationIdMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(customer_router)
 app.include_router(blacklist_router)
 app.include_router(fraud_router)
+app.include_router(metrics_router)
+app.include_router(admin_router)
+app.include_router(health_router)
@@ -1,8 +1,13 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Index, Integer, String
 from app.core.database import Base
 
 class BlacklistModel(Base):
     __tablename__ = "blacklist"
+    __table_args__ = (
+        Index("ix_blacklist_name_email", "name", "email"),
+        Index("ix_blacklist_name_phone", "name", "phone"),
+        Index("ix_blacklist_name_date_of_birth", "name", "date_of_birth"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
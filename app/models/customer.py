@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, text
+from sqlalchemy.orm import relationship, synonym
 from app.core.database import Base
+from app.models.risk_assessment import RiskAssessmentModel
 
 class AddressModel(Base):
     __tablename__ = "addresses"
@@ -11,16 +12,29 @@ class AddressModel(Base):
     state = Column(String, nullable=False)
     zip_code = Column(String, nullable=False)
     country = Column(String, nullable=False)
-    customer_id = Column(Integer, ForeignKey("customers.id"))
+    customer_id = Column(Integer, ForeignKey("customers.id"), index=True)
     
 class CustomerModel(Base):
     __tablename__ = "customers"
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
-    email = Column(String, nullable=False)
+    email = Column(String, nullable=False, unique=True, index=True)
     phone = Column(String, nullable=True)
     date_of_birth = Column(String, nullable=True)
-    addresses = relationship(AddressModel, backref="customer", cascade="all, delete-orphan")
-    national_id = Column(String, nullable=True)
+    addresses = relationship(AddressModel, backref="customer", cascade="all, delete-orphan", lazy="selectin")
+    national_id = Column(String, nullable=True, unique=True, index=True)
     risk_score = Column(Integer, default=0)
+    risk_rules_version = Column(String, nullable=True)
+    # Row version behind the ETag; every UPDATE checks the version it read
+    # (optimistic concurrency) and crud.update_customer sets the next one
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"))
+    # Only used to insert a new customer's assessments along with it; read them with
+    # crud.risk_assessment, and crud.delete_customer removes them explicitly
+    risk_assessments = relationship(RiskAssessmentModel, lazy="raise", passive_deletes="all")
+
+    # Exposed under the API schema's field names
+    score = synonym("risk_score")
+    rules_version = synonym("risk_rules_version")
+
+    __mapper_args__ = {"version_id_col": version, "version_id_generator": False}
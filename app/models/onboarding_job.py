@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+from sqlalchemy import JSON, Column, ForeignKey, Integer, String
+from app.core.database import Base, UTCDateTime
+
+class OnboardingJobModel(Base):
+    """An onboarding submitted with `Prefer: respond-async`, from PENDING to its outcome."""
+    __tablename__ = "onboarding_jobs"
+
+    id = Column(String, primary_key=True)
+    status = Column(String, nullable=False, index=True)
+    # The validated CustomerCreate payload; dropped once the job completes
+    payload = Column(JSON, nullable=True)
+    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=True)
+    reason = Column(String, nullable=True)
+    created_at = Column(UTCDateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    # Set when a worker claims the job
+    started_at = Column(UTCDateTime, nullable=True)
+    completed_at = Column(UTCDateTime, nullable=True)
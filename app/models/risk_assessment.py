@@ -0,0 +1,19 @@
+from datetime import datetime, timezone
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+from app.core.database import Base, UTCDateTime
+
+class RiskAssessmentModel(Base):
+    """Outcome of one risk tier for a customer, with a hash of the inputs it was computed from."""
+    __tablename__ = "risk_assessments"
+    __table_args__ = (
+        Index("ix_risk_assessments_customer_id_tier", "customer_id", "tier", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False)
+    tier = Column(String, nullable=False)
+    input_hash = Column(String, nullable=False)
+    score = Column(Integer, nullable=True)
+    detail = Column(String, nullable=True)
+    rules_version = Column(String, nullable=True)
+    assessed_at = Column(UTCDateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
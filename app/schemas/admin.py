@@ -0,0 +1,24 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+class MemoryStat(BaseModel):
+    location: str = Field(description="file:line of the allocation site")
+    size_kib: float
+    count: int
+    size_diff_kib: Optional[float] = None
+    count_diff: Optional[int] = None
+
+class TracemallocStatus(BaseModel):
+    tracing: bool
+    traced_current_kib: float = 0
+    traced_peak_kib: float = 0
+
+class MemorySnapshot(TracemallocStatus):
+    id: int
+    top: List[MemoryStat]
+
+class MemoryDiff(BaseModel):
+    base: int
+    current: int
+    total_diff_kib: float
+    top: List[MemoryStat] = Field(description="Allocation sites with the largest growth first")
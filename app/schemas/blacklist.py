@@ -15,3 +15,14 @@ class Blacklist(BlacklistBase):
 
 class BlacklistCreate(BlacklistBase):
     pass
+
+class BlacklistImportRejectedRow(BaseModel):
+    line: int = Field(description="1-based line number in the uploaded file")
+    reason: str
+
+class BlacklistImportReport(BaseModel):
+    total_rows: int = 0
+    inserted: int = 0
+    duplicates: int = Field(default=0, description="Rows repeated in the file or already on the blacklist")
+    rejected: int = 0
+    rejected_rows: List[BlacklistImportRejectedRow] = Field(default=[], description="First rejected rows, capped to keep the report small")
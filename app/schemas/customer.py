@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, ConfigDict, field_validator, Field
 from app.schemas.validators import is_customer_less_than_18
 
@@ -31,6 +31,7 @@ class CustomerBase(BaseModel):
     addresses: Optional[List[AddressBase]] = []
     national_id: Optional[str] = None
     score: Optional[int] = 0
+    rules_version: Optional[str] = Field(default=None, description="Version of the risk rules that produced `score`")
 
 class CustomerCreateBase(CustomerBase):
     email: str = Field(pattern=r"^[\w\.-]+@[\w\.-]+\.\w+$", max_length=40)
@@ -41,8 +42,24 @@ class Customer(CustomerCreateBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class CustomerPage(BaseModel):
+    items: List[Customer]
+    next_cursor: Optional[int] = Field(default=None, description="Pass as `cursor` to fetch the next page; null on the last page")
+
 class CustomerCreate(CustomerCreateBase):
     pass
 
+class BatchItemResult(BaseModel):
+    index: int = Field(description="Position of the item in the submitted batch")
+    status: Literal["accepted", "rejected", "errored"]
+    reason: Optional[str] = None
+    customer: Optional[Customer] = None
+
+class BatchOnboardingResult(BaseModel):
+    accepted: int = 0
+    rejected: int = 0
+    errored: int = 0
+    results: List[BatchItemResult]
+
 class CustomerUpdate(CustomerBase):
     pass
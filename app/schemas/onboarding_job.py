@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+class OnboardingJob(BaseModel):
+    id: str
+    status: Literal["PENDING", "ACCEPTED", "REJECTED", "FAILED"] = Field(
+        description="FAILED means the risk assessment could not complete (e.g. fraud service unavailable); submit again"
+    )
+    customer_id: Optional[int] = Field(default=None, description="Set once the customer is ACCEPTED")
+    reason: Optional[str] = Field(default=None, description="Why the onboarding was REJECTED or FAILED")
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
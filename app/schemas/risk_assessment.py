@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+class TierAssessment(BaseModel):
+    tier: str
+    input_hash: str
+    score: Optional[int] = None
+    detail: Optional[str] = Field(default=None, description="Fraud API category for the fraud_api tier")
+    rules_version: Optional[str] = None
+    assessed_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class TierResult(BaseModel):
+    """`TierAssessment` as returned by the API, without the input hash."""
+    tier: str
+    score: Optional[int] = None
+    detail: Optional[str] = None
+    rules_version: Optional[str] = None
+    assessed_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class CustomerRisk(BaseModel):
+    customer_id: int
+    status: Literal["approved", "unassessed"] = Field(
+        description="`unassessed` for customers onboarded before risk assessments were stored"
+    )
+    score: Optional[int] = None
+    rules_version: Optional[str] = None
+    tiers: List[TierResult] = []
@@ -1,6 +1,9 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.blacklist import BlacklistCreate
 from app.crud import blacklist as crud
+from app.services.blacklist_matcher import blacklist_matcher
 
-def create_new_blacklist(db: Session, blacklist_entry: BlacklistCreate):    
-    return crud.create_blacklist_entry(db, blacklist_entry)
+async def create_new_blacklist(db: AsyncSession, blacklist_entry: BlacklistCreate):    
+    db_blacklist = await crud.create_blacklist_entry(db, blacklist_entry)
+    blacklist_matcher.add(db_blacklist)
+    return db_blacklist
@@ -0,0 +1,206 @@
+"""Streamed line by line and written in chunked transactions, so a large regulator list never has to fit in memory."""
+
+import argparse
+import asyncio
+import codecs
+import csv
+import json
+import logging
+from typing import AsyncIterator, Optional
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import blacklist as crud
+from app.schemas.blacklist import BlacklistCreate, BlacklistImportReport, BlacklistImportRejectedRow
+from app.services.blacklist_matcher import blacklist_matcher
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 5000
+# Names per existing-entry lookup; keeps each IN list well under SQLite's bound parameter limit
+LOOKUP_BATCH_SIZE = 500
+MAX_REPORTED_REJECTIONS = 1000
+
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+def format_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    if not content_type:
+        return None
+    return CONTENT_TYPES.get(content_type.split(";")[0].strip().lower())
+
+
+def format_from_filename(filename: str) -> Optional[str]:
+    lowered = filename.lower()
+    if lowered.endswith(".csv"):
+        return "csv"
+    if lowered.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return None
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_records(lines: AsyncIterator[str], fmt: str) -> AsyncIterator[tuple[int, Optional[dict], Optional[str]]]:
+    """Yield (line number, row, error) for every data row of the file."""
+    line_no = 0
+    if fmt == "ndjson":
+        async for line in lines:
+            line_no += 1
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                yield line_no, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(data, dict):
+                yield line_no, None, "Expected a JSON object"
+                continue
+            yield line_no, data, None
+        return
+
+    header = None
+    buffer = ""
+    start = 0
+    async for line in lines:
+        line_no += 1
+        if buffer:
+            buffer += "\n" + line
+        else:
+            buffer, start = line, line_no
+        # An odd number of quotes means a quoted field continues on the next line
+        if buffer.count('"') % 2:
+            continue
+        record = next(csv.reader([buffer]), [])
+        buffer = ""
+        if not any(field.strip() for field in record):
+            continue
+        if header is None:
+            header = [field.strip() for field in record]
+            continue
+        if len(record) != len(header):
+            yield start, None, f"Expected {len(header)} fields, got {len(record)}"
+            continue
+        yield start, dict(zip(header, record)), None
+    if buffer:
+        yield start, None, "Unterminated quoted field"
+
+
+def _reject(report: BlacklistImportReport, line: int, reason: str):
+    report.rejected += 1
+    if len(report.rejected_rows) < MAX_REPORTED_REJECTIONS:
+        report.rejected_rows.append(BlacklistImportRejectedRow(line=line, reason=reason))
+
+
+async def _write_chunk(db: AsyncSession, keys: list[tuple], report: BlacklistImportReport):
+    names = list({key[0] for key in keys})
+    existing = set()
+    for i in range(0, len(names), LOOKUP_BATCH_SIZE):
+        existing |= await crud.get_blacklist_keys_by_names(db, names[i:i + LOOKUP_BATCH_SIZE])
+
+    new_entries = [
+        {"name": name, "email": email, "phone": phone, "date_of_birth": date_of_birth}
+        for name, email, phone, date_of_birth in keys
+        if (name, email, phone, date_of_birth) not in existing
+    ]
+    report.duplicates += len(keys) - len(new_entries)
+    if new_entries:
+        await crud.insert_blacklist_entries(db, new_entries)
+        report.inserted += len(new_entries)
+
+
+async def import_blacklist(
+    db: AsyncSession,
+    chunks: AsyncIterator[bytes],
+    fmt: str,
+    chunk_size: Optional[int] = None,
+) -> BlacklistImportReport:
+    chunk_size = chunk_size or IMPORT_CHUNK_SIZE
+    report = BlacklistImportReport()
+    seen: set[tuple] = set()
+    pending: list[tuple] = []
+
+    async for line_no, data, error in iter_records(iter_lines(chunks), fmt):
+        report.total_rows += 1
+        if error:
+            _reject(report, line_no, error)
+            continue
+        try:
+            entry = BlacklistCreate.model_validate(data)
+        except ValidationError as e:
+            _reject(report, line_no, "; ".join(f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()))
+            continue
+
+        key = (entry.name, entry.email, entry.phone, entry.date_of_birth)
+        if key in seen:
+            report.duplicates += 1
+            continue
+        seen.add(key)
+        pending.append(key)
+
+        if len(pending) >= chunk_size:
+            await _write_chunk(db, pending, report)
+            pending = []
+
+    if pending:
+        await _write_chunk(db, pending, report)
+
+    await blacklist_matcher.sync(db)
+    logger.info("Blacklist import: %s inserted, %s duplicates, %s rejected", report.inserted, report.duplicates, report.rejected)
+    return report
+
+
+async def read_file_chunks(path: str, size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        while chunk := f.read(size):
+            yield chunk
+
+
+def main():
+    from app.core.database import configure_database
+    from app.core.migrations import upgrade_schema
+
+    parser = argparse.ArgumentParser(description="Bulk import blacklist entries from a CSV or NDJSON file")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    fmt = args.format or format_from_filename(args.path)
+    if fmt is None:
+        parser.error("cannot infer the format from the file name; pass --format")
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    async def run():
+        database = configure_database()
+        try:
+            await upgrade_schema(database.engine)
+            async with database.session_factory() as db:
+                return await import_blacklist(db, read_file_chunks(args.path), fmt, args.chunk_size)
+        finally:
+            await database.dispose()
+
+    report = asyncio.run(run())
+    print(report.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
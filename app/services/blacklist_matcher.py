@@ -0,0 +1,97 @@
+"""Set indexes over the blacklist predicates of tier 1, so a signup is checked without scanning the table."""
+
+import asyncio
+import logging
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.blacklist import BlacklistModel
+from app.schemas.customer import CustomerCreate
+
+logger = logging.getLogger(__name__)
+
+
+class BlacklistMatcher:
+    def __init__(self):
+        self._name_email: set[tuple[str, str]] = set()
+        self._name_phone: set[tuple[str, str]] = set()
+        self._name_dob: set[tuple[str, str]] = set()
+        self._lock = asyncio.Lock()
+        self.version = 0
+        self.last_id = 0
+        self.loaded = False
+
+    def _index(self, name, email, phone, date_of_birth):
+        if email:
+            self._name_email.add((name, email))
+        if phone:
+            self._name_phone.add((name, phone))
+        if date_of_birth:
+            self._name_dob.add((name, date_of_birth))
+
+    def add(self, entry: BlacklistModel):
+        # last_id is left to sync(): entries committed concurrently by other
+        # workers may have lower ids and must not be skipped.
+        self._index(entry.name, entry.email, entry.phone, entry.date_of_birth)
+        self.version += 1
+
+    def matches(self, customer_data: CustomerCreate) -> bool:
+        name = customer_data.name
+        if (name, customer_data.email) in self._name_email:
+            return True
+        if customer_data.phone and (name, customer_data.phone) in self._name_phone:
+            return True
+        if customer_data.date_of_birth and (name, customer_data.date_of_birth) in self._name_dob:
+            return True
+        return False
+
+    def clear(self):
+        self._name_email = set()
+        self._name_phone = set()
+        self._name_dob = set()
+        self.last_id = 0
+        self.loaded = False
+        self.version += 1
+
+    async def sync(self, db: AsyncSession) -> int:
+        """Index every entry with an id above the current high-water mark."""
+        async with self._lock:
+            result = await db.execute(
+                select(
+                    BlacklistModel.id,
+                    BlacklistModel.name,
+                    BlacklistModel.email,
+                    BlacklistModel.phone,
+                    BlacklistModel.date_of_birth,
+                )
+                .where(BlacklistModel.id > self.last_id)
+                .order_by(BlacklistModel.id)
+            )
+            added = 0
+            for entry_id, name, email, phone, date_of_birth in result:
+                self._index(name, email, phone, date_of_birth)
+                self.last_id = entry_id
+                added += 1
+            if added:
+                self.version += 1
+            self.loaded = True
+        if added:
+            logger.info("Blacklist matcher synced %s entries (version=%s)", added, self.version)
+        return added
+
+    async def ensure_loaded(self, db: AsyncSession):
+        if not self.loaded:
+            await self.sync(db)
+
+
+blacklist_matcher = BlacklistMatcher()
+
+
+async def resync_periodically(session_factory, interval: float):
+    """Background task picking up entries written by other workers."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as db:
+                await blacklist_matcher.sync(db)
+        except Exception as e:
+            logger.error("Blacklist matcher resync failed: %s", e)
@@ -1,41 +1,166 @@
+import httpx
+from typing import Optional, Tuple
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import etags
 from app.exceptions.HighRiskError import HighRiskError
-from app.schemas.customer import CustomerCreate, CustomerUpdate
+from app.schemas.customer import Customer, CustomerCreate, CustomerUpdate, CustomerPage
+from app.schemas.risk_assessment import CustomerRisk, TierAssessment
 from app.crud import customer as crud
-from app.services.risk_assessment import assess_customer_risk
+from app.crud import risk_assessment as risk_crud
+from app.models.customer import CustomerModel
+from app.services import customer_cache
+from app.services.blacklist_matcher import blacklist_matcher
+from app.services.risk_assessment import run_risk_assessment
 
-def get_all_customers(db: Session):
-    return crud.get_customers(db)
+def customer_etag(customer) -> str:
+    return etags.make_etag(customer.id, customer.version)
 
-def get_customer_by_id(db: Session, customer_id: int):
-    customer = crud.get_customer_by_id(db, customer_id)
+async def get_customers_page(
+    db: AsyncSession, cursor: Optional[int], limit: int, if_none_match: Optional[str] = None, **filters
+) -> Tuple[str, Optional[CustomerPage]]:
+    """ETag and page; the page is None when `if_none_match` already names that ETag."""
+    # Fetch one extra row to know whether another page follows
+    customers = await crud.get_customers(db, after_id=cursor, limit=limit + 1, **filters)
+    next_cursor = None
+    if len(customers) > limit:
+        customers = customers[:limit]
+        next_cursor = customers[-1].id
+    etag = etags.digest_etag([(customer.id, customer.version) for customer in customers] + [("next", next_cursor)])
+    if etags.none_match(if_none_match, etag):
+        return etag, None
+    return etag, CustomerPage(items=customers, next_cursor=next_cursor)
+
+async def get_customer_by_id(db: AsyncSession, customer_id: int):
+    customer = await crud.get_customer_by_id(db, customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     return customer
 
-async def create_new_customer(db: Session, customer_data: CustomerCreate):
-    existing_customer = crud.get_customer_by_email(db, customer_data.email)
+async def get_customer_json(db: AsyncSession, customer_id: int, if_none_match: Optional[str] = None) -> Tuple[str, Optional[bytes]]:
+    """ETag and serialized customer, served from the read-through cache when possible.
+
+    The body is None when `if_none_match` already names the ETag.
+    """
+    cached = customer_cache.lookup(customer_id)
+    if cached is None:
+        generation = customer_cache.generation()
+        customer = await get_customer_by_id(db, customer_id)
+        etag = customer_etag(customer)
+        if etags.none_match(if_none_match, etag):
+            return etag, None
+        cached = etag, Customer.model_validate(customer).model_dump_json().encode()
+        customer_cache.store(customer_id, cached, generation)
+    etag, body = cached
+    return etag, None if etags.none_match(if_none_match, etag) else body
 
-    if existing_customer:
+def conflict_detail(error: IntegrityError):
+    if "national_id" in str(error.orig):
+        return "Customer with this national ID already exists"
+    return "Customer with this email already exists"
+
+async def ensure_not_registered(db: AsyncSession, customer_data: CustomerCreate):
+    """409 for a known duplicate, checked before any risk tier spends a fraud API call on it."""
+    emails, national_ids = await crud.get_existing_emails_and_national_ids(
+        db, [customer_data.email], [customer_data.national_id] if customer_data.national_id else []
+    )
+    if customer_data.email in emails:
         raise HTTPException(status_code=409, detail="Customer with this email already exists")
-    
+    if national_ids:
+        raise HTTPException(status_code=409, detail="Customer with this national ID already exists")
+
+async def create_new_customer(db: AsyncSession, customer_data: CustomerCreate, fraud_client: Optional[httpx.AsyncClient] = None):
+    await ensure_not_registered(db, customer_data)
+    # End the read transaction so no connection is held across the fraud API call
+    await db.rollback()
     try:
-        risk_score = await assess_customer_risk(db, customer_data)
-        customer_data.score = risk_score
+        assessment = await run_risk_assessment(db, customer_data, fraud_client)
     except HighRiskError:
         raise HTTPException(status_code=422, detail="Customer failed risk assessment")
 
-    return crud.create_customer(db, customer_data)
+    # The check above is only a shortcut: uniqueness is enforced by the database,
+    # so concurrent signups cannot both pass a check-then-insert
+    try:
+        return await crud.create_customer(db, customer_data, assessment)
+    except IntegrityError as e:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=conflict_detail(e))
+
+def customer_data_after_update(customer: CustomerModel, updates: CustomerUpdate) -> CustomerCreate:
+    """The customer as it will look once `updates` is applied, in the shape the risk tiers read."""
+    data = {
+        "name": customer.name,
+        "email": customer.email,
+        "phone": customer.phone,
+        "date_of_birth": customer.date_of_birth,
+        "national_id": customer.national_id,
+        "addresses": [
+            {"street": a.street, "city": a.city, "state": a.state, "zip_code": a.zip_code, "country": a.country}
+            for a in customer.addresses
+        ],
+    }
+    data.update(updates.model_dump(exclude_unset=True, exclude={"score", "rules_version"}))
+    return CustomerCreate.model_validate(data)
 
-def update_existing_customer(db: Session, customer_id: int, updates: CustomerUpdate):
-    customer = crud.get_customer_by_id(db, customer_id)
+async def update_existing_customer(
+    db: AsyncSession,
+    customer_id: int,
+    updates: CustomerUpdate,
+    if_match: Optional[str] = None,
+    fraud_client: Optional[httpx.AsyncClient] = None,
+):
+    customer = await crud.get_customer_by_id(db, customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
-    return crud.update_customer(db, customer, updates)
+    if not etags.match(if_match, customer_etag(customer)):
+        raise HTTPException(status_code=412, detail="Customer has been modified; fetch it again")
+
+    # Only tiers whose inputs changed run again. End the read transaction first so
+    # the writer connection is not held across a fraud API call; the version check
+    # on the UPDATE still catches anyone who commits in the meantime
+    previous = {row.tier: TierAssessment.model_validate(row) for row in await risk_crud.get_risk_assessments(db, customer_id)}
+    await blacklist_matcher.ensure_loaded(db)
+    await db.commit()
+    try:
+        assessment = await run_risk_assessment(db, customer_data_after_update(customer, updates), fraud_client, previous)
+    except HighRiskError:
+        raise HTTPException(status_code=422, detail="Customer failed risk assessment")
+
+    try:
+        updated = await crud.update_customer(db, customer, updates, assessment)
+    except IntegrityError as e:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=conflict_detail(e))
+    except StaleDataError:
+        # Another writer committed a new version between our read and our update
+        await db.rollback()
+        customer_cache.invalidate(customer_id)
+        if if_match is None:
+            raise HTTPException(status_code=409, detail="Customer was modified concurrently; retry the update")
+        raise HTTPException(status_code=412, detail="Customer has been modified; fetch it again")
+    customer_cache.invalidate(customer_id)
+    return updated
+
+async def get_customer_risk(db: AsyncSession, customer_id: int) -> CustomerRisk:
+    rows = await risk_crud.get_risk_assessments(db, customer_id)
+    if not rows:
+        if not await crud.get_customer_by_id(db, customer_id):
+            raise HTTPException(status_code=404, detail="Customer not found")
+        return CustomerRisk(customer_id=customer_id, status="unassessed")
+    customer_data = next((row for row in rows if row.tier == "customer_data"), None)
+    return CustomerRisk(
+        customer_id=customer_id,
+        status="approved",
+        score=customer_data.score if customer_data else None,
+        rules_version=customer_data.rules_version if customer_data else None,
+        tiers=rows,
+    )
 
-def delete_customer_by_id(db: Session, customer_id: int):
-    customer = crud.get_customer_by_id(db, customer_id)
+async def delete_customer_by_id(db: AsyncSession, customer_id: int):
+    customer = await crud.get_customer_by_id(db, customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
-    crud.delete_customer(db, customer)
+    await crud.delete_customer(db, customer)
+    customer_cache.invalidate(customer_id)
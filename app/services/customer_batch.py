@@ -0,0 +1,119 @@
+"""Each item gets its own result, so one bad signup never fails the rest of the batch."""
+
+import asyncio
+import logging
+from typing import Any, Optional
+import httpx
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import env_int
+from app.crud import customer as crud
+from app.exceptions.HighRiskError import HighRiskError
+from app.schemas.customer import CustomerCreate, BatchItemResult, BatchOnboardingResult
+from app.services.blacklist_matcher import blacklist_matcher
+from app.services.customer import conflict_detail
+from app.services.risk_assessment import run_risk_assessment
+
+logger = logging.getLogger(__name__)
+
+
+def _validation_reason(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'item'}: {e['msg']}" for e in error.errors()
+    )
+
+
+async def onboard_customers_batch(
+    db: AsyncSession,
+    items: list[dict[str, Any]],
+    fraud_client: Optional[httpx.AsyncClient] = None,
+) -> BatchOnboardingResult:
+    results: dict[int, BatchItemResult] = {}
+    candidates: dict[int, CustomerCreate] = {}
+    assessments: dict[int, dict] = {}
+
+    # 1. Validate every item independently and drop in-batch duplicates
+    seen_emails, seen_national_ids = set(), set()
+    for index, item in enumerate(items):
+        try:
+            customer = CustomerCreate.model_validate(item)
+        except ValidationError as e:
+            results[index] = BatchItemResult(index=index, status="rejected", reason=_validation_reason(e))
+            continue
+        if customer.email in seen_emails or (customer.national_id and customer.national_id in seen_national_ids):
+            results[index] = BatchItemResult(index=index, status="rejected", reason="Duplicate customer in batch")
+            continue
+        seen_emails.add(customer.email)
+        if customer.national_id:
+            seen_national_ids.add(customer.national_id)
+        candidates[index] = customer
+
+    # 2. Skip the paid fraud call for customers that already exist (one query)
+    existing_emails, existing_national_ids = await crud.get_existing_emails_and_national_ids(
+        db, list(seen_emails), list(seen_national_ids)
+    )
+    for index, customer in list(candidates.items()):
+        if customer.email in existing_emails:
+            reason = "Customer with this email already exists"
+        elif customer.national_id and customer.national_id in existing_national_ids:
+            reason = "Customer with this national ID already exists"
+        else:
+            continue
+        results[index] = BatchItemResult(index=index, status="rejected", reason=reason)
+        del candidates[index]
+
+    # 3. Assess risk concurrently; the session is not shared across tasks once
+    # the blacklist index is loaded. Ending the read transaction first hands the
+    # (single) writer connection back to the pool for the length of the fraud calls
+    await blacklist_matcher.ensure_loaded(db)
+    await db.commit()
+    semaphore = asyncio.Semaphore(max(1, env_int("BATCH_RISK_CONCURRENCY", 10)))
+
+    async def assess(index: int, customer: CustomerCreate):
+        async with semaphore:
+            try:
+                assessments[index] = await run_risk_assessment(db, customer, fraud_client)
+            except HighRiskError as e:
+                logger.info("Batch item %s failed risk assessment: %s", index, e)
+                results[index] = BatchItemResult(index=index, status="rejected", reason="Customer failed risk assessment")
+            except HTTPException as e:
+                results[index] = BatchItemResult(index=index, status="errored", reason=str(e.detail))
+            except Exception as e:
+                logger.error("Batch item %s risk assessment error: %s", index, e)
+                results[index] = BatchItemResult(index=index, status="errored", reason="Risk assessment failed")
+
+    await asyncio.gather(*(assess(index, customer) for index, customer in candidates.items()))
+    accepted = [(index, customer) for index, customer in candidates.items() if index not in results]
+
+    # 4. Insert everything accepted in one transaction; if a concurrent request
+    # took an email in the meantime, retry item by item inside savepoints
+    if accepted:
+        try:
+            db_customers = await crud.create_customers(
+                db, [customer for _, customer in accepted], [assessments[index] for index, _ in accepted]
+            )
+            for (index, _), db_customer in zip(accepted, db_customers):
+                results[index] = BatchItemResult(index=index, status="accepted", customer=db_customer)
+        except IntegrityError:
+            await db.rollback()
+            for index, customer in accepted:
+                try:
+                    async with db.begin_nested():
+                        db_customer = crud.build_customer_model(customer, assessments[index])
+                        db.add(db_customer)
+                    results[index] = BatchItemResult(index=index, status="accepted", customer=db_customer)
+                except IntegrityError as e:
+                    results[index] = BatchItemResult(index=index, status="rejected", reason=conflict_detail(e))
+            await db.commit()
+
+    ordered = [results[index] for index in range(len(items))]
+    summary = BatchOnboardingResult(
+        accepted=sum(r.status == "accepted" for r in ordered),
+        rejected=sum(r.status == "rejected" for r in ordered),
+        errored=sum(r.status == "errored" for r in ordered),
+        results=ordered,
+    )
+    logger.info("Batch onboarding: %s accepted, %s rejected, %s errored", summary.accepted, summary.rejected, summary.errored)
+    return summary
@@ -0,0 +1,73 @@
+"""A response read while an invalidation happened is not stored, so a slow read cannot undo an update."""
+
+from typing import Optional, Tuple
+from app.core.cache import TTLCache
+from app.core.config import CustomerCacheSettings
+from app.core.metrics import Counter, Gauge
+
+# (ETag, serialized body)
+CachedResponse = Tuple[str, bytes]
+
+_settings: Optional[CustomerCacheSettings] = None
+_cache: Optional[TTLCache] = None
+_invalidations = 0
+
+
+def get_customer_cache_settings() -> CustomerCacheSettings:
+    global _settings
+    if _settings is None:
+        _settings = CustomerCacheSettings.from_env()
+    return _settings
+
+
+def get_customer_cache() -> Optional[TTLCache]:
+    """The process-wide cache, built on first use; None when CUSTOMER_CACHE_ENABLED is off."""
+    global _cache
+    settings = get_customer_cache_settings()
+    if not settings.enabled:
+        return None
+    if _cache is None:
+        _cache = TTLCache(maxsize=settings.max_size, ttl=settings.ttl)
+    return _cache
+
+
+def configure_customer_cache(settings: Optional[CustomerCacheSettings] = None):
+    """Replace the settings (default: the environment) and drop the cache; tests call this to reset."""
+    global _settings, _cache
+    _settings = settings or CustomerCacheSettings.from_env()
+    _cache = None
+
+
+def lookup(customer_id: int) -> Optional[CachedResponse]:
+    cache = get_customer_cache()
+    return cache.get(customer_id) if cache is not None else None
+
+
+def generation() -> int:
+    """Take before reading from the database and pass to `store`."""
+    return _invalidations
+
+
+def store(customer_id: int, response: CachedResponse, read_generation: int):
+    cache = get_customer_cache()
+    if cache is not None and read_generation == _invalidations:
+        cache.set(customer_id, response)
+
+
+def invalidate(customer_id: int):
+    global _invalidations
+    _invalidations += 1
+    if _cache is not None:
+        _cache.invalidate(customer_id)
+
+
+def _cache_lookups():
+    if _cache is None:
+        return {}
+    return {("hit",): _cache.hits, ("miss",): _cache.misses}
+
+
+Counter("customer_cache_lookups_total", "GET /customers/{id} cache lookups, by result", labelnames=("result",), callback=_cache_lookups)
+Counter("customer_cache_evictions_total", "Customer responses evicted to stay within CUSTOMER_CACHE_MAX_SIZE",
+        callback=lambda: _cache.evictions if _cache is not None else 0)
+Gauge("customer_cache_entries", "Customer responses currently cached", callback=lambda: len(_cache) if _cache is not None else 0)
@@ -0,0 +1,55 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.customer import CustomerModel
+from app.schemas.customer import Customer as CustomerOut
+
+EXPORT_CHUNK_SIZE = 500
+
+CSV_COLUMNS = ["id", "name", "email", "phone", "date_of_birth", "national_id", "score", "addresses"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+async def iter_customer_chunks(db: AsyncSession, since_id: Optional[int] = None) -> AsyncIterator[list[dict]]:
+    query = select(CustomerModel).order_by(CustomerModel.id).execution_options(yield_per=EXPORT_CHUNK_SIZE)
+    if since_id is not None:
+        query = query.where(CustomerModel.id > since_id)
+
+    result = await db.stream(query)
+    async for partition in result.scalars().partitions():
+        # The session's identity map only holds weak references, so each chunk's
+        # ORM objects are released once it has been encoded
+        yield [CustomerOut.model_validate(customer).model_dump(mode="json") for customer in partition]
+
+
+async def export_ndjson(db: AsyncSession, since_id: Optional[int] = None) -> AsyncIterator[str]:
+    async for chunk in iter_customer_chunks(db, since_id):
+        yield "".join(json.dumps(customer, separators=(",", ":")) + "\n" for customer in chunk)
+
+
+async def export_csv(db: AsyncSession, since_id: Optional[int] = None) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    async for chunk in iter_customer_chunks(db, since_id):
+        buffer.seek(0)
+        buffer.truncate()
+        for customer in chunk:
+            customer["addresses"] = json.dumps(customer["addresses"], separators=(",", ":"))
+            writer.writerow(customer)
+        yield buffer.getvalue()
+
+
+EXPORTERS = {
+    "ndjson": export_ndjson,
+    "csv": export_csv,
+}
@@ -0,0 +1,53 @@
+import asyncio
+import os
+from typing import Any, List, Optional
+import httpx
+from app.core.batching import MicroBatcher
+from app.core.config import FraudBatchSettings
+from app.core.metrics import Counter
+from app.services.fraud_resilience import is_retryable_fraud_error, post_with_retries
+
+_settings: Optional[FraudBatchSettings] = None
+_batcher: Optional[MicroBatcher] = None
+
+
+def fraud_batch_url() -> str:
+    settings = _settings or FraudBatchSettings.from_env()
+    if settings.url:
+        return settings.url
+    return f"{(os.getenv('FRAUD_API_URL') or '').rstrip('/')}/batch"
+
+
+async def send_fraud_batch(client: httpx.AsyncClient, payloads: List[dict]) -> List[Any]:
+    try:
+        return await post_with_retries(client, fraud_batch_url(), payloads)
+    except httpx.HTTPStatusError as e:
+        if is_retryable_fraud_error(e) or len(payloads) == 1:
+            raise
+        single_url = os.getenv("FRAUD_API_URL")
+        return await asyncio.gather(
+            *(post_with_retries(client, single_url, payload) for payload in payloads), # type: ignore
+            return_exceptions=True,
+        )
+
+
+def configure_fraud_batcher(settings: Optional[FraudBatchSettings] = None):
+    """Replace the batcher, built from `settings` (default: the environment); tests call this to reset."""
+    global _settings, _batcher
+    _settings = settings or FraudBatchSettings.from_env()
+    _batcher = None
+    if _settings.enabled:
+        _batcher = MicroBatcher(send_fraud_batch, max_batch_size=_settings.max_batch_size, max_wait=_settings.max_wait)
+
+
+def get_fraud_batcher() -> Optional[MicroBatcher]:
+    """The process-wide batcher, built on first use; None when FRAUD_BATCH_ENABLED is off."""
+    if _settings is None:
+        configure_fraud_batcher()
+    return _batcher
+
+
+Counter("fraud_batches_sent_total", "Batched fraud API calls sent",
+        callback=lambda: _batcher.batches_sent if _batcher is not None else 0)
+Counter("fraud_batch_items_total", "Fraud payloads sent inside batches",
+        callback=lambda: _batcher.items_sent if _batcher is not None else 0)
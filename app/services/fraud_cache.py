@@ -0,0 +1,65 @@
+import hashlib
+import json
+import re
+from typing import Optional
+from app.core.cache import TTLCache
+from app.core.config import FraudCacheSettings
+from app.core.metrics import Counter, Gauge
+
+_WHITESPACE = re.compile(r"\s+")
+
+_settings: Optional[FraudCacheSettings] = None
+_cache: Optional[TTLCache] = None
+
+
+def fraud_cache_key(payload: dict) -> str:
+    normalized = {}
+    for field, value in payload.items():
+        if isinstance(value, str):
+            value = _WHITESPACE.sub(" ", value).strip()
+            if field == "email":
+                value = value.lower()
+        normalized[field] = value
+    encoded = json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def get_fraud_cache_settings() -> FraudCacheSettings:
+    global _settings
+    if _settings is None:
+        _settings = FraudCacheSettings.from_env()
+    return _settings
+
+
+def get_fraud_cache() -> Optional[TTLCache]:
+    """The process-wide cache, built on first use; None when FRAUD_CACHE_ENABLED is off."""
+    global _cache
+    settings = get_fraud_cache_settings()
+    if not settings.enabled:
+        return None
+    if _cache is None:
+        _cache = TTLCache(
+            maxsize=settings.max_size,
+            ttl=settings.ttl,
+            stale_ttl=settings.stale_ttl if settings.serve_stale else 0.0,
+        )
+    return _cache
+
+
+def configure_fraud_cache(settings: Optional[FraudCacheSettings] = None):
+    """Replace the settings (default: the environment) and drop the cache; tests call this to reset."""
+    global _settings, _cache
+    _settings = settings or FraudCacheSettings.from_env()
+    _cache = None
+
+
+def _cache_lookups():
+    if _cache is None:
+        return {}
+    return {("hit",): _cache.hits, ("miss",): _cache.misses, ("stale_hit",): _cache.stale_hits}
+
+
+Counter("fraud_cache_lookups_total", "Fraud decision cache lookups, by result", labelnames=("result",), callback=_cache_lookups)
+Counter("fraud_cache_evictions_total", "Fraud decisions evicted to stay within FRAUD_CACHE_MAX_SIZE",
+        callback=lambda: _cache.evictions if _cache is not None else 0)
+Gauge("fraud_cache_entries", "Fraud decisions currently cached", callback=lambda: len(_cache) if _cache is not None else 0)
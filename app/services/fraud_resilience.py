@@ -0,0 +1,76 @@
+import logging
+import httpx
+from typing import Any, Optional
+from app.core.config import FraudResilienceSettings
+from app.core.metrics import Gauge
+from app.core.resilience import CircuitBreaker, RetryPolicy, call_with_retries
+
+logger = logging.getLogger(__name__)
+
+_policy: Optional[RetryPolicy] = None
+_breaker: Optional[CircuitBreaker] = None
+
+
+def configure_fraud_resilience(settings: Optional[FraudResilienceSettings] = None):
+    global _policy, _breaker
+    settings = settings or FraudResilienceSettings.from_env()
+    _policy = RetryPolicy(
+        max_attempts=max(1, settings.max_attempts),
+        base_delay=settings.base_delay,
+        max_delay=settings.max_delay,
+        attempt_timeout=settings.attempt_timeout,
+        total_timeout=settings.total_timeout,
+    )
+    _breaker = CircuitBreaker(
+        "fraud-api",
+        failure_threshold=settings.breaker_failure_threshold,
+        reset_timeout=settings.breaker_reset_timeout,
+    )
+
+
+def get_fraud_retry_policy() -> RetryPolicy:
+    if _policy is None:
+        configure_fraud_resilience()
+    return _policy  # type: ignore[return-value]
+
+
+def get_fraud_breaker() -> CircuitBreaker:
+    if _breaker is None:
+        configure_fraud_resilience()
+    return _breaker  # type: ignore[return-value]
+
+
+def _breaker_state():
+    if _breaker is None:
+        return {}
+    current = _breaker.state
+    return {(state,): float(state == current) for state in (CircuitBreaker.CLOSED, CircuitBreaker.OPEN, CircuitBreaker.HALF_OPEN)}
+
+
+Gauge("fraud_breaker_state", "1 for the fraud API circuit breaker's current state", labelnames=("state",), callback=_breaker_state)
+
+
+def is_retryable_fraud_error(error: BaseException) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return isinstance(error, (httpx.TransportError, TimeoutError))
+
+
+async def _post(client: httpx.AsyncClient, url: str, payload: Any) -> Any:
+    response = await client.post(url, json=payload)
+
+    logger.debug("Response status code: %s", response.status_code)
+    logger.debug("Response headers: %s", response.headers)
+
+    response.raise_for_status()
+    return response.json()
+
+
+async def post_with_retries(client: httpx.AsyncClient, url: str, payload: Any) -> Any:
+    """POST to the fraud API under the shared retry policy and circuit breaker; returns the decoded JSON."""
+    return await call_with_retries(
+        lambda: _post(client, url, payload),
+        get_fraud_retry_policy(),
+        get_fraud_breaker(),
+        is_retryable_fraud_error,
+    )
@@ -0,0 +1,90 @@
+"""Stored per process: a retry that lands on another worker runs again."""
+
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from app.core.cache import TTLCache
+from app.core.config import IdempotencySettings
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyKeyReuseError(Exception):
+    """Raised when a key is presented again with a different request payload."""
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    status_code: int
+    body: Any
+    # Set by the failure itself, e.g. Retry-After on a 503
+    headers: Optional[Dict[str, str]] = None
+
+
+def request_fingerprint(payload: Any) -> str:
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class IdempotencyStore:
+    def __init__(self, ttl: float, max_entries: int):
+        self._completed = TTLCache(maxsize=max_entries, ttl=ttl)
+        self._in_flight: Dict[str, Tuple[str, asyncio.Task]] = {}
+
+    async def execute(
+        self, key: str, fingerprint: str, operation: Callable[[], Awaitable[StoredResponse]]
+    ) -> Tuple[StoredResponse, bool]:
+        """Run `operation` once per key; returns the response and whether it was replayed."""
+        completed = self._completed.get(key)
+        if completed is not None:
+            stored_fingerprint, response = completed
+            self._check_fingerprint(key, stored_fingerprint, fingerprint)
+            logger.info("Replaying stored response for idempotency key %s", key)
+            return response, True
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            stored_fingerprint, task = in_flight
+            self._check_fingerprint(key, stored_fingerprint, fingerprint)
+            logger.info("Waiting for in-flight request with idempotency key %s", key)
+            return await asyncio.shield(task), True
+
+        # The work runs as its own task so it finishes (and is stored) even if the
+        # first caller goes away, which is exactly when the client will retry
+        task = asyncio.ensure_future(operation())
+        self._in_flight[key] = (fingerprint, task)
+        task.add_done_callback(lambda done: self._complete(key, fingerprint, done))
+        return await asyncio.shield(task), False
+
+    def _complete(self, key: str, fingerprint: str, task: asyncio.Task):
+        if self._in_flight.get(key, (None, None))[1] is task:
+            del self._in_flight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        response = task.result()
+        if response.status_code < 500:
+            self._completed.set(key, (fingerprint, response))
+
+    @staticmethod
+    def _check_fingerprint(key: str, stored: str, presented: str):
+        if stored != presented:
+            raise IdempotencyKeyReuseError(f"Idempotency key {key} was already used with a different request payload")
+
+
+_store: Optional[IdempotencyStore] = None
+
+
+def configure_idempotency_store(settings: Optional[IdempotencySettings] = None):
+    """Replace the store with an empty one; the first lookup calls this, and tests call it to reset."""
+    global _store
+    settings = settings or IdempotencySettings.from_env()
+    _store = IdempotencyStore(ttl=settings.ttl, max_entries=settings.max_entries)
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    if _store is None:
+        configure_idempotency_store()
+    return _store  # type: ignore[return-value]
@@ -0,0 +1,241 @@
+"""Jobs are claimed in the database before they run, so a job queued twice or by two processes runs once."""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set
+import httpx
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import OnboardingSettings
+from app.core.database import get_database
+from app.core.http_client import get_fraud_client
+from app.core.metrics import Counter, Gauge
+from app.crud import onboarding_job as crud
+from app.models.onboarding_job import OnboardingJobModel
+from app.schemas.customer import CustomerCreate
+from app.services.customer import create_new_customer, ensure_not_registered
+
+logger = logging.getLogger(__name__)
+
+PENDING = "PENDING"
+ACCEPTED = "ACCEPTED"
+REJECTED = "REJECTED"
+FAILED = "FAILED"
+
+# Longer than a fraud call with all its retries can take
+CLAIM_TIMEOUT = timedelta(minutes=5)
+# How often a long-poll re-reads a job that another process is running
+POLL_INTERVAL = 1.0
+
+JOBS_COMPLETED = Counter(
+    "onboarding_jobs_completed_total",
+    "Asynchronous onboardings finished by this worker, by outcome",
+    labelnames=("status",),
+)
+
+
+class OnboardingQueueFull(Exception):
+    """Raised when the job queue is at ONBOARDING_QUEUE_SIZE."""
+
+
+class JobWaiters:
+    """Wakes long-polls for a job as soon as this process finishes it."""
+
+    def __init__(self):
+        self._waiters: Dict[str, Set[asyncio.Future]] = {}
+
+    async def wait(self, job_id: str, timeout: float) -> bool:
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(job_id, set()).add(future)
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            waiters = self._waiters.get(job_id)
+            if waiters is not None:
+                waiters.discard(future)
+                if not waiters:
+                    del self._waiters[job_id]
+
+    def notify(self, job_id: str):
+        for future in self._waiters.pop(job_id, ()):
+            if not future.done():
+                future.set_result(None)
+
+
+class OnboardingWorkerPool:
+    def __init__(self, session_factory: async_sessionmaker, workers: int, queue_size: int):
+        self._session_factory = session_factory
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.waiters = JobWaiters()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _ensure_started(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # The queue and the workers belong to one event loop; start fresh on a new one
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._tasks = [loop.create_task(self._work()) for _ in range(self.workers)]
+        return self._queue  # type: ignore[return-value]
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> int:
+        """Start the workers and queue again the PENDING jobs of a previous run; returns how many."""
+        queue = self._ensure_started()
+        async with self._session_factory() as db:
+            job_ids = await crud.get_pending_job_ids(db)
+        if job_ids:
+            logger.info("Resuming %s pending onboarding job(s)", len(job_ids))
+            # Fed by a task so a backlog larger than the queue does not hold up startup
+            self._tasks.append(asyncio.get_running_loop().create_task(self._requeue(queue, job_ids)))
+        self._tasks.append(asyncio.get_running_loop().create_task(self._rescan(queue)))
+        return len(job_ids)
+
+    async def _rescan(self, queue: asyncio.Queue):
+        while True:
+            await asyncio.sleep(CLAIM_TIMEOUT.total_seconds())
+            async with self._session_factory() as db:
+                job_ids = await crud.get_pending_job_ids(db, idle_since=datetime.now(timezone.utc) - CLAIM_TIMEOUT)
+            if job_ids:
+                logger.warning("Requeueing %s abandoned onboarding job(s)", len(job_ids))
+                await self._requeue(queue, job_ids)
+
+    async def _requeue(self, queue: asyncio.Queue, job_ids: List[str]):
+        for job_id in job_ids:
+            await queue.put((job_id, None))
+
+    def enqueue(self, job_id: str, fraud_client: Optional[httpx.AsyncClient] = None):
+        try:
+            self._ensure_started().put_nowait((job_id, fraud_client))
+        except asyncio.QueueFull:
+            raise OnboardingQueueFull(f"Onboarding queue is full ({self.queue_size} jobs)")
+
+    async def stop(self):
+        """Cancel the workers; jobs they had not finished stay PENDING for the next start."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop = None
+        self._queue = None
+
+    async def _work(self):
+        queue = self._queue
+        while True:
+            job_id, fraud_client = await queue.get()  # type: ignore[union-attr]
+            try:
+                await self.run(job_id, fraud_client)
+            except Exception:
+                logger.exception("Onboarding job %s crashed", job_id)
+            finally:
+                queue.task_done()  # type: ignore[union-attr]
+                self.waiters.notify(job_id)
+
+    async def run(self, job_id: str, fraud_client: Optional[httpx.AsyncClient] = None) -> Optional[str]:
+        """Run one job if it can be claimed; returns its final status."""
+        async with self._session_factory() as db:
+            if not await crud.claim_job(db, job_id, datetime.now(timezone.utc) - CLAIM_TIMEOUT):
+                logger.debug("Onboarding job %s is already done or running elsewhere", job_id)
+                return None
+            try:
+                status = await self._onboard(db, job_id, fraud_client)
+            except asyncio.CancelledError:
+                # Stopped mid-job: give the claim back so the next start runs it straight away
+                await db.rollback()
+                await crud.release_job(db, job_id)
+                raise
+        JOBS_COMPLETED.labels(status).inc()
+        logger.info("Onboarding job %s finished: %s", job_id, status)
+        return status
+
+    async def _onboard(self, db: AsyncSession, job_id: str, fraud_client: Optional[httpx.AsyncClient]) -> str:
+        job = await crud.get_job(db, job_id)
+        customer_id, reason = None, None
+        try:
+            customer = CustomerCreate.model_validate(job.payload)  # type: ignore[union-attr]
+            # The claim committed, so no connection is held during the fraud call
+            created = await create_new_customer(db, customer, fraud_client or get_fraud_client())
+            status, customer_id = ACCEPTED, created.id
+        except HTTPException as e:
+            status, reason = (REJECTED if e.status_code < 500 else FAILED), str(e.detail)
+        except Exception as e:
+            logger.error("Onboarding job %s failed: %s", job_id, e)
+            status, reason = FAILED, "Onboarding failed"
+        # A failed insert rolled the session back, so read the job again before completing it
+        await crud.complete_job(db, await crud.get_job(db, job_id), status, customer_id, reason)  # type: ignore[arg-type]
+        return status
+
+
+_settings: Optional[OnboardingSettings] = None
+_pool: Optional[OnboardingWorkerPool] = None
+
+
+def configure_onboarding_workers(
+    session_factory: Optional[async_sessionmaker] = None, settings: Optional[OnboardingSettings] = None
+) -> OnboardingWorkerPool:
+    """(Re)build the pool; used at startup (with the writer session factory) and by tests."""
+    global _settings, _pool
+    _settings = settings or OnboardingSettings.from_env()
+    _pool = OnboardingWorkerPool(
+        session_factory or get_database().session_factory, workers=_settings.workers, queue_size=_settings.queue_size
+    )
+    return _pool
+
+
+def get_onboarding_workers() -> OnboardingWorkerPool:
+    if _pool is None:
+        configure_onboarding_workers()
+    return _pool  # type: ignore[return-value]
+
+
+def get_onboarding_settings() -> OnboardingSettings:
+    if _settings is None:
+        configure_onboarding_workers()
+    return _settings  # type: ignore[return-value]
+
+
+async def submit_onboarding(db: AsyncSession, customer: CustomerCreate, fraud_client: Optional[httpx.AsyncClient] = None) -> OnboardingJobModel:
+    # Known duplicates are refused now rather than once a worker gets to them
+    await ensure_not_registered(db, customer)
+
+    job = await crud.create_job(db, customer)
+    try:
+        get_onboarding_workers().enqueue(job.id, fraud_client)
+    except OnboardingQueueFull as e:
+        logger.warning("Shedding onboarding: %s", e)
+        await crud.delete_job(db, job)
+        raise HTTPException(status_code=503, detail="Too many onboardings in progress; retry later", headers={"Retry-After": "5"})
+    logger.info("Queued onboarding job %s", job.id)
+    return job
+
+
+async def wait_for_job(db: AsyncSession, job_id: str, wait: float) -> OnboardingJobModel:
+    """The job once it is no longer PENDING, or as it stands after `wait` seconds."""
+    deadline = time.monotonic() + min(wait, get_onboarding_settings().max_wait)
+    waiters = get_onboarding_workers().waiters
+    while True:
+        job = await crud.get_job(db, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Onboarding job not found")
+        remaining = deadline - time.monotonic()
+        if job.status != PENDING or remaining <= 0:
+            return job
+        # End the read transaction (and give the connection back) while waiting,
+        # so the next read sees the worker's commit
+        await db.rollback()
+        await waiters.wait(job_id, min(remaining, POLL_INTERVAL))
+
+
+Gauge("onboarding_queue_depth", "Asynchronous onboarding jobs waiting for a worker",
+      callback=lambda: _pool.depth if _pool is not None else 0)
@@ -1,111 +1,180 @@
+import hashlib
+import json
 import logging
 import os
 import httpx
-from datetime import datetime, date
-from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 from app.exceptions.HighRiskError import HighRiskError
 from app.schemas.customer import CustomerCreate
-from app.crud import blacklist as crud
+from app.schemas.risk_assessment import TierAssessment
+from app.services.blacklist_matcher import blacklist_matcher
+from app.core.http_client import get_fraud_client
+from app.services.fraud_cache import fraud_cache_key, get_fraud_cache
+from app.services.fraud_resilience import post_with_retries
+from app.services.fraud_batcher import get_fraud_batcher
+from app.core.resilience import CircuitOpenError
+from app.services.risk_tiers import run_tiers
+from app.services.risk_rules import FIELDS, RuleSet, get_risk_rules
 
 logger = logging.getLogger(__name__)
 
-async def assess_customer_risk(db: Session, customer_data: CustomerCreate):
+# The blacklist changes independently of the customer, and checking it is an in-memory lookup
+ALWAYS_RUN = {"blacklist"}
 
-    if compute_risk_score_based_on_blacklist(db, customer_data):
+def _hash(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+def tier_input_hashes(customer_data: CustomerCreate, rules: RuleSet) -> Dict[str, str]:
+    """Hash of exactly what each tier reads, so an update can tell which tiers need to run again."""
+    return {
+        "blacklist": _hash([customer_data.name, customer_data.email, customer_data.phone, customer_data.date_of_birth]),
+        "fraud_api": fraud_cache_key(build_fraud_payload(customer_data)),
+        "customer_data": _hash([rules.version, {field: FIELDS[field](customer_data) for field in rules.fields}]),
+    }
+
+async def run_risk_assessment(
+    db: AsyncSession,
+    customer_data: CustomerCreate,
+    fraud_client: Optional[httpx.AsyncClient] = None,
+    previous: Optional[Dict[str, TierAssessment]] = None,
+) -> Dict[str, TierAssessment]:
+    """Assess every tier whose inputs differ from `previous` and reuse the stored result of the others.
+
+    Returns one result per tier, in tier order, and sets `score` and `rules_version` on `customer_data`.
+    """
+    # Read the rule set once so a hot reload mid-assessment cannot mix versions
+    rules = get_risk_rules()
+    hashes = tier_input_hashes(customer_data, rules)
+    previous = previous or {}
+    reused = {
+        tier: previous[tier] for tier, input_hash in hashes.items()
+        if tier not in ALWAYS_RUN and tier in previous and previous[tier].input_hash == input_hash
+    }
+
+    tiers = {
+        "blacklist": lambda: _blacklist_tier(db, customer_data, hashes["blacklist"]),
+        "fraud_api": lambda: _fraud_api_tier(customer_data, fraud_client, hashes["fraud_api"]),
+        "customer_data": lambda: _customer_data_tier(customer_data, rules, hashes["customer_data"]),
+    }
+    if reused:
+        logger.debug("Reusing risk tier result(s) %s for customer %s", list(reused), customer_data.email)
+    results = await run_tiers({tier: run() for tier, run in tiers.items() if tier not in reused})
+    assessment = {tier: reused.get(tier) or results[tier] for tier in tiers}
+
+    customer_data.score = assessment["customer_data"].score
+    customer_data.rules_version = assessment["customer_data"].rules_version
+    return assessment
+
+async def assess_customer_risk(db: AsyncSession, customer_data: CustomerCreate, fraud_client: Optional[httpx.AsyncClient] = None):
+    assessment = await run_risk_assessment(db, customer_data, fraud_client)
+    return assessment["customer_data"].score
+
+def _tier_result(tier: str, input_hash: str, **fields) -> TierAssessment:
+    return TierAssessment(tier=tier, input_hash=input_hash, assessed_at=datetime.now(timezone.utc), **fields)
+
+async def _blacklist_tier(db: AsyncSession, customer_data: CustomerCreate, input_hash: str):
+    if await compute_risk_score_based_on_blacklist(db, customer_data):
         raise HighRiskError("Customer is on the blacklist")
+    return _tier_result("blacklist", input_hash)
 
-    result = await compute_risk_score_based_on_fraud_api(customer_data)
+async def _fraud_api_tier(customer_data: CustomerCreate, fraud_client: Optional[httpx.AsyncClient], input_hash: str):
+    result = await compute_risk_score_based_on_fraud_api(customer_data, client=fraud_client)
     if result.get("category") == "HIGH":
         raise HighRiskError("Customer is flagged as high risk by fraud detection service")
     elif result.get("category", "LOW") == "MEDIUM" and result.get("score", 0) > 55:
         raise HighRiskError("Customer is flagged as high risk by fraud detection service")
+    return _tier_result("fraud_api", input_hash, score=result.get("score"), detail=result.get("category"))
 
-    score = compute_risk_score_based_on_customer_data(customer_data)
-    if score > 30:
-        raise HighRiskError("Customer risk score is very high")    
+async def _customer_data_tier(customer_data: CustomerCreate, rules: RuleSet, input_hash: str):
+    score = compute_risk_score_based_on_customer_data(customer_data, rules)
+    if score > rules.threshold:
+        raise HighRiskError("Customer risk score is very high")
+    return _tier_result("customer_data", input_hash, score=score, rules_version=rules.version)
 
+def compute_risk_score_based_on_customer_data(customer_data: CustomerCreate, rules: Optional[RuleSet] = None):
+    rules = rules or get_risk_rules()
+    score, matched = rules.evaluate(customer_data)
+    logger.debug("Risk rules %s matched %s for customer %s (score=%s)", rules.version, matched, customer_data.email, score)
     return score
 
-def compute_risk_score_based_on_customer_data(customer_data: CustomerCreate):
-    score = 0
-
-    if customer_data.date_of_birth:
-        age = (date.today() - datetime.strptime(customer_data.date_of_birth, "%Y-%m-%d").date()).days // 365
-        if age < 25:
-            score += 20
-        elif age < 40:
-            score += 10
-        else:
-            score += 5
 
-    if customer_data.phone and not customer_data.phone.startswith("07"):
-        score += 15
+async def compute_risk_score_based_on_blacklist(db: AsyncSession, customer_data: CustomerCreate):
+    # Only the first call per process touches the DB; after that it is an in-memory lookup
+    await blacklist_matcher.ensure_loaded(db)
+    return blacklist_matcher.matches(customer_data)
 
-    if customer_data.email and customer_data.email.endswith("@example.com"):
-        score += 25
+def build_fraud_payload(customer_data: CustomerCreate):
+    return {
+        "name": customer_data.name,
+        "address": f"{customer_data.addresses[0].street}, {customer_data.addresses[0].city}, {customer_data.addresses[0].state}, {customer_data.addresses[0].zip_code}, {customer_data.addresses[0].country}" if customer_data.addresses else "Unknown Address",
+        "date_of_birth": customer_data.date_of_birth,
+        "email": customer_data.email
+    }
 
-    return score
+async def compute_risk_score_based_on_fraud_api(customer_data: CustomerCreate, client: Optional[httpx.AsyncClient] = None):
+    fraud_payload = build_fraud_payload(customer_data)
 
+    cache = get_fraud_cache()
+    cache_key = fraud_cache_key(fraud_payload) if cache is not None else None
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info("Fraud API cache hit for customer %s", customer_data.email)
+            return dict(cached)
 
-def compute_risk_score_based_on_blacklist(db: Session, customer_data: CustomerCreate):
-    blacklist_entry = crud.search_blacklist_by_customer_data(db, customer_data)
-    if blacklist_entry:
-        return True
+    try:
+        result = await call_fraud_api(fraud_payload, client)
+    except HTTPException:
+        stale = cache.get_stale(cache_key) if cache is not None else None
+        if stale is not None:
+            logger.warning("Fraud API failed; serving stale cached decision for customer %s", customer_data.email)
+            return dict(stale)
+        raise
 
-    return False
+    if cache is not None:
+        cache.set(cache_key, result)
+    return dict(result)
 
-async def compute_risk_score_based_on_fraud_api(customer_data: CustomerCreate):
+async def call_fraud_api(fraud_payload: dict, client: Optional[httpx.AsyncClient] = None):
     external_url = os.getenv("FRAUD_API_URL")
-    logger.info(f"Calling external fraud detection API at {external_url} for customer {customer_data.email}")
-    
-    fraud_payload = {
-        "name": customer_data.name,
-        "address": f"{customer_data.addresses[0].street}, {customer_data.addresses[0].city}, {customer_data.addresses[0].state}, {customer_data.addresses[0].zip_code}, {customer_data.addresses[0].country}" if customer_data.addresses else "Unknown Address",
-        "date_of_birth": customer_data.date_of_birth,
-        "email": customer_data.email
-    }
-    
-    logger.debug(f"Making async POST request to {external_url} with data: {fraud_payload}")
+    logger.info("Calling external fraud detection API at %s for customer %s", external_url, fraud_payload['email'])
     
-    timeout = httpx.Timeout(30.0)
+    logger.debug("Making async POST request to %s with data: %s", external_url, fraud_payload)
     
+    client = client or get_fraud_client()
+
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(
-                external_url, # type: ignore
-                json=fraud_payload,
-                headers={
-                    'Content-Type': 'application/json',
-                    'Accept': 'application/json'
-                }
-            )
-            
-            logger.debug(f"Response status code: {response.status_code}")
-            logger.debug(f"Response headers: {dict(response.headers)}")
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            logger.info(f"Fraud API response: {result}")
-            
-            return {
-                "score": result.get("score", 0),
-                "category": result.get("category", "LOW")
-            }
-                
+        batcher = get_fraud_batcher()
+        if batcher is not None:
+            result = await batcher.submit(client, fraud_payload)
+        else:
+            result = await post_with_retries(client, external_url, fraud_payload) # type: ignore
+
+        logger.info("Fraud API response: %s", result)
+
+        return {
+            "score": result.get("score", 0),
+            "category": result.get("category", "LOW")
+        }
+
+    except CircuitOpenError as e:
+        logger.warning("Skipping fraud API call: %s", e)
+        raise HTTPException(status_code=503, detail="Fraud detection service is unavailable") from e
     except httpx.ConnectError as e:
-        logger.error(f"Connection error when calling fraud API: {e}")
+        logger.error("Connection error when calling fraud API: %s", e)
         raise HTTPException(status_code=503, detail="Cannot connect to fraud detection service") from e
-    except httpx.TimeoutException as e:
-        logger.error(f"Timeout error when calling fraud API: {e}")
+    except (httpx.TimeoutException, TimeoutError) as e:
+        logger.error("Timeout error when calling fraud API: %s", e)
         raise HTTPException(status_code=503, detail="Fraud detection service timeout") from e
     except httpx.HTTPStatusError as e:
-        logger.error(f"HTTP error when calling fraud API: {e} - Status: {e.response.status_code}")
+        logger.error("HTTP error when calling fraud API: %s - Status: %s", e, e.response.status_code)
         raise HTTPException(status_code=503, detail="Fraud detection service returned an error") from e
     except httpx.RequestError as e:
-        logger.error(f"General request error when calling fraud API: {e}")
+        logger.error("General request error when calling fraud API: %s", e)
         raise HTTPException(status_code=503, detail="Fraud detection service is unavailable") from e
     except Exception as e:
-        logger.error(f"Unexpected error when calling fraud API: {e}")
+        logger.error("Unexpected error when calling fraud API: %s", e)
         raise HTTPException(status_code=503, detail="Fraud detection service is unavailable") from e
\ No newline at end of file
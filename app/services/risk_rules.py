@@ -0,0 +1,235 @@
+"""A new rule set is compiled before it is swapped in, so a bad file leaves the previous one active."""
+
+import asyncio
+import json
+import logging
+import operator
+import os
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.core.config import RiskRulesSettings
+from app.schemas.customer import CustomerCreate
+
+logger = logging.getLogger(__name__)
+
+Context = Dict[str, Any]
+CompiledRule = Callable[[Context], int]
+
+
+class RiskRulesError(ValueError):
+    """Raised when a rules file cannot be parsed or compiled."""
+
+
+def _age(customer: CustomerCreate) -> Optional[int]:
+    if not customer.date_of_birth:
+        return None
+    return (date.today() - datetime.strptime(customer.date_of_birth, "%Y-%m-%d").date()).days // 365
+
+
+FIELDS: Dict[str, Callable[[CustomerCreate], Any]] = {
+    "age": _age,
+    "name": lambda customer: customer.name,
+    "email": lambda customer: customer.email,
+    "phone": lambda customer: customer.phone,
+    "national_id": lambda customer: customer.national_id,
+    "country": lambda customer: customer.addresses[0].country if customer.addresses else None,
+}
+
+# Type each field's value has, so a rule comparing it with the wrong type fails to compile, not at request time
+FIELD_TYPES: Dict[str, type] = {"age": int, "name": str, "email": str, "phone": str, "national_id": str, "country": str}
+STRING_OPERATORS = {"startswith", "not_startswith", "endswith", "not_endswith", "matches"}
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "lt": operator.lt,
+    "le": operator.le,
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "in": lambda value, options: value in options,
+    "not_in": lambda value, options: value not in options,
+    "startswith": lambda value, prefix: str(value).startswith(prefix),
+    "not_startswith": lambda value, prefix: not str(value).startswith(prefix),
+    "endswith": lambda value, suffix: str(value).endswith(suffix),
+    "not_endswith": lambda value, suffix: not str(value).endswith(suffix),
+}
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    version: str
+    threshold: int
+    fields: Tuple[str, ...]
+    rules: Tuple[Tuple[str, CompiledRule], ...]
+
+    def evaluate(self, customer: CustomerCreate) -> Tuple[int, List[str]]:
+        """Score the customer in one pass; returns the total and the names of the rules that scored."""
+        context = {field: FIELDS[field](customer) for field in self.fields}
+        score = 0
+        matched = []
+        for name, rule in self.rules:
+            points = rule(context)
+            if points:
+                score += points
+                matched.append(name)
+        return score, matched
+
+
+def _is_a(value: Any, expected: type) -> bool:
+    if expected is int:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    return isinstance(value, expected)
+
+
+def _check_value(spec: Dict[str, Any], op: str, value: Any):
+    expected = str if op in STRING_OPERATORS else FIELD_TYPES[spec["field"]]
+    values = value if op in ("in", "not_in") else [value]
+    if op in ("in", "not_in") and not isinstance(value, list):
+        raise RiskRulesError(f"Operator '{op}' in rule '{spec.get('name')}' needs a list")
+    for item in values:
+        if not _is_a(item, expected):
+            raise RiskRulesError(f"Value {item!r} in rule '{spec.get('name')}' is not a {expected.__name__} (field '{spec['field']}', op '{op}')")
+
+
+def _compile_rule(spec: Dict[str, Any]) -> CompiledRule:
+    field = spec["field"]
+
+    if "bands" in spec:
+        for band in spec["bands"]:
+            _check_value(spec, "lt", band["below"])
+        bands = tuple((band["below"], int(band["score"])) for band in spec["bands"])
+        otherwise = int(spec.get("otherwise", 0))
+
+        def banded(context: Context) -> int:
+            value = context[field]
+            if value in (None, ""):
+                return 0
+            for upper, points in bands:
+                if value < upper:
+                    return points
+            return otherwise
+
+        return banded
+
+    op = spec["op"]
+    if op in OPERATORS or op == "matches":
+        _check_value(spec, op, spec["value"])
+    if op == "matches":
+        pattern = re.compile(spec["value"])
+        test: Callable[[Any], bool] = lambda value: pattern.search(str(value)) is not None
+    elif op in OPERATORS:
+        compare, expected = OPERATORS[op], spec["value"]
+        if op in ("in", "not_in"):
+            expected = frozenset(expected)
+        test = lambda value: compare(value, expected)
+    else:
+        raise RiskRulesError(f"Unknown operator '{op}' in rule '{spec.get('name')}'")
+    points = int(spec["score"])
+
+    def predicate(context: Context) -> int:
+        value = context[field]
+        if value in (None, ""):
+            return 0
+        return points if test(value) else 0
+
+    return predicate
+
+
+def compile_rules(document: Dict[str, Any]) -> RuleSet:
+    try:
+        specs = document["rules"]
+        compiled = []
+        for position, spec in enumerate(specs):
+            if not isinstance(spec, dict):
+                raise RiskRulesError(f"Rule {position} must be an object, got {type(spec).__name__}")
+            if spec.get("field") not in FIELDS:
+                raise RiskRulesError(f"Unknown field '{spec.get('field')}' in rule {position}")
+            compiled.append((spec.get("name", f"rule_{position}"), _compile_rule(spec)))
+        return RuleSet(
+            version=str(document["version"]),
+            threshold=int(document["threshold"]),
+            fields=tuple(sorted({spec["field"] for spec in specs})),
+            rules=tuple(compiled),
+        )
+    except RiskRulesError:
+        raise
+    except (KeyError, TypeError, ValueError, re.error) as e:
+        raise RiskRulesError(f"Invalid risk rules: {e!r}") from e
+
+
+def load_rules(path: str) -> RuleSet:
+    try:
+        with open(path, encoding="utf-8") as f:
+            document = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise RiskRulesError(f"Cannot read risk rules from {path}: {e}") from e
+    return compile_rules(document)
+
+
+class RiskRulesRegistry:
+    def __init__(self, path: str):
+        self.path = path
+        self._rules: Optional[RuleSet] = None
+        self._signature: Optional[Tuple[int, int]] = None
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @property
+    def current(self) -> RuleSet:
+        if self._rules is None:
+            self._signature = self._stat()
+            self._rules = load_rules(self.path)
+            logger.info("Loaded risk rules version %s from %s", self._rules.version, self.path)
+        return self._rules
+
+    def reload_if_changed(self) -> bool:
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+        try:
+            rules = load_rules(self.path)
+        except RiskRulesError as e:
+            logger.error("Keeping risk rules version %s: %s", self._rules.version if self._rules else '-', e)
+            return False
+        previous, self._rules = self._rules, rules
+        logger.info("Reloaded risk rules: version %s -> %s", previous.version if previous else '-', rules.version)
+        return True
+
+
+_registry: Optional[RiskRulesRegistry] = None
+_settings: Optional[RiskRulesSettings] = None
+
+
+def configure_risk_rules(settings: Optional[RiskRulesSettings] = None):
+    """(Re)build the registry from settings; used at startup and by tests."""
+    global _registry, _settings
+    _settings = settings or RiskRulesSettings.from_env()
+    _registry = RiskRulesRegistry(_settings.path)
+
+
+def get_risk_rules_registry() -> RiskRulesRegistry:
+    if _registry is None:
+        configure_risk_rules()
+    return _registry  # type: ignore[return-value]
+
+
+def get_risk_rules() -> RuleSet:
+    return get_risk_rules_registry().current
+
+
+async def watch_risk_rules(interval: float):
+    """Background task hot-reloading the rules file when it changes."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            get_risk_rules_registry().reload_if_changed()
+        except Exception as e:
+            logger.error("Risk rules reload failed: %s", e)
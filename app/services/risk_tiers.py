@@ -0,0 +1,64 @@
+"""Tiers run concurrently but report in tier order, so the outcome matches running them one after another."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Dict
+from app.core.metrics import Counter, Histogram
+from app.exceptions.HighRiskError import HighRiskError
+
+logger = logging.getLogger(__name__)
+
+TIER_SECONDS = Histogram(
+    "risk_tier_duration_seconds",
+    "Time spent in each risk-assessment tier",
+    labelnames=("tier", "outcome"),
+)
+REJECTIONS = Counter(
+    "onboarding_rejections_total",
+    "Risk-assessment rejections, by the tier that rejected",
+    labelnames=("reason",),
+)
+
+
+async def _timed(name: str, tier: Awaitable[Any]) -> Any:
+    started = time.perf_counter()
+    outcome = "passed"
+    try:
+        return await tier
+    except HighRiskError:
+        outcome = "rejected"
+        raise
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        raise
+    except Exception:
+        outcome = "failed"
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        TIER_SECONDS.labels(name, outcome).observe(elapsed)
+        logger.debug("Risk tier '%s' %s in %.1fms", name, outcome, elapsed * 1000)
+
+
+async def run_tiers(tiers: Dict[str, Awaitable[Any]]) -> Dict[str, Any]:
+    """Run the tiers concurrently and return their results keyed by name, in tier order."""
+    tasks = {name: asyncio.ensure_future(_timed(name, tier)) for name, tier in tiers.items()}
+    try:
+        results = {}
+        for name, task in tasks.items():
+            try:
+                results[name] = await task
+            except HighRiskError:
+                # Only the tier whose rejection is reported counts, not lower tiers that also rejected
+                REJECTIONS.labels(name).inc()
+                raise
+        return results
+    finally:
+        pending = [task for task in tasks.values() if not task.done()]
+        for task in pending:
+            task.cancel()
+        # Reap cancelled and already-failed tiers so their exceptions are not reported as unretrieved
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        if pending:
+            logger.debug("Cancelled %s pending risk tier(s)", len(pending))
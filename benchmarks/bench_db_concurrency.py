@@ -0,0 +1,117 @@
+"""
+Concurrent-request throughput: blocking Session vs AsyncSession.
+
+Simulates onboarding-style handlers that read from SQLite and then await a
+(stubbed) fraud API round trip. The "sync" mode reproduces the old layer, where
+a synchronous SQLAlchemy Session is used inside `async def` routes and every
+query stalls the event loop. The "async" mode goes through the aiosqlite engine
+and the async CRUD functions used by the app today.
+
+Usage:
+    python -m benchmarks.bench_db_concurrency --requests 400 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.core.database import Base
+from app.crud import customer as crud
+from app.models.customer import CustomerModel, AddressModel
+
+
+def seed(path: str, rows: int):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add_all(
+            CustomerModel(
+                name=f"Customer {i}",
+                email=f"customer{i}@example.org",
+                phone="07123456789",
+                date_of_birth="1990-01-01",
+                addresses=[AddressModel(street=f"{i} High St", city="Leeds", state="WY", zip_code="LS1", country="UK")],
+            )
+            for i in range(rows)
+        )
+        db.commit()
+    engine.dispose()
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def run(mode: str, path: str, requests: int, concurrency: int, fraud_latency: float):
+    if mode == "sync":
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        SyncSession = sessionmaker(bind=engine)
+
+        async def handler(i: int):
+            with SyncSession() as db:
+                db.query(CustomerModel).filter(CustomerModel.email == f"customer{i}@example.org").first()
+                db.query(CustomerModel).limit(200).all()
+            await asyncio.sleep(fraud_latency)
+    else:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        AsyncSession = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+        async def handler(i: int):
+            async with AsyncSession() as db:
+                await crud.get_customer_by_email(db, f"customer{i}@example.org")
+                (await db.execute(select(CustomerModel).limit(200))).scalars().all()
+            await asyncio.sleep(fraud_latency)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(i: int):
+        async with semaphore:
+            await handler(i)
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(bounded(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    worst_lag = await lag_task
+
+    if mode == "sync":
+        engine.dispose()
+    else:
+        await engine.dispose()
+    return elapsed, worst_lag
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--fraud-latency", type=float, default=0.02, help="Simulated fraud API latency (seconds)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        seed(path, args.rows)
+        print(f"{'mode':<6} {'req/s':>10} {'elapsed s':>10} {'max loop lag ms':>16}")
+        for mode in ("sync", "async"):
+            elapsed, lag = asyncio.run(run(mode, path, args.requests, args.concurrency, args.fraud_latency))
+            print(f"{mode:<6} {args.requests / elapsed:>10.1f} {elapsed:>10.2f} {lag * 1000:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
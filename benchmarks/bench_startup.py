@@ -0,0 +1,73 @@
+"""
+Cold start of a new worker: importing `app.main` and running its lifespan
+until readiness is reported.
+
+Each sample is a fresh interpreter started in an empty directory, so the
+SQLite schema is created from scratch and nothing is shared with earlier
+samples. The child reports its own timings, which leaves interpreter boot out
+of the numbers.
+
+Usage:
+    python -m benchmarks.bench_startup --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import asyncio, json, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+from app.main import app
+from app.core.startup import startup_state
+imported = time.perf_counter() - started
+
+async def main():
+    async with app.router.lifespan_context(app):
+        assert startup_state.ready
+    return time.perf_counter() - started
+
+ready = asyncio.run(main())
+print(json.dumps({{"import_s": imported, "ready_s": ready, "phases": startup_state.phases}}))
+"""
+
+
+def cold_start() -> Dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, LOG_LEVEL="WARNING", LOG_FILE=os.path.join(tmp, "app.log"))
+        completed = subprocess.run(
+            [sys.executable, "-c", CHILD.format(root=ROOT)],
+            cwd=tmp, env=env, capture_output=True, text=True, check=True,
+        )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def cold_starts(runs: int) -> List[Dict]:
+    return [cold_start() for _ in range(runs)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    samples = cold_starts(args.runs)
+    print(f"{'step':<16} {'median ms':>10} {'min ms':>10}")
+    for label, key in (("import app.main", "import_s"), ("ready", "ready_s")):
+        values = [sample[key] for sample in samples]
+        print(f"{label:<16} {statistics.median(values) * 1000:>10.1f} {min(values) * 1000:>10.1f}")
+    for phase in samples[0]["phases"]:
+        values = [sample["phases"][phase] for sample in samples]
+        print(f"  {phase:<14} {statistics.median(values) * 1000:>10.1f} {min(values) * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
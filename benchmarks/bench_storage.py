@@ -0,0 +1,116 @@
+"""
+Read throughput while onboarding writes are running: the old single engine with
+default journaling vs the tuned storage profile (WAL, pragmas, a read-only
+pool next to a single writer connection).
+
+Writer tasks insert customers with their addresses, one commit per customer,
+like `POST /customers/`. At the same time, reader tasks fetch pages (`--page-size`)
+through `crud.get_customers`, like `GET /customers/`. Each mode runs for
+`--duration` seconds against its own freshly seeded file.
+
+Usage:
+    python -m benchmarks.bench_storage --duration 5 --readers 20 --writers 4
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from app.core.config import StorageSettings
+from app.core.database import Base, Database
+from app.crud import customer as crud
+from app.schemas.customer import CustomerCreate
+from benchmarks.run import seed_customers
+
+
+def session_factories(mode: str, url: str):
+    if mode == "legacy":
+        # What app/core/database.py used to do: one default engine for everything
+        engine = create_async_engine(url)
+        factory = async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+        return factory, factory, engine.dispose
+    database = Database(StorageSettings(url=url))
+    return database.session_factory, database.read_session_factory, database.dispose
+
+
+async def run(mode: str, url: str, rows: int, duration: float, readers: int, writers: int, page_size: int):
+    write_factory, read_factory, dispose = session_factories(mode, url)
+    async with write_factory() as db:
+        # Connect the writer first so the journal mode is set before readers open the file
+        await db.run_sync(lambda session: Base.metadata.create_all(session.connection()))
+        await db.commit()
+
+    deadline = time.perf_counter() + duration
+    read_latencies = []
+    writes = 0
+    write_errors = 0
+
+    async def reader(worker: int):
+        cursor = (worker * 997) % max(1, rows - page_size)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            async with read_factory() as db:
+                await crud.get_customers(db, after_id=cursor, limit=page_size)
+            read_latencies.append(time.perf_counter() - started)
+
+    async def writer(worker: int):
+        nonlocal writes, write_errors
+        sequence = 0
+        while time.perf_counter() < deadline:
+            sequence += 1
+            customer = CustomerCreate(
+                name=f"Load {worker}-{sequence}", email=f"load{worker}.{sequence}@gmail.com", phone="07123456789",
+                date_of_birth="1990-01-01",
+                addresses=[{"street": "1 High Street", "city": "Leeds", "state": "WY", "zip_code": "LS1 1AA", "country": "UK"}],
+            )
+            try:
+                async with write_factory() as db:
+                    await crud.create_customer(db, customer)
+                writes += 1
+            except Exception:
+                write_errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(reader(i) for i in range(readers)), *(writer(i) for i in range(writers)))
+    elapsed = time.perf_counter() - started
+    await dispose()
+
+    read_latencies.sort()
+    p95 = read_latencies[int(len(read_latencies) * 0.95) - 1] if read_latencies else 0.0
+    return {
+        "reads_per_sec": len(read_latencies) / elapsed,
+        "read_p50_ms": statistics.median(read_latencies) * 1000 if read_latencies else 0.0,
+        "read_p95_ms": p95 * 1000,
+        "writes_per_sec": writes / elapsed,
+        "write_errors": write_errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=20)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'reads/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'writes/s':>9} {'errors':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("legacy", "tuned"):
+            path = os.path.join(tmp, f"{mode}.db")
+            seed_customers(f"sqlite:///{path}", args.rows)
+            stats = asyncio.run(run(mode, f"sqlite+aiosqlite:///{path}", args.rows, args.duration, args.readers, args.writers, args.page_size))
+            print(f"{mode:<8} {stats['reads_per_sec']:>9.1f} {stats['read_p50_ms']:>8.1f} {stats['read_p95_ms']:>8.1f} "
+                  f"{stats['writes_per_sec']:>9.1f} {stats['write_errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Medians, not means, are compared between runs: they are far less sensitive to a noisy neighbour."""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+def summarize(per_op: List[float], iterations: int) -> Dict[str, float]:
+    median = statistics.median(per_op)
+    return {
+        "median_s": median,
+        "min_s": min(per_op),
+        "mean_s": statistics.fmean(per_op),
+        "stdev_s": statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+        "ops_per_sec": 1 / median if median else float("inf"),
+        "rounds": len(per_op),
+        "iterations": iterations,
+    }
+
+
+def _calibrate(elapsed_for: Callable[[int], float], min_round_time: float) -> int:
+    iterations = 1
+    while True:
+        elapsed = elapsed_for(iterations)
+        if elapsed >= min_round_time or iterations >= 1_000_000:
+            return iterations
+        # Aim a little past the target so calibration converges in a step or two
+        iterations = max(iterations * 2, int(iterations * min_round_time * 1.2 / max(elapsed, 1e-9)))
+
+
+def measure(fn: Callable[[], object], rounds: int = 7, min_round_time: float = 0.05) -> Dict[str, float]:
+    def elapsed_for(iterations: int) -> float:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        return time.perf_counter() - started
+
+    iterations = _calibrate(elapsed_for, min_round_time)
+    return summarize([elapsed_for(iterations) / iterations for _ in range(rounds)], iterations)
+
+
+async def measure_async(fn: Callable[[], Awaitable[object]], rounds: int = 7, min_round_time: float = 0.05) -> Dict[str, float]:
+    async def elapsed_for(iterations: int) -> float:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await fn()
+        return time.perf_counter() - started
+
+    iterations = 1
+    while True:
+        elapsed = await elapsed_for(iterations)
+        if elapsed >= min_round_time or iterations >= 1_000_000:
+            break
+        iterations = max(iterations * 2, int(iterations * min_round_time * 1.2 / max(elapsed, 1e-9)))
+    return summarize([await elapsed_for(iterations) / iterations for _ in range(rounds)], iterations)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata() -> Dict[str, object]:
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def save_results(path: str, results: Dict[str, Dict[str, float]]):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"metadata": metadata(), "results": results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path: str) -> Dict[str, Dict[str, float]]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(baseline: Dict[str, Dict[str, float]], current: Dict[str, Dict[str, float]],
+            threshold: float) -> Tuple[List[Tuple[str, float, float, float, str]], List[str]]:
+    """Rows of (case, baseline median, current median, ratio, verdict) and the regressed case names."""
+    rows = []
+    regressions = []
+    for name in sorted(set(baseline) & set(current)):
+        before, after = baseline[name]["median_s"], current[name]["median_s"]
+        ratio = after / before if before else float("inf")
+        if ratio > 1 + threshold:
+            verdict = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            verdict = "faster"
+        else:
+            verdict = "ok"
+        rows.append((name, before, after, ratio, verdict))
+    return rows, regressions
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
@@ -0,0 +1,273 @@
+"""
+Micro-benchmark suite for the onboarding hot path.
+
+Cases:
+- validation.customer_create: Pydantic validation of a `CustomerCreate` payload
+- fraud.mock_score: the mock fraud scorer for one request
+- blacklist.search[rows=N]: `search_blacklist_by_customer_data` (indexed SQL lookup, a miss)
+- risk.assess_customer_risk: all three tiers end to end, with the fraud API served by
+  an in-process stub transport (`mock_score` behind `httpx.MockTransport`) and the
+  fraud decision cache off, so every call goes through the HTTP client
+- api.list_customers[rows=N]: `GET /customers/?limit=200` through the ASGI stack,
+  i.e. query + Pydantic serialization of a full page, at several table sizes
+- api.get_customer[cache=on|off]: `GET /customers/{id}` for the same id, as a status
+  poller would send it, with the response cache on and off
+- startup.import_app / startup.ready: cold start of a fresh worker process (see
+  `benchmarks.bench_startup`), one sample per round
+
+Every run is written to JSON (default `benchmarks/results/<commit>.json`). With
+`--compare`, the run (or a saved file given with `--against`) is checked against
+a baseline: a case whose median time per operation grew by more than
+`--threshold` is reported as a regression and the exit status is 1.
+
+Usage:
+    python -m benchmarks.run --output baseline.json
+    python -m benchmarks.run --compare baseline.json
+    python -m benchmarks.run --compare baseline.json --against other.json
+    python -m benchmarks.run --quick -k blacklist -k risk
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("FRAUD_API_URL", "http://fraud.local/fraud/fraud-detection")
+
+import httpx
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from benchmarks.bench_startup import cold_starts
+from benchmarks.harness import compare, format_seconds, load_results, measure, measure_async, metadata, save_results, summarize
+from app.main import app
+from app.api.v1.fraud_detection import FraudRequest, mock_score
+from app.core.config import CustomerCacheSettings, FraudCacheSettings
+from app.core.database import Base, get_read_db
+from app.core.http_client import create_fraud_client
+from app.crud.blacklist import search_blacklist_by_customer_data
+from app.models.blacklist import BlacklistModel
+from app.models.customer import AddressModel, CustomerModel
+from app.schemas.customer import CustomerCreate
+from app.services.blacklist_matcher import blacklist_matcher
+from app.services.customer_cache import configure_customer_cache
+from app.services.fraud_cache import configure_fraud_cache
+from app.services.risk_assessment import assess_customer_risk
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+SEED_CHUNK = 50_000
+
+CUSTOMER_PAYLOAD = {
+    "name": "Jane Doe",
+    "email": "jane.doe@gmail.com",
+    "phone": "07123456789",
+    "date_of_birth": "1985-04-12",
+    "national_id": "AB123456C",
+    "addresses": [{"street": "1 High Street", "city": "Leeds", "state": "WY", "zip_code": "LS1 1AA", "country": "UK"}],
+}
+
+
+def seed_blacklist(url: str, rows: int):
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for start in range(0, rows, SEED_CHUNK):
+            conn.execute(insert(BlacklistModel), [
+                {"name": f"Listed Person {i}", "email": f"listed{i}@example.org", "phone": f"07{i:09d}", "date_of_birth": "1970-01-01"}
+                for i in range(start, min(rows, start + SEED_CHUNK))
+            ])
+    engine.dispose()
+
+
+def seed_customers(url: str, rows: int):
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for start in range(0, rows, SEED_CHUNK):
+            ids = range(start + 1, min(rows, start + SEED_CHUNK) + 1)
+            conn.execute(insert(CustomerModel), [
+                {"id": i, "name": f"Customer {i}", "email": f"customer{i}@example.org", "phone": "07123456789",
+                 "date_of_birth": "1990-01-01", "national_id": f"N{i:08d}", "risk_score": 5, "risk_rules_version": "2024.1"}
+                for i in ids
+            ])
+            conn.execute(insert(AddressModel), [
+                {"customer_id": i, "street": f"{i} High Street", "city": "Leeds", "state": "WY", "zip_code": "LS1 1AA", "country": "UK"}
+                for i in ids
+            ])
+    engine.dispose()
+
+
+def stub_fraud_transport() -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=mock_score(FraudRequest.model_validate_json(request.content)).model_dump())
+    return httpx.MockTransport(handler)
+
+
+async def run_suite(args, tmp: str) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    rounds = args.rounds
+
+    def wanted(name: str) -> bool:
+        return not args.filter or any(pattern in name for pattern in args.filter)
+
+    def record(name: str, stats: Dict[str, float]):
+        results[name] = stats
+        print(f"{name:<40} {format_seconds(stats['median_s']):>10} {stats['ops_per_sec']:>12,.0f}/s  ({stats['rounds']}x{stats['iterations']})")
+
+    if wanted("validation.customer_create"):
+        record("validation.customer_create", measure(lambda: CustomerCreate.model_validate(CUSTOMER_PAYLOAD), rounds))
+
+    if wanted("fraud.mock_score"):
+        fraud_request = FraudRequest(
+            name="Jane Doe", address="1 High Street, Leeds, WY, LS1 1AA, UK",
+            date_of_birth=date.today() - timedelta(days=40 * 365), email="jane.doe@gmail.com",
+        )
+        record("fraud.mock_score", measure(lambda: mock_score(fraud_request), rounds))
+
+    customer = CustomerCreate.model_validate(CUSTOMER_PAYLOAD)
+    for rows in args.blacklist_sizes:
+        name = f"blacklist.search[rows={rows}]"
+        if not wanted(name):
+            continue
+        path = os.path.join(tmp, f"blacklist_{rows}.db")
+        seed_blacklist(f"sqlite:///{path}", rows)
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with async_sessionmaker(bind=engine, class_=AsyncSession)() as db:
+            record(name, await measure_async(lambda: search_blacklist_by_customer_data(db, customer), rounds))
+        await engine.dispose()
+
+    if wanted("risk.assess_customer_risk"):
+        path = os.path.join(tmp, "risk.db")
+        seed_blacklist(f"sqlite:///{path}", 1000)
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        configure_fraud_cache(FraudCacheSettings(enabled=False))
+        fraud_client = create_fraud_client(transport=stub_fraud_transport())
+        try:
+            async with async_sessionmaker(bind=engine, class_=AsyncSession)() as db:
+                blacklist_matcher.clear()
+                await blacklist_matcher.ensure_loaded(db)
+                record("risk.assess_customer_risk", await measure_async(lambda: assess_customer_risk(db, customer, fraud_client), rounds))
+        finally:
+            await fraud_client.aclose()
+            await engine.dispose()
+            configure_fraud_cache()
+
+    for rows in args.customer_sizes:
+        name = f"api.list_customers[rows={rows}]"
+        if not wanted(name):
+            continue
+        path = os.path.join(tmp, f"customers_{rows}.db")
+        seed_customers(f"sqlite:///{path}", rows)
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+        async def override_get_db():
+            async with session_factory() as db:
+                yield db
+
+        app.dependency_overrides[get_read_db] = override_get_db
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+                # Read from the middle of the table so the page is not served from the first B-tree pages
+                cursor = rows // 2
+
+                async def list_page():
+                    response = await client.get("/customers/", params={"limit": 200, "cursor": cursor})
+                    response.raise_for_status()
+
+                record(name, await measure_async(list_page, rounds))
+        finally:
+            app.dependency_overrides.pop(get_read_db, None)
+            await engine.dispose()
+
+    cache_cases = [mode for mode in ("on", "off") if wanted(f"api.get_customer[cache={mode}]")]
+    if cache_cases:
+        path = os.path.join(tmp, "get_customer.db")
+        seed_customers(f"sqlite:///{path}", 1000)
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+        async def override_get_db():
+            async with session_factory() as db:
+                yield db
+
+        app.dependency_overrides[get_read_db] = override_get_db
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+                async def get_customer():
+                    response = await client.get("/customers/500")
+                    response.raise_for_status()
+
+                for mode in cache_cases:
+                    configure_customer_cache(CustomerCacheSettings(enabled=mode == "on"))
+                    record(f"api.get_customer[cache={mode}]", await measure_async(get_customer, rounds))
+        finally:
+            app.dependency_overrides.pop(get_read_db, None)
+            configure_customer_cache()
+            await engine.dispose()
+
+    if wanted("startup.import_app") or wanted("startup.ready"):
+        samples = cold_starts(rounds)
+        record("startup.import_app", summarize([sample["import_s"] for sample in samples], 1))
+        record("startup.ready", summarize([sample["ready_s"] for sample in samples], 1))
+
+    return results
+
+
+def print_comparison(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    rows, regressions = compare(baseline, current, threshold)
+    print(f"\n{'case':<40} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, before, after, ratio, verdict in rows:
+        print(f"{name:<40} {format_seconds(before):>10} {format_seconds(after):>10} {ratio:>7.2f}  {verdict}")
+    for name in sorted(set(baseline) ^ set(current)):
+        print(f"{name:<40} only in {'baseline' if name in baseline else 'current run'}")
+    return regressions
+
+
+def parse_sizes(value: str) -> List[int]:
+    return [int(size) for size in value.split(",") if size.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against a saved result file")
+    parser.add_argument("--against", metavar="RESULTS", help="With --compare: compare this saved file instead of running")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown of the median before it counts as a regression")
+    parser.add_argument("-k", dest="filter", action="append", help="Only run cases whose name contains this (repeatable)")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--blacklist-sizes", type=parse_sizes, default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--customer-sizes", type=parse_sizes, default=[1_000, 10_000, 100_000])
+    parser.add_argument("--quick", action="store_true", help="Small tables and fewer rounds, for a smoke run")
+    args = parser.parse_args()
+
+    if args.against and not args.compare:
+        parser.error("--against requires --compare")
+    if args.quick:
+        args.rounds = min(args.rounds, 3)
+        args.blacklist_sizes = [size for size in args.blacklist_sizes if size <= 10_000] or [1_000]
+        args.customer_sizes = [size for size in args.customer_sizes if size <= 10_000] or [1_000]
+
+    if args.against:
+        current = load_results(args.against)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            current = asyncio.run(run_suite(args, tmp))
+        output = args.output or os.path.join(RESULTS_DIR, f"{metadata()['git_commit'] or 'results'}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        save_results(output, current)
+        print(f"\nResults written to {output}")
+
+    if args.compare:
+        regressions = print_comparison(load_results(args.compare), current, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
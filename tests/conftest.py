@@ -0,0 +1,71 @@
+import sys
+import os
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.core.database import get_db, get_read_db, get_session_factory, Base
+from app.models.customer import CustomerModel, AddressModel
+from app.models.onboarding_job import OnboardingJobModel
+from app.models.risk_assessment import RiskAssessmentModel
+
+# Test database setup
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_api.db"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+test_async_engine = create_async_engine("sqlite+aiosqlite:///./test_api.db", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(bind=test_async_engine, autoflush=False, expire_on_commit=False)
+
+async def override_get_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+@pytest.fixture(autouse=True)
+def test_database_overrides():
+    """Route every request to the test database, whatever an earlier test installed"""
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingAsyncSessionLocal
+
+@pytest.fixture(scope="module")
+def setup_database():
+    """Setup test database for the entire test module"""
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+@pytest.fixture
+def session_factory():
+    """Sync sessions on the test database, for seeding and checking rows"""
+    return TestingSessionLocal
+
+@pytest.fixture
+def async_session_factory():
+    return TestingAsyncSessionLocal
+
+@pytest.fixture
+def async_engine():
+    return test_async_engine
+
+@pytest.fixture
+def clean_customers(setup_database):
+    """Delete every customer, with the rows that reference one"""
+    db = TestingSessionLocal()
+    try:
+        db.query(OnboardingJobModel).delete()
+        db.query(RiskAssessmentModel).delete()
+        db.query(AddressModel).delete()
+        db.query(CustomerModel).delete()
+        db.commit()
+    finally:
+        db.close()
@@ -1,46 +1,21 @@
 import sys
 import os
 import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.main import app
-from app.core.database import get_db, Base
 from app.models.blacklist import BlacklistModel
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test_api.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
-        yield db
-    finally:
-        db.close() # type: ignore
-
-app.dependency_overrides[get_db] = override_get_db
-client = TestClient(app)
-
-@pytest.fixture(scope="module")
-def setup_database():
-    Base.metadata.create_all(bind=engine)
-    yield
-    Base.metadata.drop_all(bind=engine)
-
 @pytest.fixture(autouse=True)
-def clean_blacklist():
-    db = TestingSessionLocal()
+def clean_blacklist(session_factory):
+    db = session_factory()
     try:
         db.query(BlacklistModel).delete()
         db.commit()
     finally:
         db.close()
 
-def test_blacklist_create_success_and_error(setup_database):
+def test_blacklist_create_success_and_error(setup_database, client):
     """
     Covers one success (valid creation) and one error (missing required field) for Blacklist API.
     Ensures DB isolation, response validation, and clear assertion.
@@ -0,0 +1,75 @@
+import sys
+import os
+import json
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.blacklist import BlacklistModel
+from app.schemas.customer import CustomerCreate
+from app.services import blacklist_import
+from app.services.blacklist_matcher import blacklist_matcher
+
+@pytest.fixture(autouse=True)
+def clean_blacklist(setup_database, monkeypatch, session_factory):
+    """Small chunks so the chunked-transaction path is exercised"""
+    monkeypatch.setattr(blacklist_import, "IMPORT_CHUNK_SIZE", 2)
+    db = session_factory()
+    try:
+        db.query(BlacklistModel).delete()
+        db.add(BlacklistModel(name="Known Fraudster", email="known@gmail.com", phone="07000000001", date_of_birth="1970-01-01"))
+        db.commit()
+    finally:
+        db.close()
+    blacklist_matcher.clear()
+
+def test_csv_import_dedupes_and_reports_rejections(client, session_factory):
+    """CSV TEST: valid rows inserted in chunks; duplicates, existing entries and invalid rows reported"""
+    body = "\n".join([
+        "name,email,phone,date_of_birth",
+        "Alice Import,alice@gmail.com,07000000002,1980-01-01",
+        '"Bob, Jr. Import",bob@gmail.com,07000000003,1981-01-01',
+        "Alice Import,alice@gmail.com,07000000002,1980-01-01",
+        "Known Fraudster,known@gmail.com,07000000001,1970-01-01",
+        "Carol Import,carol@gmail.com",
+        '"Dave ""The Dodger""\nImport",dave@gmail.com,07000000004,1982-01-01',
+        "Erin Import,erin@gmail.com,07000000005,1983-01-01",
+    ])
+    response = client.post("/blacklist/import", content=body.encode(), headers={"Content-Type": "text/csv"})
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["total_rows"] == 7
+    assert report["inserted"] == 4
+    assert report["duplicates"] == 2
+    assert report["rejected"] == 1
+    assert report["rejected_rows"][0]["line"] == 6
+
+    db = session_factory()
+    names = {row.name for row in db.query(BlacklistModel)}
+    db.close()
+    assert {"Bob, Jr. Import", 'Dave "The Dodger"\nImport', "Erin Import"} <= names
+
+def test_ndjson_import_updates_matcher(client):
+    """NDJSON TEST: bad JSON and schema errors are rejected; imported entries are matched immediately"""
+    lines = [
+        json.dumps({"name": "Frank Import", "email": "frank@gmail.com", "phone": "07000000006", "date_of_birth": "1984-01-01"}),
+        "{not json",
+        json.dumps({"name": "Grace Import", "email": "grace@gmail.com"}),
+        "",
+        json.dumps({"name": "Heidi Import", "email": "heidi@gmail.com", "phone": "07000000007", "date_of_birth": "1985-01-01"}),
+    ]
+    response = client.post("/blacklist/import", content="\n".join(lines).encode(), headers={"Content-Type": "application/x-ndjson"})
+
+    report = response.json()
+    assert (report["inserted"], report["rejected"]) == (2, 2)
+    assert [row["line"] for row in report["rejected_rows"]] == [2, 3]
+    assert blacklist_matcher.matches(CustomerCreate(name="Heidi Import", email="heidi@gmail.com"))
+
+def test_import_requires_known_format(client):
+    """ERROR TEST: unknown content types are refused"""
+    response = client.post("/blacklist/import", content=b"<xml/>", headers={"Content-Type": "application/xml"})
+    assert response.status_code == 415
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,81 @@
+import sys
+import os
+import pytest
+from unittest.mock import patch, AsyncMock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.blacklist import BlacklistModel
+from app.models.customer import CustomerModel, AddressModel
+from app.models.risk_assessment import RiskAssessmentModel
+from app.schemas.customer import CustomerCreate
+from app.services.blacklist_matcher import BlacklistMatcher, blacklist_matcher
+
+@pytest.fixture(autouse=True)
+def clean_database(setup_database, session_factory):
+    db = session_factory()
+    try:
+        db.query(BlacklistModel).delete()
+        db.query(AddressModel).delete()
+        db.query(RiskAssessmentModel).delete()
+        db.query(CustomerModel).delete()
+        db.commit()
+    finally:
+        db.close()
+    blacklist_matcher.clear()
+
+def make_customer(**overrides):
+    data = {"name": "Eve Black", "email": "eve@gmail.com", "phone": "07123456789", "date_of_birth": "1980-02-02"}
+    data.update(overrides)
+    return CustomerCreate(**data)
+
+def test_matcher_predicates():
+    """UNIT TEST: name must match together with email, phone or date of birth"""
+    matcher = BlacklistMatcher()
+    matcher.add(BlacklistModel(id=1, name="Eve Black", email="eve@gmail.com", phone="07000000000", date_of_birth="1970-01-01"))
+
+    assert matcher.matches(make_customer(phone="07999999999", date_of_birth="1990-01-01"))
+    assert matcher.matches(make_customer(email="other@gmail.com", phone="07000000000", date_of_birth="1990-01-01"))
+    assert matcher.matches(make_customer(email="other@gmail.com", phone=None, date_of_birth="1970-01-01"))
+    # Same email/phone/dob but a different name is not a match
+    assert not matcher.matches(make_customer(name="Eve White"))
+    assert not matcher.matches(make_customer(email="other@gmail.com", phone=None, date_of_birth=None))
+
+@pytest.mark.asyncio
+async def test_matcher_sync_is_incremental(async_session_factory, session_factory):
+    """SYNC TEST: only rows above the high-water mark are loaded, version moves on change"""
+    db = session_factory()
+    db.add(BlacklistModel(name="Eve Black", email="eve@gmail.com", phone="07000000000", date_of_birth="1970-01-01"))
+    db.commit()
+
+    matcher = BlacklistMatcher()
+    async with async_session_factory() as session:
+        assert await matcher.sync(session) == 1
+        version = matcher.version
+        assert await matcher.sync(session) == 0
+        assert matcher.version == version
+
+    db.add(BlacklistModel(name="Mallory", email="mallory@gmail.com", phone="07111111111", date_of_birth="1975-05-05"))
+    db.commit()
+    db.close()
+
+    async with async_session_factory() as session:
+        assert await matcher.sync(session) == 1
+    assert matcher.version > version
+    assert matcher.matches(make_customer(name="Mallory", email="mallory@gmail.com"))
+
+def test_blacklisted_customer_rejected_after_api_insert(client):
+    """FAIL TEST: an entry created through POST /blacklist/ is matched on the next onboarding"""
+    os.environ["FRAUD_API_URL"] = "http://test-fake-url"
+    entry = {"name": "Eve Black", "email": "eve@gmail.com", "phone": "07000000000", "date_of_birth": "1970-01-01"}
+    assert client.post("/blacklist/", json=entry).status_code == 200
+
+    customer = {"name": "Eve Black", "email": "eve@gmail.com", "phone": "07123456789", "date_of_birth": "1985-03-03", "addresses": []}
+    with patch("app.services.risk_assessment.compute_risk_score_based_on_fraud_api", new=AsyncMock(return_value={"category": "LOW", "score": 0})):
+        response = client.post("/customers/", json=customer)
+
+    assert response.status_code == 422
+    assert "customer failed risk assessment" in response.json()["detail"].lower()
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,99 @@
+import sys
+import os
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.customer import CustomerModel, AddressModel
+from app.models.risk_assessment import RiskAssessmentModel
+
+LOW_RISK = {"category": "LOW", "score": 0}
+
+def make_item(i, **overrides):
+    item = {
+        "name": f"Batch {i}",
+        "email": f"batch{i}@gmail.com",
+        "phone": "07123456789",
+        "date_of_birth": "1980-01-01",
+        "addresses": [{"street": f"{i} Batch Rd", "city": "Leeds", "state": "WY", "zip_code": "LS1", "country": "UK"}],
+    }
+    item.update(overrides)
+    return item
+
+@pytest.fixture(autouse=True)
+def clean_database(setup_database, session_factory):
+    os.environ["FRAUD_API_URL"] = "http://test-fake-url"
+    db = session_factory()
+    try:
+        db.query(AddressModel).delete()
+        db.query(RiskAssessmentModel).delete()
+        db.query(CustomerModel).delete()
+        db.add(CustomerModel(name="Existing", email="existing@gmail.com"))
+        db.commit()
+    finally:
+        db.close()
+
+def test_batch_reports_per_item_results(client, session_factory):
+    """MIXED BATCH: accepted, validation failure, high risk, in-batch duplicate and existing email"""
+    items = [
+        make_item(0),
+        make_item(1, phone="+441234"),
+        make_item(2, email="risky@example.com", date_of_birth="2005-01-01"),
+        make_item(3, email="batch0@gmail.com"),
+        make_item(4, email="existing@gmail.com"),
+        make_item(5),
+    ]
+    with patch("app.services.risk_assessment.compute_risk_score_based_on_fraud_api", new=AsyncMock(return_value=LOW_RISK)) as fraud_api:
+        response = client.post("/customers/batch", json=items)
+
+    assert response.status_code == 200
+    body = response.json()
+    statuses = [r["status"] for r in body["results"]]
+    assert statuses == ["accepted", "rejected", "rejected", "rejected", "rejected", "accepted"]
+    assert (body["accepted"], body["rejected"], body["errored"]) == (2, 4, 0)
+    assert "phone" in body["results"][1]["reason"]
+    assert body["results"][2]["reason"] == "Customer failed risk assessment"
+    assert "already exists" in body["results"][4]["reason"]
+    assert body["results"][0]["customer"]["addresses"][0]["id"] is not None
+    # Only items that passed validation and uniqueness reach the fraud API
+    assert fraud_api.await_count == 3
+
+    db = session_factory()
+    assert db.query(CustomerModel).count() == 3
+    db.close()
+
+def test_batch_risk_assessment_respects_concurrency_limit(monkeypatch, client):
+    """CONCURRENCY TEST: no more than BATCH_RISK_CONCURRENCY fraud calls are in flight at once"""
+    monkeypatch.setenv("BATCH_RISK_CONCURRENCY", "2")
+    in_flight = 0
+    peak = 0
+
+    async def slow_fraud_api(*args, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return LOW_RISK
+
+    with patch("app.services.risk_assessment.compute_risk_score_based_on_fraud_api", new=slow_fraud_api):
+        response = client.post("/customers/batch", json=[make_item(i) for i in range(6)])
+
+    assert response.json()["accepted"] == 6
+    assert peak == 2
+
+def test_batch_fraud_service_errors_are_reported_per_item(client):
+    """ERROR TEST: a fraud API outage marks items as errored without failing the batch"""
+    outage = HTTPException(status_code=503, detail="Fraud detection service is unavailable")
+    with patch("app.services.risk_assessment.compute_risk_score_based_on_fraud_api", new=AsyncMock(side_effect=[LOW_RISK, outage])):
+        response = client.post("/customers/batch", json=[make_item(0), make_item(1)])
+
+    body = response.json()
+    assert [r["status"] for r in body["results"]] == ["accepted", "errored"]
+    assert body["results"][1]["reason"] == "Fraud detection service is unavailable"
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
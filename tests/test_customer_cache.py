@@ -0,0 +1,108 @@
+import sys
+import os
+import pytest
+from unittest.mock import AsyncMock
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import CustomerCacheSettings
+from app.models.customer import CustomerModel, AddressModel
+from app.services import customer_cache, risk_assessment
+
+@pytest.fixture
+def statements(async_engine):
+    """SQL statements the app runs against the test database during the test"""
+    seen = []
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record_statement)
+    yield seen
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record_statement)
+
+@pytest.fixture(autouse=True)
+def clean_state(monkeypatch, clean_customers):
+    # PUT re-assesses a customer that has no stored assessment yet
+    monkeypatch.setattr(risk_assessment, "compute_risk_score_based_on_fraud_api", AsyncMock(return_value={"category": "LOW", "score": 5}))
+    customer_cache.configure_customer_cache(CustomerCacheSettings())
+    yield
+    customer_cache.configure_customer_cache()
+
+def add_customer(session_factory, name="Polled Customer"):
+    db = session_factory()
+    try:
+        customer = CustomerModel(name=name, email="polled@gmail.com", phone="07123456789", date_of_birth="1990-01-01")
+        customer.addresses.append(AddressModel(street="1 High Street", city="Leeds", state="WY", zip_code="LS1 1AA", country="UK"))
+        db.add(customer)
+        db.commit()
+        return customer.id
+    finally:
+        db.close()
+
+def test_repeated_reads_are_served_from_cache(client, statements, session_factory):
+    """SUCCESS TEST: the second GET returns the same body without querying the database"""
+    customer_id = add_customer(session_factory)
+    first = client.get(f"/customers/{customer_id}")
+    assert first.status_code == 200
+    assert first.json()["addresses"][0]["city"] == "Leeds"
+    queries = len(statements)
+
+    second = client.get(f"/customers/{customer_id}")
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert len(statements) == queries
+    assert customer_cache.get_customer_cache().hits == 1
+    assert 'customer_cache_lookups_total{result="hit"} 1.0' in client.get("/metrics").text
+
+def test_update_invalidates_cached_customer(client, session_factory):
+    """SUCCESS TEST: a PUT is visible on the next GET"""
+    customer_id = add_customer(session_factory)
+    client.get(f"/customers/{customer_id}")
+    assert client.put(f"/customers/{customer_id}", json={"name": "Renamed Customer"}).status_code == 200
+    assert client.get(f"/customers/{customer_id}").json()["name"] == "Renamed Customer"
+
+def test_delete_invalidates_cached_customer(client, session_factory):
+    """FAILURE TEST: a deleted customer is not served from cache"""
+    customer_id = add_customer(session_factory)
+    client.get(f"/customers/{customer_id}")
+    assert client.delete(f"/customers/{customer_id}").status_code == 204
+    assert client.get(f"/customers/{customer_id}").status_code == 404
+
+def test_missing_customers_are_not_cached(client, session_factory):
+    """FAILURE TEST: a 404 is not cached, so a customer created afterwards is found"""
+    assert client.get("/customers/1").status_code == 404
+    customer_id = add_customer(session_factory)
+    assert client.get(f"/customers/{customer_id}").status_code == 200
+
+def test_ttl_bounds_staleness_of_writes_the_cache_did_not_see(client, session_factory):
+    """SUCCESS TEST: with the TTL expired, a change made outside this worker is read from the database"""
+    customer_cache.configure_customer_cache(CustomerCacheSettings(ttl=0))
+    customer_id = add_customer(session_factory)
+    client.get(f"/customers/{customer_id}")
+    db = session_factory()
+    try:
+        db.get(CustomerModel, customer_id).name = "Changed Elsewhere"
+        db.commit()
+    finally:
+        db.close()
+    assert client.get(f"/customers/{customer_id}").json()["name"] == "Changed Elsewhere"
+
+def test_read_racing_an_invalidation_is_not_stored():
+    """UNIT TEST: a body read before an update completed must not be cached after it"""
+    generation = customer_cache.generation()
+    customer_cache.invalidate(7)
+    customer_cache.store(7, b'{"name": "old"}', generation)
+    assert customer_cache.lookup(7) is None
+
+def test_cache_can_be_disabled(client, statements, session_factory):
+    """SUCCESS TEST: with CUSTOMER_CACHE_ENABLED off every read goes to the database"""
+    customer_cache.configure_customer_cache(CustomerCacheSettings(enabled=False))
+    customer_id = add_customer(session_factory)
+    client.get(f"/customers/{customer_id}")
+    queries = len(statements)
+    assert client.get(f"/customers/{customer_id}").status_code == 200
+    assert len(statements) > queries
+    assert customer_cache.get_customer_cache() is None
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
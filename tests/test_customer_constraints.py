@@ -0,0 +1,91 @@
+import sys
+import os
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.migrations import upgrade_schema
+from app.models.customer import CustomerModel
+from app.schemas.customer import CustomerCreate
+from app.services import customer as service
+
+LOW_RISK = {"category": "LOW", "score": 0}
+
+pytestmark = pytest.mark.usefixtures("clean_customers")
+
+def test_duplicate_national_id_returns_409(client):
+    """NATIONAL ID UNIQUENESS: a second customer with the same national ID is rejected by the DB constraint"""
+    os.environ["FRAUD_API_URL"] = "http://test-fake-url"
+    first = {"name": "First", "email": "first@gmail.com", "phone": "07123456789", "date_of_birth": "1980-01-01", "national_id": "AB123456C"}
+    second = dict(first, name="Second", email="second@gmail.com")
+
+    with patch("app.services.risk_assessment.compute_risk_score_based_on_fraud_api", new=AsyncMock(return_value=LOW_RISK)):
+        assert client.post("/customers/", json=first).status_code == 200
+        response = client.post("/customers/", json=second)
+
+    assert response.status_code == 409
+    assert "national id already exists" in response.json()["detail"].lower()
+
+def test_known_duplicate_is_refused_before_fraud_check(client):
+    """UNIQUENESS TEST: a signup for an existing email gets 409 without spending a fraud API call"""
+    os.environ["FRAUD_API_URL"] = "http://test-fake-url"
+    customer = {"name": "Once", "email": "once@gmail.com", "phone": "07123456789", "date_of_birth": "1980-01-01"}
+
+    with patch("app.services.risk_assessment.compute_risk_score_based_on_fraud_api", new=AsyncMock(return_value=LOW_RISK)) as fraud_api:
+        assert client.post("/customers/", json=customer).status_code == 200
+        response = client.post("/customers/", json=dict(customer, name="Twice"))
+
+    assert response.status_code == 409
+    assert fraud_api.await_count == 1
+
+@pytest.mark.asyncio
+async def test_concurrent_signups_with_same_email_insert_once(async_session_factory, session_factory):
+    """RACE TEST: two concurrent onboardings for one email produce exactly one row and one 409"""
+    from fastapi import HTTPException
+    customer = {"name": "Racer", "email": "race@gmail.com", "phone": "07123456789", "date_of_birth": "1980-01-01"}
+
+    async def onboard():
+        async with async_session_factory() as db:
+            try:
+                await service.create_new_customer(db, CustomerCreate(**customer))
+                return 200
+            except HTTPException as e:
+                return e.status_code
+
+    with patch("app.services.risk_assessment.compute_risk_score_based_on_fraud_api", new=AsyncMock(return_value=LOW_RISK)):
+        results = await asyncio.gather(onboard(), onboard())
+
+    assert sorted(results) == [200, 409]
+    db = session_factory()
+    assert db.query(CustomerModel).filter(CustomerModel.email == "race@gmail.com").count() == 1
+    db.close()
+
+@pytest.mark.asyncio
+async def test_upgrade_schema_adds_indexes_to_legacy_database(tmp_path):
+    """MIGRATION TEST: a customer.db created before the indexes existed is upgraded in place"""
+    path = tmp_path / "legacy.db"
+    legacy = create_engine(f"sqlite:///{path}")
+    with legacy.begin() as conn:
+        conn.execute(text("CREATE TABLE customers (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, email VARCHAR NOT NULL, phone VARCHAR, date_of_birth VARCHAR, national_id VARCHAR, risk_score INTEGER)"))
+        conn.execute(text("CREATE TABLE blacklist (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, email VARCHAR, phone VARCHAR, date_of_birth VARCHAR)"))
+        conn.execute(text("INSERT INTO customers (name, email, national_id) VALUES ('A', 'a@gmail.com', 'N1'), ('B', 'b@gmail.com', 'N1')"))
+
+    upgrade_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    created = await upgrade_schema(upgrade_engine)
+    await upgrade_engine.dispose()
+
+    assert "ix_customers_email" in created
+    assert "ix_blacklist_name_email" in created
+    # Existing duplicate national IDs keep the unique index from being created
+    assert "ix_customers_national_id" not in created
+
+    indexes = {ix["name"]: ix for ix in inspect(legacy).get_indexes("customers")}
+    assert indexes["ix_customers_email"]["unique"]
+    legacy.dispose()
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
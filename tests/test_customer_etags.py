@@ -0,0 +1,129 @@
+import sys
+import os
+import pytest
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import CustomerCacheSettings
+from app.core.migrations import upgrade_schema
+from app.models.customer import CustomerModel, AddressModel
+from app.models.risk_assessment import RiskAssessmentModel
+from app.services import customer as service
+from app.services import customer_cache, risk_assessment
+
+@pytest.fixture(autouse=True)
+def customer_id(setup_database, monkeypatch, session_factory):
+    # PUT re-assesses a customer that has no stored assessment yet
+    monkeypatch.setattr(risk_assessment, "compute_risk_score_based_on_fraud_api", AsyncMock(return_value={"category": "LOW", "score": 5}))
+    db = session_factory()
+    try:
+        db.query(AddressModel).delete()
+        db.query(RiskAssessmentModel).delete()
+        db.query(CustomerModel).delete()
+        customer = CustomerModel(name="Polled Customer", email="etag@gmail.com", phone="07123456789", date_of_birth="1990-01-01")
+        customer.addresses.append(AddressModel(street="1 High Street", city="Leeds", state="WY", zip_code="LS1 1AA", country="UK"))
+        db.add(customer)
+        db.commit()
+        customer_id = customer.id
+    finally:
+        db.close()
+    customer_cache.configure_customer_cache(CustomerCacheSettings())
+    yield customer_id
+    customer_cache.configure_customer_cache()
+
+def bump_version_elsewhere(session_factory, customer_id):
+    db = session_factory()
+    try:
+        db.execute(text("UPDATE customers SET version = version + 1 WHERE id = :id"), {"id": customer_id})
+        db.commit()
+    finally:
+        db.close()
+
+def test_get_returns_304_for_current_etag(customer_id, client):
+    """SUCCESS TEST: If-None-Match with the current ETag (strong or weak form) gets an empty 304"""
+    first = client.get(f"/customers/{customer_id}")
+    etag = first.headers["ETag"]
+    assert etag == f'"{customer_id}.1"'
+
+    for header in (etag, f"W/{etag}", f'"other", {etag}'):
+        response = client.get(f"/customers/{customer_id}", headers={"If-None-Match": header})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+def test_update_bumps_version_and_etag(customer_id, client):
+    """SUCCESS TEST: after a PUT that only replaces addresses, the old ETag no longer matches"""
+    old_etag = client.get(f"/customers/{customer_id}").headers["ETag"]
+    new_address = {"street": "2 Low Road", "city": "York", "state": "NY", "zip_code": "YO1 1AA", "country": "UK"}
+    updated = client.put(f"/customers/{customer_id}", json={"name": "Polled Customer", "addresses": [new_address]})
+    assert updated.status_code == 200
+    assert updated.headers["ETag"] == f'"{customer_id}.2"'
+
+    response = client.get(f"/customers/{customer_id}", headers={"If-None-Match": old_etag})
+    assert response.status_code == 200
+    assert response.json()["addresses"][0]["city"] == "York"
+    assert response.headers["ETag"] == updated.headers["ETag"]
+
+def test_if_match_gives_optimistic_concurrency(customer_id, client):
+    """FAILURE TEST: a PUT based on an outdated ETag is refused with 412"""
+    etag = client.get(f"/customers/{customer_id}").headers["ETag"]
+    assert client.put(f"/customers/{customer_id}", headers={"If-Match": etag}, json={"name": "First Writer"}).status_code == 200
+
+    response = client.put(f"/customers/{customer_id}", headers={"If-Match": etag}, json={"name": "Second Writer"})
+    assert response.status_code == 412
+    assert client.get(f"/customers/{customer_id}").json()["name"] == "First Writer"
+    assert client.put(f"/customers/{customer_id}", headers={"If-Match": "*"}, json={"name": "Any Version"}).status_code == 200
+
+def test_write_racing_another_writer_is_refused(customer_id, monkeypatch, client, session_factory):
+    """FAILURE TEST: the UPDATE itself checks the version, so a commit between read and write is not overwritten"""
+    update_customer = service.crud.update_customer
+
+    async def racing_update(db, db_customer, updates, assessment=None):
+        bump_version_elsewhere(session_factory, customer_id)
+        return await update_customer(db, db_customer, updates, assessment)
+
+    monkeypatch.setattr(service.crud, "update_customer", racing_update)
+    etag = client.get(f"/customers/{customer_id}").headers["ETag"]
+    assert client.put(f"/customers/{customer_id}", headers={"If-Match": etag}, json={"name": "Lost Update"}).status_code == 412
+    assert client.put(f"/customers/{customer_id}", json={"name": "Lost Update"}).status_code == 409
+
+def test_list_etag_changes_with_any_item(customer_id, client):
+    """SUCCESS TEST: an unchanged page is answered with 304 before the page is built; an update changes the ETag"""
+    etag = client.get("/customers/").headers["ETag"]
+
+    def fail(**kwargs):
+        raise AssertionError("page was serialized for a 304")
+
+    with patch.object(service, "CustomerPage", fail):
+        assert client.get("/customers/", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"/customers/{customer_id}", json={"name": "Renamed Customer"})
+    response = client.get("/customers/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+@pytest.mark.asyncio
+async def test_upgrade_schema_adds_version_column(tmp_path):
+    """MIGRATION TEST: existing customers get version 1 from the column's server default"""
+    path = tmp_path / "legacy.db"
+    legacy = create_engine(f"sqlite:///{path}")
+    with legacy.begin() as conn:
+        conn.execute(text("CREATE TABLE customers (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, email VARCHAR NOT NULL, phone VARCHAR, date_of_birth VARCHAR, national_id VARCHAR, risk_score INTEGER, risk_rules_version VARCHAR)"))
+        conn.execute(text("INSERT INTO customers (id, name, email) VALUES (1, 'Existing Customer', 'existing@example.com')"))
+
+    upgrade_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    applied = await upgrade_schema(upgrade_engine)
+    await upgrade_engine.dispose()
+
+    assert "customers.version" in applied
+    column = next(column for column in inspect(legacy).get_columns("customers") if column["name"] == "version")
+    assert column["nullable"] is False
+    with legacy.connect() as conn:
+        assert conn.execute(text("SELECT version FROM customers")).scalar() == 1
+    legacy.dispose()
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
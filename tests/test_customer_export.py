@@ -0,0 +1,60 @@
+import sys
+import os
+import csv
+import io
+import json
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.customer import CustomerModel, AddressModel
+from app.models.risk_assessment import RiskAssessmentModel
+from app.services import customer_export
+
+@pytest.fixture(autouse=True)
+def seeded_customers(setup_database, monkeypatch, session_factory):
+    """Five customers, exported in chunks of two so several cursor fetches are exercised"""
+    monkeypatch.setattr(customer_export, "EXPORT_CHUNK_SIZE", 2)
+    db = session_factory()
+    try:
+        db.query(AddressModel).delete()
+        db.query(RiskAssessmentModel).delete()
+        db.query(CustomerModel).delete()
+        for i in range(5):
+            db.add(CustomerModel(
+                name=f"Export {i}",
+                email=f"export{i}@gmail.com",
+                phone="07123456789",
+                addresses=[AddressModel(street=f"{i} Export Rd", city="Leeds", state="WY", zip_code="LS1", country="UK")],
+            ))
+        db.commit()
+        yield [c.id for c in db.query(CustomerModel).order_by(CustomerModel.id)]
+    finally:
+        db.close()
+
+def test_export_ndjson_streams_all_customers_with_addresses(seeded_customers, client):
+    """SUCCESS TEST: one JSON document per line, addresses included"""
+    response = client.get("/customers/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == seeded_customers
+    assert rows[0]["addresses"][0]["street"] == "0 Export Rd"
+
+def test_export_csv_since_id(seeded_customers, client):
+    """INCREMENTAL TEST: since_id only returns newer customers; CSV keeps addresses as JSON"""
+    response = client.get("/customers/export", params={"format": "csv", "since_id": seeded_customers[2]})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == seeded_customers[3:]
+    assert json.loads(rows[0]["addresses"])[0]["city"] == "Leeds"
+
+def test_export_rejects_unknown_format(seeded_customers, client):
+    """ERROR TEST: unsupported formats fail validation"""
+    assert client.get("/customers/export", params={"format": "xml"}).status_code == 422
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
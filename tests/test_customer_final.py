@@ -1,51 +1,13 @@
 import sys
 import os
 import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.main import app
-from app.core.database import get_db, Base
-from app.models.customer import CustomerModel, AddressModel
-
-# Test database setup
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test_api.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
-        yield db
-    finally:
-        db.close() # type: ignore
-
-app.dependency_overrides[get_db] = override_get_db
-client = TestClient(app)
-
-@pytest.fixture(scope="module")
-def setup_database():
-    """Setup test database for the entire test module"""
-    Base.metadata.create_all(bind=engine)
-    yield
-    Base.metadata.drop_all(bind=engine)
-
-@pytest.fixture(autouse=True)
-def clean_database():
-    """Clean database before each test to ensure isolation"""
-    db = TestingSessionLocal()
-    try:
-        db.query(CustomerModel).delete()
-        db.query(AddressModel).delete()
-        db.commit()
-    finally:
-        db.close()
+pytestmark = pytest.mark.usefixtures("clean_customers")
 
 class TestCustomerFinal:
-    def test_fail_risk_assessment_customer_data(self, setup_database):
+    def test_fail_risk_assessment_customer_data(self, setup_database, client):
         """FAIL TEST: Should fail risk assessment when customer data risk is high (simulate risk score > 30)"""
         from unittest.mock import patch, AsyncMock
         from app.exceptions.HighRiskError import HighRiskError
@@ -72,7 +34,7 @@ class TestCustomerFinal:
         assert "detail" in body
         assert "customer failed risk assessment" in body["detail"].lower()
 
-    def test_success_create_customer_with_address_and_auto_generated_ids(self, setup_database):
+    def test_success_create_customer_with_address_and_auto_generated_ids(self, setup_database, client):
         """SUCCESS TEST: Create customer with address and verify auto-generated IDs are returned, and perform actual risk score check."""
         from unittest.mock import patch, AsyncMock
         import os
@@ -123,7 +85,7 @@ class TestCustomerFinal:
         if "risk_score" in created_customer:
             assert created_customer["risk_score"] == 5
 
-    def test_error_create_customer_with_duplicate_email(self, setup_database):
+    def test_error_create_customer_with_duplicate_email(self, setup_database, client):
         """EMAIL UNIQUENESS: Should not allow creation of two customers with the same email address"""
         from unittest.mock import patch, AsyncMock, MagicMock
         from app.exceptions.HighRiskError import HighRiskError
@@ -159,7 +121,7 @@ class TestCustomerFinal:
         assert "detail" in error_resp
         assert any("exist" in str(error).lower() or "unique" in str(error).lower() or "duplicate" in str(error).lower() for error in ([error_resp["detail"]] if isinstance(error_resp["detail"], str) else error_resp["detail"]))
 
-    def test_error_create_customer_with_invalid_required_fields(self, setup_database):
+    def test_error_create_customer_with_invalid_required_fields(self, setup_database, client):
         """ERROR TEST: Attempt to create customer with missing required fields"""
         invalid_customer_data = {
             "name": "Invalid Customer"
@@ -174,7 +136,7 @@ class TestCustomerFinal:
         # Verify the error is related to missing email field
         assert any("email" in str(error).lower() for error in error_response["detail"])
     
-    def test_regex_validation_phone_and_date_patterns(self, setup_database):
+    def test_regex_validation_phone_and_date_patterns(self, setup_database, client):
         """REGEX TEST: Validate phone and date_of_birth regex pattern enforcement"""
         
         # Test 1: Invalid phone format (should fail)
@@ -235,7 +197,7 @@ class TestCustomerFinal:
         assert "id" in created_customer
         assert created_customer["addresses"] == []
 
-    def test_error_date_of_birth_less_than_18(self, setup_database):
+    def test_error_date_of_birth_less_than_18(self, setup_database, client):
         """DOB LESS THAN 18: Should trigger validation error if customer is a minor"""
         underage_data = {
             "name": "Young Customer",
@@ -252,7 +214,7 @@ class TestCustomerFinal:
         # Check that error message contains reference to 18 years/date_of_birth
         assert any("18" in str(error) or "date_of_birth" in str(error).lower() for error in error_response["detail"])
 
-    def test_fail_risk_assessment_on_blacklist(self, setup_database):
+    def test_fail_risk_assessment_on_blacklist(self, setup_database, client):
         """FAIL TEST: Should fail risk assessment and prevent customer creation if on blacklist."""
         from unittest.mock import patch, AsyncMock, MagicMock
         from app.exceptions.HighRiskError import HighRiskError
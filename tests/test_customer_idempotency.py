@@ -0,0 +1,139 @@
+import sys
+import os
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.customer import CustomerModel
+from app.api.v1.customer import create_customer_idempotently
+from app.schemas.customer import CustomerCreate
+from app.services import idempotency
+from app.services.idempotency import IdempotencyKeyReuseError, IdempotencyStore, StoredResponse
+
+LOW_RISK = {"category": "LOW", "score": 0}
+HIGH_RISK = {"category": "HIGH", "score": 90}
+
+def make_customer(**overrides):
+    customer = {
+        "name": "Retry User",
+        "email": "retry@gmail.com",
+        "phone": "07123456789",
+        "date_of_birth": "1980-01-01",
+        "addresses": [{"street": "1 Retry Rd", "city": "Leeds", "state": "WY", "zip_code": "LS1", "country": "UK"}],
+    }
+    customer.update(overrides)
+    return customer
+
+@pytest.fixture(autouse=True)
+def clean_database(clean_customers):
+    idempotency.configure_idempotency_store()
+
+def test_retry_with_same_key_replays_first_response(client):
+    """REPLAY TEST: a retry gets the original 200 back without another assessment or a 409"""
+    headers = {"Idempotency-Key": "signup-1"}
+    with patch("app.services.risk_assessment.compute_risk_score_based_on_fraud_api", new=AsyncMock(return_value=LOW_RISK)) as fraud_api:
+        first = client.post("/customers/", json=make_customer(), headers=headers)
+        second = client.post("/customers/", json=make_customer(), headers=headers)
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert "Idempotent-Replayed" not in first.headers
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert fraud_api.await_count == 1
+
+def test_rejection_is_replayed_but_server_errors_are_not(client):
+    """REPLAY TEST: a 422 risk rejection is stored; a 503 is not, so the next retry runs again"""
+    with patch("app.services.risk_assessment.compute_risk_score_based_on_fraud_api", new=AsyncMock(return_value=HIGH_RISK)) as fraud_api:
+        for _ in range(2):
+            response = client.post("/customers/", json=make_customer(), headers={"Idempotency-Key": "risky"})
+            assert response.status_code == 422
+    assert fraud_api.await_count == 1
+
+    outage = HTTPException(status_code=503, detail="Fraud detection service is unavailable")
+    with patch("app.services.risk_assessment.compute_risk_score_based_on_fraud_api", new=AsyncMock(side_effect=[outage, LOW_RISK])):
+        assert client.post("/customers/", json=make_customer(), headers={"Idempotency-Key": "outage"}).status_code == 503
+        assert client.post("/customers/", json=make_customer(), headers={"Idempotency-Key": "outage"}).status_code == 200
+
+@pytest.mark.asyncio
+async def test_shared_503_keeps_its_retry_after(async_session_factory):
+    """REPLAY TEST: a duplicate waiting on a request that ends in 503 gets its Retry-After too"""
+    release = asyncio.Event()
+
+    async def busy(customer_data, client=None):
+        await release.wait()
+        raise HTTPException(status_code=503, detail="Fraud detection service is unavailable", headers={"Retry-After": "30"})
+
+    customer = CustomerCreate(**make_customer())
+    with patch("app.services.risk_assessment.compute_risk_score_based_on_fraud_api", new=busy):
+        first = asyncio.create_task(create_customer_idempotently("busy", customer, async_session_factory, None))
+        second = asyncio.create_task(create_customer_idempotently("busy", customer, async_session_factory, None))
+        await asyncio.sleep(0.05)
+        release.set()
+        responses = await asyncio.gather(first, second)
+
+    assert [r.status_code for r in responses] == [503, 503]
+    assert [r.headers["Retry-After"] for r in responses] == ["30", "30"]
+    assert responses[1].headers["Idempotent-Replayed"] == "true"
+
+def test_key_reused_with_different_payload_is_rejected(client, session_factory):
+    """FAIL TEST: the same key with another payload is a 422 and does not create a customer"""
+    with patch("app.services.risk_assessment.compute_risk_score_based_on_fraud_api", new=AsyncMock(return_value=LOW_RISK)):
+        assert client.post("/customers/", json=make_customer(), headers={"Idempotency-Key": "k"}).status_code == 200
+        response = client.post("/customers/", json=make_customer(email="other@gmail.com"), headers={"Idempotency-Key": "k"})
+    assert response.status_code == 422
+    assert "Idempotency-Key" in response.json()["detail"]
+
+    db = session_factory()
+    assert db.query(CustomerModel).count() == 1
+    db.close()
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_wait_for_in_flight_request():
+    """CONCURRENCY TEST: duplicates arriving mid-flight share the first request's result"""
+    store = IdempotencyStore(ttl=60, max_entries=10)
+    calls = 0
+
+    async def onboard():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return StoredResponse(status_code=200, body={"id": 1})
+
+    results = await asyncio.gather(*(store.execute("same", "fp", onboard) for _ in range(5)))
+    assert calls == 1
+    assert [replayed for _, replayed in results].count(False) == 1
+    assert all(response.body == {"id": 1} for response, _ in results)
+
+    with pytest.raises(IdempotencyKeyReuseError):
+        await store.execute("same", "other-fp", onboard)
+
+@pytest.mark.asyncio
+async def test_onboarding_outlives_cancelled_request(async_session_factory, session_factory):
+    """CONCURRENCY TEST: a first request cancelled mid-flight still finishes on its own session; the retry replays it"""
+    customer = CustomerCreate(**make_customer())
+    released = asyncio.Event()
+
+    async def slow_fraud_api(customer_data, client=None):
+        await released.wait()
+        return LOW_RISK
+
+    with patch("app.services.risk_assessment.compute_risk_score_based_on_fraud_api", new=slow_fraud_api):
+        first = asyncio.create_task(create_customer_idempotently("gone", customer, async_session_factory, None))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        released.set()
+        retry = await create_customer_idempotently("gone", customer, async_session_factory, None)
+
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    db = session_factory()
+    assert db.query(CustomerModel).count() == 1
+    db.close()
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,84 @@
+import sys
+import os
+import pytest
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.customer import CustomerModel, AddressModel
+from app.models.risk_assessment import RiskAssessmentModel
+
+@pytest.fixture
+def statements(async_engine):
+    """SQL statements the app runs against the test database during the test"""
+    seen = []
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record_statement)
+    yield seen
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record_statement)
+
+@pytest.fixture(autouse=True)
+def seeded_customers(setup_database, session_factory):
+    """Five customers with two addresses each; the even ones live in the UK"""
+    db = session_factory()
+    try:
+        db.query(AddressModel).delete()
+        db.query(RiskAssessmentModel).delete()
+        db.query(CustomerModel).delete()
+        for i in range(5):
+            country = "UK" if i % 2 == 0 else "India"
+            db.add(CustomerModel(
+                name=f"Page Customer {i}",
+                email=f"page{i}@gmail.com",
+                addresses=[
+                    AddressModel(street=f"{i} Main St", city="City", state="State", zip_code="111", country=country),
+                    AddressModel(street=f"{i} Side St", city="City", state="State", zip_code="222", country=country),
+                ],
+            ))
+        db.commit()
+        yield [c.id for c in db.query(CustomerModel).order_by(CustomerModel.id)]
+    finally:
+        db.close()
+
+def test_keyset_pagination_walks_all_pages(seeded_customers, client):
+    """SUCCESS TEST: following next_cursor returns every customer once, in id order"""
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = client.get("/customers/", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 2
+        seen.extend(item["id"] for item in page["items"])
+        assert all(len(item["addresses"]) == 2 for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == seeded_customers
+
+def test_page_loads_addresses_in_one_batched_query(seeded_customers, client, statements):
+    """N+1 TEST: a page costs one customer query plus one address query, regardless of size"""
+    statements.clear()
+    response = client.get("/customers/", params={"limit": 5})
+
+    assert response.status_code == 200
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 2
+
+def test_filter_by_country_and_limit_cap(seeded_customers, client):
+    """FILTER TEST: country filter applies before paging; limit above the cap is rejected"""
+    response = client.get("/customers/", params={"country": "UK"})
+    assert response.status_code == 200
+    page = response.json()
+    assert [item["email"] for item in page["items"]] == ["page0@gmail.com", "page2@gmail.com", "page4@gmail.com"]
+    assert page["next_cursor"] is None
+
+    assert client.get("/customers/", params={"limit": 10000}).status_code == 422
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,111 @@
+import sys
+import os
+import json
+import asyncio
+import httpx
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.api.v1.fraud_detection import FraudRequest, mock_score
+from app.core.config import FraudBatchSettings, FraudCacheSettings, FraudResilienceSettings
+from app.core.http_client import create_fraud_client
+from app.services import fraud_batcher, fraud_cache, fraud_resilience, risk_assessment
+
+client = TestClient(app)
+
+def payload(name):
+    return {"name": name, "address": "1 Batch Street, Leeds, UK", "date_of_birth": "1990-01-01", "email": f"{name.lower().replace(' ', '.')}@gmail.com"}
+
+def scoring_transport(calls, reject_batches=False):
+    """Mock fraud service that scores with mock_score and records (path, size) per request"""
+    def handler(request):
+        body = json.loads(request.content)
+        if request.url.path.endswith("/batch"):
+            calls.append(("batch", len(body)))
+            if reject_batches:
+                return httpx.Response(422)
+            return httpx.Response(200, json=[mock_score(FraudRequest(**item)).model_dump() for item in body])
+        calls.append(("single", 1))
+        if body["name"] == "Bad Payload":
+            return httpx.Response(422)
+        return httpx.Response(200, json=mock_score(FraudRequest(**body)).model_dump())
+    return httpx.MockTransport(handler)
+
+@pytest.fixture(autouse=True)
+def batching_enabled():
+    os.environ["FRAUD_API_URL"] = "http://test-fake-url/fraud/fraud-detection"
+    fraud_cache.configure_fraud_cache(FraudCacheSettings(enabled=False))
+    fraud_resilience.configure_fraud_resilience(FraudResilienceSettings(base_delay=0, max_delay=0))
+    fraud_batcher.configure_fraud_batcher(FraudBatchSettings(enabled=True, max_batch_size=50, max_wait=0.01))
+    yield
+    fraud_cache.configure_fraud_cache()
+    fraud_resilience.configure_fraud_resilience()
+    fraud_batcher.configure_fraud_batcher()
+
+def test_batch_endpoint_scores_each_request_in_order():
+    """SUCCESS TEST: the batch endpoint returns one FraudResult per request, in request order"""
+    requests = [payload("Alice Smith"), {**payload("Fraud Admin"), "address": "1 Scam Road, Fraudland", "email": "x@mailinator.com"}, payload("Bob Jones")]
+    response = client.post("/fraud/fraud-detection/batch", json=requests)
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["score"] for r in results] == [mock_score(FraudRequest(**r)).score for r in requests]
+    assert results[1]["category"] == "HIGH"
+
+def test_batch_endpoint_rejects_empty_batch():
+    """FAIL TEST: an empty batch is a validation error"""
+    assert client.post("/fraud/fraud-detection/batch", json=[]).status_code == 422
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_coalesced_into_one_request():
+    """BATCH TEST: concurrent fraud calls within the window share one round trip and get their own results"""
+    calls = []
+    fraud_client = create_fraud_client(transport=scoring_transport(calls))
+    names = ["Alice Smith", "Test Person", "Carol White", "Dan Brown"]
+    results = await asyncio.gather(*(risk_assessment.call_fraud_api(payload(n), fraud_client) for n in names))
+    assert calls == [("batch", 4)]
+    assert results[1] == {"score": 40, "category": "MEDIUM"}
+    assert results[0] == {"score": 0, "category": "LOW"}
+
+@pytest.mark.asyncio
+async def test_batch_is_flushed_at_max_size():
+    """BATCH TEST: a full batch is sent without waiting for the window"""
+    fraud_batcher.configure_fraud_batcher(FraudBatchSettings(enabled=True, max_batch_size=2, max_wait=10))
+    calls = []
+    fraud_client = create_fraud_client(transport=scoring_transport(calls))
+    names = ["Alice Smith", "Bob Jones", "Carol White", "Dan Brown"]
+    await asyncio.wait_for(asyncio.gather(*(risk_assessment.call_fraud_api(payload(n), fraud_client) for n in names)), timeout=2)
+    assert calls == [("batch", 2), ("batch", 2)]
+
+@pytest.mark.asyncio
+async def test_rejected_batch_falls_back_to_single_calls():
+    """FALLBACK TEST: when the batch is rejected as invalid, only the bad payload fails"""
+    calls = []
+    fraud_client = create_fraud_client(transport=scoring_transport(calls, reject_batches=True))
+    results = await asyncio.gather(
+        risk_assessment.call_fraud_api(payload("Alice Smith"), fraud_client),
+        risk_assessment.call_fraud_api(payload("Bad Payload"), fraud_client),
+        return_exceptions=True,
+    )
+    assert results[0] == {"score": 0, "category": "LOW"}
+    assert isinstance(results[1], HTTPException) and results[1].status_code == 503
+    assert calls[0] == ("batch", 2) and sorted(calls[1:]) == [("single", 1), ("single", 1)]
+
+@pytest.mark.asyncio
+async def test_failed_batch_fails_every_waiter_with_503():
+    """FAIL TEST: a transport failure of the batch call surfaces as a 503 for every waiting onboarding"""
+    def handler(request):
+        raise httpx.ConnectError("refused")
+
+    fraud_client = create_fraud_client(transport=httpx.MockTransport(handler))
+    results = await asyncio.gather(
+        *(risk_assessment.call_fraud_api(payload(n), fraud_client) for n in ["Alice Smith", "Bob Jones"]),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, HTTPException) and r.detail == "Cannot connect to fraud detection service" for r in results)
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,90 @@
+import sys
+import os
+import httpx
+import pytest
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.cache import TTLCache
+from app.core.config import FraudCacheSettings, FraudResilienceSettings
+from app.core.http_client import create_fraud_client
+from app.schemas.customer import CustomerCreate
+from app.services import fraud_cache, fraud_resilience, risk_assessment
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    os.environ["FRAUD_API_URL"] = "http://test-fake-url/fraud/fraud-detection"
+    fraud_cache.configure_fraud_cache(FraudCacheSettings(serve_stale=True, ttl=60, stale_ttl=600))
+    fraud_resilience.configure_fraud_resilience(FraudResilienceSettings(base_delay=0, max_delay=0))
+    yield
+    fraud_cache.configure_fraud_cache()
+    fraud_resilience.configure_fraud_resilience()
+
+def test_ttl_cache_lru_eviction_and_expiry():
+    """UNIT TEST: least recently used entries are evicted; expired entries are misses but stay stale-readable"""
+    clock = FakeClock()
+    cache = TTLCache(maxsize=2, ttl=10, stale_ttl=5, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b", the least recently used
+    assert cache.get("b") is None
+    assert cache.evictions == 1
+
+    clock.now += 11
+    assert cache.get("a") is None
+    assert cache.get_stale("a") == 1
+    clock.now += 5
+    assert cache.get_stale("a") is None
+    assert cache.stats()["hits"] == 1
+
+@pytest.mark.asyncio
+async def test_same_signup_hits_cache_after_normalization():
+    """CACHE TEST: case/whitespace variations of the same payload reuse one vendor decision"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={"score": 40, "category": "MEDIUM"})
+
+    client = create_fraud_client(transport=httpx.MockTransport(handler))
+    first = CustomerCreate(name="Cache  User", email="Cache@Gmail.com", date_of_birth="1990-01-01")
+    second = CustomerCreate(name="Cache User", email="cache@gmail.com", date_of_birth="1990-01-01")
+
+    assert await risk_assessment.compute_risk_score_based_on_fraud_api(first, client=client) == {"score": 40, "category": "MEDIUM"}
+    assert await risk_assessment.compute_risk_score_based_on_fraud_api(second, client=client) == {"score": 40, "category": "MEDIUM"}
+    assert len(calls) == 1
+    stats = fraud_cache.get_fraud_cache().stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+@pytest.mark.asyncio
+async def test_stale_decision_served_when_vendor_fails():
+    """STALE TEST: an expired decision is reused when the fraud service errors, otherwise the 503 surfaces"""
+    clock = FakeClock()
+    cache = fraud_cache.get_fraud_cache()
+    cache._clock = clock
+    customer = CustomerCreate(name="Stale User", email="stale@gmail.com", date_of_birth="1990-01-01")
+
+    ok_client = create_fraud_client(transport=httpx.MockTransport(lambda r: httpx.Response(200, json={"score": 10, "category": "LOW"})))
+    failing_client = create_fraud_client(transport=httpx.MockTransport(lambda r: httpx.Response(502)))
+    await risk_assessment.compute_risk_score_based_on_fraud_api(customer, client=ok_client)
+
+    clock.now += 120  # past the TTL, inside the stale window
+    assert await risk_assessment.compute_risk_score_based_on_fraud_api(customer, client=failing_client) == {"score": 10, "category": "LOW"}
+    assert cache.stale_hits == 1
+
+    clock.now += 1000  # past the stale window
+    with pytest.raises(HTTPException) as err:
+        await risk_assessment.compute_risk_score_based_on_fraud_api(customer, client=failing_client)
+    assert err.value.status_code == 503
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
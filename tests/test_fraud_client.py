@@ -0,0 +1,77 @@
+import sys
+import os
+import json
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.core.config import FraudClientSettings
+from app.core.http_client import create_fraud_client, get_fraud_client
+from app.schemas.customer import CustomerCreate
+from app.services import fraud_cache, fraud_resilience, risk_assessment
+
+fraud_calls = []
+
+def fraud_handler(request: httpx.Request) -> httpx.Response:
+    fraud_calls.append(json.loads(request.content))
+    return httpx.Response(200, json={"score": 5, "category": "LOW", "reason": {}})
+
+@pytest.fixture(autouse=True)
+def mock_fraud_client():
+    """Swap the app-scoped fraud client for one backed by a mock transport"""
+    os.environ["FRAUD_API_URL"] = "http://test-fake-url/fraud/fraud-detection"
+    fraud_calls.clear()
+    fraud_cache.configure_fraud_cache()
+    fraud_resilience.configure_fraud_resilience()
+    mock_client = create_fraud_client(transport=httpx.MockTransport(fraud_handler))
+    app.dependency_overrides[get_fraud_client] = lambda: mock_client
+    yield mock_client
+    app.dependency_overrides.pop(get_fraud_client, None)
+
+pytestmark = pytest.mark.usefixtures("clean_customers")
+
+def test_create_customer_uses_injected_fraud_client(setup_database, client):
+    """SUCCESS TEST: Onboarding goes through the injected (mock transport) fraud client"""
+    customer_data = {
+        "name": "Pooled Client",
+        "email": "pooled@gmail.com",
+        "phone": "07123456789",
+        "date_of_birth": "1990-01-01",
+        "addresses": [
+            {"street": "1 Pool St", "city": "Leeds", "state": "West Yorkshire", "zip_code": "LS1", "country": "UK"}
+        ]
+    }
+    response = client.post("/customers/", json=customer_data)
+
+    assert response.status_code == 200
+    assert len(fraud_calls) == 1
+    assert fraud_calls[0]["email"] == "pooled@gmail.com"
+    assert fraud_calls[0]["address"] == "1 Pool St, Leeds, West Yorkshire, LS1, UK"
+
+@pytest.mark.asyncio
+async def test_fraud_api_errors_map_to_503(mock_fraud_client):
+    """FAIL TEST: Upstream 5xx from the shared client is surfaced as a safe 503"""
+    from fastapi import HTTPException
+    failing_client = create_fraud_client(transport=httpx.MockTransport(lambda request: httpx.Response(500)))
+    customer = CustomerCreate(name="Err User", email="err@gmail.com", phone="07123456789", date_of_birth="1990-01-01")
+
+    with pytest.raises(HTTPException) as err:
+        await risk_assessment.compute_risk_score_based_on_fraud_api(customer, client=failing_client)
+    assert err.value.status_code == 503
+
+def test_create_fraud_client_applies_pool_settings():
+    """CONFIG TEST: Pool limits and timeouts come from FraudClientSettings"""
+    settings = FraudClientSettings(max_connections=7, max_keepalive_connections=3, keepalive_expiry=12.0, timeout=4.0, connect_timeout=1.0)
+    fraud_client = create_fraud_client(settings)
+    pool = fraud_client._transport._pool  # type: ignore[attr-defined]
+
+    assert pool._max_connections == 7
+    assert pool._max_keepalive_connections == 3
+    assert pool._keepalive_expiry == 12.0
+    assert fraud_client.timeout.read == 4.0
+    assert fraud_client.timeout.connect == 1.0
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,141 @@
+import sys
+import os
+import asyncio
+import httpx
+import pytest
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import FraudCacheSettings, FraudResilienceSettings
+from app.core.http_client import create_fraud_client
+from app.core.resilience import CircuitBreaker, RetryPolicy, call_with_retries, decorrelated_jitter
+from app.services import fraud_cache, fraud_resilience, risk_assessment
+
+PAYLOAD = {"name": "Retry User", "email": "retry@gmail.com", "date_of_birth": "1990-01-01"}
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def counting_client(*responses):
+    """Fraud client whose transport replays the given responses, repeating the last one"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        response = responses[min(len(calls), len(responses)) - 1]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return create_fraud_client(transport=httpx.MockTransport(handler)), calls
+
+@pytest.fixture(autouse=True)
+def fast_retries():
+    os.environ["FRAUD_API_URL"] = "http://test-fake-url/fraud/fraud-detection"
+    fraud_cache.configure_fraud_cache(FraudCacheSettings(enabled=False))
+    fraud_resilience.configure_fraud_resilience(FraudResilienceSettings(
+        max_attempts=3, base_delay=0, max_delay=0, attempt_timeout=0.2, breaker_failure_threshold=3,
+    ))
+    yield
+    fraud_cache.configure_fraud_cache()
+    fraud_resilience.configure_fraud_resilience()
+
+def test_breaker_opens_then_half_opens_after_reset_timeout():
+    """UNIT TEST: the breaker opens at the threshold, lets one probe through after the reset timeout, and closes on success"""
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    clock.now += 10
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # only one probe at a time
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_decorrelated_jitter_stays_within_bounds():
+    """UNIT TEST: backoff delays stay between the base delay and the cap"""
+    delay = 0.1
+    for _ in range(100):
+        delay = decorrelated_jitter(delay, 0.1, 2.0)
+        assert 0.1 <= delay <= 2.0
+
+@pytest.mark.asyncio
+async def test_transient_5xx_is_retried():
+    """RETRY TEST: a 503 followed by a success returns the successful decision"""
+    client, calls = counting_client(httpx.Response(503), httpx.Response(200, json={"score": 20, "category": "LOW"}))
+    assert await risk_assessment.call_fraud_api(PAYLOAD, client) == {"score": 20, "category": "LOW"}
+    assert len(calls) == 2
+
+@pytest.mark.asyncio
+async def test_client_error_is_not_retried():
+    """RETRY TEST: a 4xx response surfaces immediately as a 503 without further attempts"""
+    client, calls = counting_client(httpx.Response(400))
+    with pytest.raises(HTTPException) as err:
+        await risk_assessment.call_fraud_api(PAYLOAD, client)
+    assert err.value.detail == "Fraud detection service returned an error"
+    assert len(calls) == 1
+    assert fraud_resilience.get_fraud_breaker().state == CircuitBreaker.CLOSED
+
+@pytest.mark.asyncio
+async def test_slow_attempt_is_cut_off_by_attempt_timeout():
+    """TIMEOUT TEST: each attempt is bounded by the per-attempt timeout, not the client's 30s timeout"""
+    calls = []
+
+    async def slow_handler(request):
+        calls.append(request)
+        await asyncio.sleep(5)
+        return httpx.Response(200, json={"score": 0, "category": "LOW"})
+
+    client = create_fraud_client(transport=httpx.MockTransport(slow_handler))
+    with pytest.raises(HTTPException) as err:
+        await asyncio.wait_for(risk_assessment.call_fraud_api(PAYLOAD, client), timeout=2)
+    assert err.value.detail == "Fraud detection service timeout"
+    assert len(calls) == 3
+
+@pytest.mark.asyncio
+async def test_open_breaker_fails_fast_without_calling_vendor():
+    """BREAKER TEST: once the threshold is reached, calls fail with a 503 without touching the transport"""
+    client, calls = counting_client(httpx.ConnectError("refused"))
+    with pytest.raises(HTTPException) as err:
+        await risk_assessment.call_fraud_api(PAYLOAD, client)
+    assert err.value.detail == "Cannot connect to fraud detection service"
+    assert len(calls) == 3
+
+    with pytest.raises(HTTPException) as err:
+        await risk_assessment.call_fraud_api(PAYLOAD, client)
+    assert err.value.detail == "Fraud detection service is unavailable"
+    assert len(calls) == 3
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_does_not_wedge_breaker():
+    """BREAKER TEST: a half-open probe cancelled mid-call (e.g. by a rejecting tier) lets the next call probe"""
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now += 10
+    started = asyncio.Event()
+
+    async def hanging():
+        started.set()
+        await asyncio.sleep(5)
+
+    policy = RetryPolicy(max_attempts=1, attempt_timeout=5, total_timeout=5)
+    probe = asyncio.create_task(call_with_retries(hanging, policy, breaker, lambda e: True))
+    await started.wait()
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,55 @@
+import sys
+import os
+import queue
+import logging
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.logging_config import DroppingQueueHandler, SensitiveDataFilter, mask_sensitive
+
+def make_record(msg, *args, level=logging.INFO):
+    return logging.LogRecord("app.test", level, __file__, 1, msg, args, None)
+
+def test_sensitive_values_are_masked_once_in_filter():
+    """MASKING TEST: emails, phone numbers and national IDs never reach the handlers in clear text"""
+    record = make_record("Onboarding %s with phone %s: %s", "jane.doe@gmail.com", "07123456789", {"national_id": "AB123456C"})
+    assert SensitiveDataFilter().filter(record)
+    message = record.getMessage()
+    assert "jane.doe@gmail.com" not in message and "j***@gmail.com" in message
+    assert "07123456789" not in message and "********789" in message
+    assert "AB123456C" not in message
+    # Durations, counts and dates are left alone
+    assert mask_sensitive("took 0.52 seconds, 100000 inserted, dob 1990-01-01") == "took 0.52 seconds, 100000 inserted, dob 1990-01-01"
+
+def test_only_phone_formats_are_masked():
+    """MASKING TEST: E.164 numbers and phone fields are masked; order ids, amounts and timestamps are not"""
+    assert mask_sensitive("calling +447123456789") == "calling ********789"
+    assert mask_sensitive("{'phone': '07123 456789'}") == "{'phone': '********789'}"
+    for message in ("order 1234567890123 failed", "charged 12 345 678 pence", "at 1697612345123"):
+        assert mask_sensitive(message) == message
+
+def test_full_queue_drops_records_instead_of_blocking():
+    """BACKPRESSURE TEST: when the bounded queue is full, records are dropped and counted"""
+    handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+    for i in range(5):
+        handler.handle(make_record("message %s", i))
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+def test_disabled_levels_do_not_format_arguments():
+    """LAZY TEST: arguments of a disabled debug call are never rendered"""
+    rendered = []
+
+    class Expensive:
+        def __str__(self):
+            rendered.append(True)
+            return "expensive"
+
+    logger = logging.getLogger("app.test_lazy")
+    logger.setLevel(logging.INFO)
+    logger.debug("Response headers: %s", Expensive())
+    assert rendered == []
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
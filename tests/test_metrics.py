@@ -0,0 +1,80 @@
+import sys
+import os
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.core.metrics import Counter, Histogram, MetricsRegistry, REGISTRY
+from app.exceptions.HighRiskError import HighRiskError
+from app.schemas.customer import CustomerCreate
+from app.services import risk_assessment
+
+client = TestClient(app)
+
+def sample(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+def test_registry_renders_prometheus_text():
+    """FORMAT TEST: counters and cumulative histogram buckets in the text exposition format"""
+    registry = MetricsRegistry()
+    requests = Counter("jobs_total", "Jobs run", labelnames=("kind",), registry=registry)
+    latency = Histogram("job_seconds", "Job latency", buckets=(0.1, 1.0), registry=registry)
+    requests.labels("import").inc()
+    requests.labels("import").inc(2)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+
+    text = registry.render()
+    assert "# TYPE jobs_total counter" in text
+    assert 'jobs_total{kind="import"} 3.0' in text
+    assert 'job_seconds_bucket{le="0.1"} 2' in text
+    assert 'job_seconds_bucket{le="1.0"} 3' in text
+    assert 'job_seconds_bucket{le="+Inf"} 4' in text
+    assert "job_seconds_count 4" in text
+    assert sample(text, "job_seconds_sum") == pytest.approx(3.65)
+
+def test_metrics_endpoint_reports_latency_per_route_template():
+    """SUCCESS TEST: request latency is labelled with the route template, not the raw path"""
+    # A non-integer ID fails validation before the database is touched
+    client.get("/customers/not-an-id")
+    client.get("/definitely/not/a/route")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'route="/customers/{customer_id}",status="422"' in response.text
+    assert 'route="unmatched"' in response.text
+    assert "not-an-id" not in response.text
+    assert "# TYPE fraud_client_pool_connections gauge" in response.text
+    assert "# TYPE db_commit_duration_seconds histogram" in response.text
+
+@pytest.mark.asyncio
+async def test_tier_latency_and_rejection_reason_are_recorded():
+    """SUCCESS TEST: each tier is timed and a rejection is counted once, under the tier that reported it"""
+    customer = CustomerCreate(name="Test User", email="user@gmail.com", phone="07123456789", date_of_birth="1990-05-30", addresses=[])
+    before = REGISTRY.render()
+    with patch.object(
+        risk_assessment, "compute_risk_score_based_on_blacklist", return_value=False
+    ), patch.object(
+        risk_assessment, "compute_risk_score_based_on_fraud_api", new=AsyncMock(return_value={"category": "HIGH", "score": 90})
+    ), patch.object(
+        risk_assessment, "compute_risk_score_based_on_customer_data", return_value=99
+    ):
+        with pytest.raises(HighRiskError):
+            await risk_assessment.assess_customer_risk(MagicMock(), customer)
+    after = REGISTRY.render()
+
+    rejected = 'onboarding_rejections_total{reason="fraud_api"}'
+    assert sample(after, rejected) == sample(before, rejected) + 1
+    # customer_data also rejected, but the fraud tier ranks above it
+    assert sample(after, 'onboarding_rejections_total{reason="customer_data"}') == sample(before, 'onboarding_rejections_total{reason="customer_data"}')
+    passed = 'risk_tier_duration_seconds_count{tier="blacklist",outcome="passed"}'
+    assert sample(after, passed) == sample(before, passed) + 1
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
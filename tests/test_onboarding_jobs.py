@@ -0,0 +1,235 @@
+import sys
+import os
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+import httpx
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.core.config import OnboardingSettings
+from app.models.customer import CustomerModel
+from app.models.onboarding_job import OnboardingJobModel
+from app.services import onboarding_jobs
+from app.services.idempotency import configure_idempotency_store
+
+CUSTOMER = {
+    "name": "Queued Customer",
+    "email": "queued@gmail.com",
+    "phone": "07123456789",
+    "date_of_birth": "1980-01-01",
+    "addresses": [{"street": "1 High Street", "city": "Leeds", "state": "WY", "zip_code": "LS1 1AA", "country": "UK"}],
+}
+ASYNC = {"Prefer": "respond-async"}
+
+@pytest.fixture(autouse=True)
+def clean_database(async_session_factory, clean_customers):
+    yield
+    onboarding_jobs.configure_onboarding_workers(async_session_factory)
+
+class FraudVendor:
+    """Stands in for the fraud API; holds every call until released"""
+    def __init__(self, result=None, error=None):
+        self.result = result or {"category": "LOW", "score": 5}
+        self.error = error
+        self.released = asyncio.Event()
+        self.calls = 0
+
+    async def __call__(self, customer_data, client=None):
+        self.calls += 1
+        await self.released.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+@pytest.fixture
+def onboarding(async_session_factory):
+    """Runs the app against a worker pool of its own, with `vendor` standing in for the fraud API"""
+    @asynccontextmanager
+    async def run(vendor, workers=2, queue_size=10):
+        pool = onboarding_jobs.configure_onboarding_workers(
+            async_session_factory, OnboardingSettings(workers=workers, queue_size=queue_size, max_wait=5)
+        )
+        with patch("app.services.risk_assessment.compute_risk_score_based_on_fraud_api", new=vendor):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                try:
+                    yield client, pool
+                finally:
+                    vendor.released.set()
+                    await pool.stop()
+    return run
+
+@pytest.mark.asyncio
+async def test_async_onboarding_returns_202_then_long_polls_to_accepted(session_factory, onboarding):
+    """SUCCESS TEST: the client gets a job at once; a long-poll returns as soon as a worker accepts it"""
+    vendor = FraudVendor()
+    async with onboarding(vendor) as (client, pool):
+        response = await client.post("/customers/", json=CUSTOMER, headers=ASYNC)
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "PENDING" and job["customer_id"] is None
+        assert response.headers["Location"] == f"/customers/jobs/{job['id']}"
+        assert response.headers["Preference-Applied"] == "respond-async"
+
+        poll = asyncio.create_task(client.get(response.headers["Location"], params={"wait": 5}))
+        await asyncio.sleep(0.1)
+        assert not poll.done()
+        vendor.released.set()
+        done = (await poll).json()
+        assert done["status"] == "ACCEPTED"
+        customer = (await client.get(f"/customers/{done['customer_id']}")).json()
+        assert customer["email"] == CUSTOMER["email"]
+
+    db = session_factory()
+    try:
+        assert db.get(OnboardingJobModel, job["id"]).payload is None
+    finally:
+        db.close()
+
+@pytest.mark.asyncio
+async def test_job_timestamps_keep_their_utc_offset(onboarding):
+    """SUCCESS TEST: a job read back from the database reports the same UTC timestamps as the 202 did"""
+    vendor = FraudVendor()
+    vendor.released.set()
+    async with onboarding(vendor) as (client, pool):
+        accepted = (await client.post("/customers/", json=CUSTOMER, headers=ASYNC)).json()
+        job = (await client.get(f"/customers/jobs/{accepted['id']}", params={"wait": 5})).json()
+    assert job["created_at"] == accepted["created_at"]
+    assert job["created_at"].endswith("Z") and job["completed_at"].endswith("Z")
+
+@pytest.mark.asyncio
+async def test_high_risk_customer_is_rejected(session_factory, onboarding):
+    """FAILURE TEST: a failed risk assessment moves the job to REJECTED, and no customer is created"""
+    vendor = FraudVendor(result={"category": "HIGH", "score": 90})
+    vendor.released.set()
+    async with onboarding(vendor) as (client, pool):
+        job_id = (await client.post("/customers/", json=CUSTOMER, headers=ASYNC)).json()["id"]
+        job = (await client.get(f"/customers/jobs/{job_id}", params={"wait": 5})).json()
+    assert (job["status"], job["reason"]) == ("REJECTED", "Customer failed risk assessment")
+    db = session_factory()
+    try:
+        assert db.query(CustomerModel).count() == 0
+    finally:
+        db.close()
+
+@pytest.mark.asyncio
+async def test_fraud_service_outage_fails_the_job(onboarding):
+    """FAILURE TEST: when the assessment cannot complete, the job is FAILED (not REJECTED) so it can be resubmitted"""
+    vendor = FraudVendor(error=HTTPException(status_code=503, detail="Fraud detection service is unavailable"))
+    vendor.released.set()
+    async with onboarding(vendor) as (client, pool):
+        job_id = (await client.post("/customers/", json=CUSTOMER, headers=ASYNC)).json()["id"]
+        job = (await client.get(f"/customers/jobs/{job_id}", params={"wait": 5})).json()
+    assert (job["status"], job["reason"]) == ("FAILED", "Fraud detection service is unavailable")
+
+@pytest.mark.asyncio
+async def test_long_poll_gives_up_after_wait(onboarding):
+    """SUCCESS TEST: a job still PENDING is reported as such once `wait` runs out"""
+    async with onboarding(FraudVendor()) as (client, pool):
+        job_id = (await client.post("/customers/", json=CUSTOMER, headers=ASYNC)).json()["id"]
+        started = time.monotonic()
+        response = await client.get(f"/customers/jobs/{job_id}", params={"wait": 0.3})
+        assert response.json()["status"] == "PENDING"
+        assert time.monotonic() - started >= 0.3
+        assert (await client.get("/customers/jobs/unknown")).status_code == 404
+
+@pytest.mark.asyncio
+async def test_existing_customer_is_refused_at_submission(onboarding):
+    """FAILURE TEST: a known duplicate gets 409 straight away, without queueing a job"""
+    vendor = FraudVendor()
+    vendor.released.set()
+    async with onboarding(vendor) as (client, pool):
+        assert (await client.post("/customers/", json=CUSTOMER)).status_code == 200
+        response = await client.post("/customers/", json=dict(CUSTOMER, name="Someone Else"), headers=ASYNC)
+    assert response.status_code == 409
+    assert vendor.calls == 1
+
+@pytest.mark.asyncio
+async def test_full_queue_sheds_load_with_503(session_factory, onboarding):
+    """FAILURE TEST: beyond ONBOARDING_QUEUE_SIZE waiting jobs, submissions are refused and not stored"""
+    async with onboarding(FraudVendor(), workers=1, queue_size=1) as (client, pool):
+        statuses = []
+        for i in range(3):
+            payload = dict(CUSTOMER, email=f"queued{i}@gmail.com")
+            statuses.append((await client.post("/customers/", json=payload, headers=ASYNC)).status_code)
+            await asyncio.sleep(0.05)  # let the worker take the first job off the queue
+        assert statuses == [202, 202, 503]
+    db = session_factory()
+    try:
+        assert db.query(OnboardingJobModel).count() == 2
+    finally:
+        db.close()
+
+@pytest.mark.asyncio
+async def test_idempotent_async_submission_returns_the_same_job(onboarding):
+    """SUCCESS TEST: retrying a submission with its Idempotency-Key does not queue a second job"""
+    configure_idempotency_store()
+    async with onboarding(FraudVendor()) as (client, pool):
+        headers = dict(ASYNC, **{"Idempotency-Key": "async-retry"})
+        first = await client.post("/customers/", json=CUSTOMER, headers=headers)
+        retry = await client.post("/customers/", json=CUSTOMER, headers=headers)
+    assert first.status_code == retry.status_code == 202
+    assert retry.json()["id"] == first.json()["id"]
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.headers["Location"] == first.headers["Location"]
+
+@pytest.mark.asyncio
+async def test_pending_jobs_resume_on_start_and_run_once(session_factory, onboarding):
+    """SUCCESS TEST: jobs left PENDING by a restart are picked up again; a claimed job is not run twice"""
+    db = session_factory()
+    try:
+        db.add(OnboardingJobModel(id="left-behind", status="PENDING", payload=CUSTOMER))
+        db.commit()
+    finally:
+        db.close()
+
+    vendor = FraudVendor()
+    vendor.released.set()
+    async with onboarding(vendor) as (client, pool):
+        assert await pool.start() == 1
+        job = (await client.get("/customers/jobs/left-behind", params={"wait": 5})).json()
+        assert job["status"] == "ACCEPTED"
+        assert await pool.run("left-behind") is None
+    assert vendor.calls == 1
+
+@pytest.mark.asyncio
+async def test_job_interrupted_by_shutdown_runs_after_restart(onboarding):
+    """SUCCESS TEST: stopping the pool mid-job releases its claim, so the next start finishes it"""
+    async with onboarding(FraudVendor()) as (client, pool):
+        job_id = (await client.post("/customers/", json=CUSTOMER, headers=ASYNC)).json()["id"]
+        await asyncio.sleep(0.1)  # the worker has claimed the job and is waiting on the fraud API
+        await pool.stop()
+
+    vendor = FraudVendor()
+    vendor.released.set()
+    async with onboarding(vendor) as (client, pool):
+        assert await pool.start() == 1
+        job = (await client.get(f"/customers/jobs/{job_id}", params={"wait": 5})).json()
+    assert job["status"] == "ACCEPTED"
+
+@pytest.mark.asyncio
+async def test_job_abandoned_by_dead_process_is_requeued(session_factory, onboarding):
+    """SUCCESS TEST: a claim left by a crashed process is picked up once it is older than CLAIM_TIMEOUT"""
+    db = session_factory()
+    try:
+        db.add(OnboardingJobModel(id="crashed", status="PENDING", payload=CUSTOMER, started_at=datetime.now(timezone.utc)))
+        db.commit()
+    finally:
+        db.close()
+
+    vendor = FraudVendor()
+    vendor.released.set()
+    with patch.object(onboarding_jobs, "CLAIM_TIMEOUT", timedelta(seconds=0.3)):
+        async with onboarding(vendor) as (client, pool):
+            await pool.start()
+            job = (await client.get("/customers/jobs/crashed", params={"wait": 5})).json()
+    assert job["status"] == "ACCEPTED"
+    assert vendor.calls == 1
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,82 @@
+import sys
+import os
+import pstats
+import pytest
+from asgi_correlation_id import CorrelationIdMiddleware
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.core.config import ProfilingSettings
+from app.core.profiling import ProfilingMiddleware, configure_profiling, memory_snapshots
+
+client = TestClient(app)
+
+@pytest.fixture
+def profiled_client(tmp_path):
+    profiled_app = FastAPI()
+
+    @profiled_app.get("/work")
+    async def work():
+        return {"total": sum(i * i for i in range(10_000))}
+
+    profiled_app.add_middleware(ProfilingMiddleware, settings=ProfilingSettings(enabled=True, directory=str(tmp_path)))
+    profiled_app.add_middleware(CorrelationIdMiddleware)
+    return TestClient(profiled_app), tmp_path
+
+@pytest.fixture
+def admin_token():
+    configure_profiling(ProfilingSettings(admin_token="s3cret"))
+    yield {"X-Admin-Token": "s3cret"}
+    memory_snapshots.stop()
+    configure_profiling(ProfilingSettings())
+
+def test_profile_is_written_under_the_correlation_id(profiled_client):
+    """SUCCESS TEST: a request with X-Profile leaves a cProfile dump named after its request ID"""
+    client, directory = profiled_client
+    response = client.get("/work", headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    path = directory / f"{response.headers['X-Request-ID']}.prof"
+    assert path.exists()
+    assert pstats.Stats(str(path)).total_calls > 0
+
+def test_requests_without_the_header_are_not_profiled(profiled_client):
+    """SUCCESS TEST: profiling is opt-in per request"""
+    client, directory = profiled_client
+    assert client.get("/work").status_code == 200
+    assert list(directory.iterdir()) == []
+
+def test_admin_endpoints_require_configured_token():
+    """FAILURE TEST: admin endpoints are hidden without ADMIN_TOKEN and reject a wrong token"""
+    configure_profiling(ProfilingSettings())
+    assert client.post("/admin/tracemalloc/start").status_code == 404
+    configure_profiling(ProfilingSettings(admin_token="s3cret"))
+    try:
+        assert client.post("/admin/tracemalloc/start", headers={"X-Admin-Token": "wrong"}).status_code == 403
+        assert client.post("/admin/tracemalloc/start").status_code == 403
+    finally:
+        configure_profiling(ProfilingSettings())
+
+def test_snapshot_diff_reports_growth(admin_token):
+    """SUCCESS TEST: allocations made between two snapshots show up in their diff"""
+    assert client.post("/admin/tracemalloc/snapshots", headers=admin_token).status_code == 409
+    assert client.post("/admin/tracemalloc/start", headers=admin_token).json()["tracing"] is True
+
+    base = client.post("/admin/tracemalloc/snapshots", headers=admin_token).json()["id"]
+    retained = [bytearray(1024) for _ in range(2000)]
+    current = client.post("/admin/tracemalloc/snapshots", headers=admin_token).json()["id"]
+
+    response = client.get("/admin/tracemalloc/diff", params={"base": base, "current": current}, headers=admin_token)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total_diff_kib"] >= 1500
+    assert any("test_profiling.py" in row["location"] and row["size_diff_kib"] >= 1500 for row in body["top"])
+    assert len(retained) == 2000
+
+    assert client.get("/admin/tracemalloc/diff", params={"base": 999}, headers=admin_token).status_code == 404
+    assert client.post("/admin/tracemalloc/stop", headers=admin_token).json()["tracing"] is False
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
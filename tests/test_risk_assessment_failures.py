@@ -1,5 +1,7 @@
 import sys
 import os
+import asyncio
+import time
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 from fastapi import HTTPException
@@ -71,3 +73,67 @@ class TestRiskAssessmentFailures:
             with pytest.raises(HighRiskError) as err:
                 await risk_assessment.assess_customer_risk(mock_db, valid_customer)
             assert "Customer is on the blacklist" in str(err.value)
+
+    async def test_blacklist_hit_cancels_pending_fraud_call(self, mock_db, valid_customer):
+        # The fraud API is slow; a blacklist hit must reject without waiting for it
+        fraud_cancelled = asyncio.Event()
+
+        async def slow_fraud_api(*args, **kwargs):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                fraud_cancelled.set()
+                raise
+            return {"category": "LOW", "score": 0}
+
+        with patch.object(
+            risk_assessment, "compute_risk_score_based_on_blacklist", return_value=True
+        ), patch.object(
+            risk_assessment, "compute_risk_score_based_on_fraud_api", new=slow_fraud_api
+        ):
+            started = time.perf_counter()
+            with pytest.raises(HighRiskError) as err:
+                await risk_assessment.assess_customer_risk(mock_db, valid_customer)
+            assert time.perf_counter() - started < 1
+            assert "Customer is on the blacklist" in str(err.value)
+            assert fraud_cancelled.is_set()
+
+    async def test_tiers_overlap_and_keep_sequential_precedence(self, mock_db, valid_customer):
+        # Local scoring rejects first, but the fraud tier ranks above it and its reason wins, as before
+        async def slow_fraud_api(*args, **kwargs):
+            await asyncio.sleep(0.2)
+            return {"category": "HIGH", "score": 90}
+
+        async def slow_blacklist(*args, **kwargs):
+            await asyncio.sleep(0.2)
+            return False
+
+        with patch.object(
+            risk_assessment, "compute_risk_score_based_on_customer_data", return_value=35
+        ), patch.object(
+            risk_assessment, "compute_risk_score_based_on_blacklist", new=slow_blacklist
+        ), patch.object(
+            risk_assessment, "compute_risk_score_based_on_fraud_api", new=slow_fraud_api
+        ):
+            started = time.perf_counter()
+            with pytest.raises(HighRiskError) as err:
+                await risk_assessment.assess_customer_risk(mock_db, valid_customer)
+            assert time.perf_counter() - started < 0.35
+            assert "flagged as high risk by fraud detection service" in str(err.value)
+
+    async def test_fraud_error_surfaces_unless_blacklisted(self, mock_db, valid_customer):
+        # A fraud API outage is still a 503, except when the blacklist already rejects the customer
+        with patch.object(
+            risk_assessment, "compute_risk_score_based_on_customer_data", return_value=35
+        ), patch.object(
+            risk_assessment, "compute_risk_score_based_on_blacklist", return_value=False
+        ), patch.object(
+            risk_assessment, "compute_risk_score_based_on_fraud_api", new=AsyncMock(side_effect=HTTPException(status_code=503))
+        ):
+            with pytest.raises(HTTPException):
+                await risk_assessment.assess_customer_risk(mock_db, valid_customer)
+
+            with patch.object(risk_assessment, "compute_risk_score_based_on_blacklist", return_value=True):
+                with pytest.raises(HighRiskError) as err:
+                    await risk_assessment.assess_customer_risk(mock_db, valid_customer)
+                assert "Customer is on the blacklist" in str(err.value)
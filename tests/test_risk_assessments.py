@@ -0,0 +1,156 @@
+import sys
+import os
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.blacklist import BlacklistModel
+from app.models.customer import CustomerModel
+from app.models.risk_assessment import RiskAssessmentModel
+from app.services import risk_assessment
+from app.services.blacklist_matcher import blacklist_matcher
+from app.services.risk_rules import compile_rules
+
+check_blacklist = risk_assessment.compute_risk_score_based_on_blacklist
+
+CUSTOMER = {
+    "name": "Assessed Customer",
+    "email": "assessed@gmail.com",
+    "phone": "07123456789",
+    "date_of_birth": "1980-01-01",
+    "addresses": [{"street": "1 High Street", "city": "Leeds", "state": "WY", "zip_code": "LS1 1AA", "country": "UK"}],
+}
+
+@pytest.fixture(autouse=True)
+def tiers(monkeypatch, clean_customers):
+    """Counting stand-ins for the blacklist and fraud API tiers; customer-data scoring runs for real"""
+    counters = {
+        "blacklist": AsyncMock(return_value=False),
+        "fraud_api": AsyncMock(return_value={"category": "LOW", "score": 12}),
+        "customer_data": MagicMock(wraps=risk_assessment.compute_risk_score_based_on_customer_data),
+    }
+    monkeypatch.setattr(risk_assessment, "compute_risk_score_based_on_blacklist", counters["blacklist"])
+    monkeypatch.setattr(risk_assessment, "compute_risk_score_based_on_fraud_api", counters["fraud_api"])
+    monkeypatch.setattr(risk_assessment, "compute_risk_score_based_on_customer_data", counters["customer_data"])
+    return counters
+
+def onboard(client, tiers):
+    response = client.post("/customers/", json=CUSTOMER)
+    assert response.status_code == 200
+    for counter in tiers.values():
+        counter.reset_mock()
+    return response.json()["id"]
+
+def runs(tiers):
+    return {tier for tier, counter in tiers.items() if counter.call_count}
+
+def test_onboarding_stores_every_tier(tiers, client):
+    """SUCCESS TEST: the risk endpoint is served from the stored per-tier results"""
+    customer_id = onboard(client, tiers)
+    response = client.get(f"/customers/{customer_id}/risk")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "approved"
+    assert (body["score"], body["rules_version"]) == (5, "2024.1")
+    assert [tier["tier"] for tier in body["tiers"]] == ["blacklist", "fraud_api", "customer_data"]
+    assert body["tiers"][1]["score"] == 12 and body["tiers"][1]["detail"] == "LOW"
+    assert "input_hash" not in body["tiers"][0]
+    assert all(tier["assessed_at"].endswith("Z") for tier in body["tiers"])
+
+def test_update_reruns_only_tiers_whose_inputs_changed(tiers, client):
+    """SUCCESS TEST: a new phone number re-runs the customer-data tier (and the blacklist), not the fraud API"""
+    customer_id = onboard(client, tiers)
+    stored_fraud_result = client.get(f"/customers/{customer_id}/risk").json()["tiers"][1]
+
+    response = client.put(f"/customers/{customer_id}", json={"name": CUSTOMER["name"], "phone": "07999999999"})
+    assert response.status_code == 200
+    assert runs(tiers) == {"blacklist", "customer_data"}
+    assert client.get(f"/customers/{customer_id}/risk").json()["tiers"][1] == stored_fraud_result
+
+def test_update_with_unchanged_inputs_reuses_everything(tiers, client):
+    """SUCCESS TEST: changing a field no tier reads reuses every stored result; only the blacklist is checked"""
+    customer_id = onboard(client, tiers)
+    assert client.put(f"/customers/{customer_id}", json={"name": CUSTOMER["name"], "national_id": "AB123456C"}).status_code == 200
+    assert runs(tiers) == {"blacklist"}
+
+def test_customer_blacklisted_after_onboarding_fails_update(tiers, monkeypatch, client, session_factory):
+    """FAILURE TEST: a stored blacklist pass is not reused once the customer has been blacklisted"""
+    monkeypatch.setattr(risk_assessment, "compute_risk_score_based_on_blacklist", check_blacklist)
+    customer_id = onboard(client, tiers)
+    entry = {key: CUSTOMER[key] for key in ("name", "email", "phone", "date_of_birth")}
+    try:
+        assert client.post("/blacklist/", json=entry).status_code == 200
+        response = client.put(f"/customers/{customer_id}", json={"name": CUSTOMER["name"], "national_id": "AB123456C"})
+        assert response.status_code == 422
+        assert client.get(f"/customers/{customer_id}").json()["national_id"] is None
+    finally:
+        db = session_factory()
+        try:
+            db.query(BlacklistModel).delete()
+            db.commit()
+        finally:
+            db.close()
+        blacklist_matcher.clear()
+
+def test_new_address_is_sent_to_fraud_api(tiers, client):
+    """SUCCESS TEST: the fraud API is called again when the address it is sent changes"""
+    customer_id = onboard(client, tiers)
+    address = dict(CUSTOMER["addresses"][0], street="2 Low Road")
+    assert client.put(f"/customers/{customer_id}", json={"name": CUSTOMER["name"], "addresses": [address]}).status_code == 200
+    assert runs(tiers) == {"blacklist", "fraud_api"}
+
+def test_new_rules_version_rescores_customer_data(tiers, client):
+    """SUCCESS TEST: the rules version is part of the customer-data inputs; the new score is stored"""
+    customer_id = onboard(client, tiers)
+    rules = compile_rules({"version": "2025.1", "threshold": 30, "rules": [{"field": "phone", "op": "startswith", "value": "07", "score": 7}]})
+    with patch.object(risk_assessment, "get_risk_rules", return_value=rules):
+        updated = client.put(f"/customers/{customer_id}", json={"name": CUSTOMER["name"]})
+    assert updated.status_code == 200
+    assert (updated.json()["score"], updated.json()["rules_version"]) == (7, "2025.1")
+    assert runs(tiers) == {"blacklist", "customer_data"}
+    assert client.get(f"/customers/{customer_id}/risk").json()["score"] == 7
+
+def test_update_failing_risk_assessment_is_rejected(tiers, client):
+    """FAILURE TEST: an update that makes the customer high risk is refused and nothing changes"""
+    customer_id = onboard(client, tiers)
+    tiers["fraud_api"].return_value = {"category": "HIGH", "score": 90}
+    address = dict(CUSTOMER["addresses"][0], country="Elsewhere")
+    response = client.put(f"/customers/{customer_id}", json={"name": CUSTOMER["name"], "addresses": [address]})
+    assert response.status_code == 422
+    assert client.get(f"/customers/{customer_id}").json()["addresses"][0]["country"] == "UK"
+    assert client.get(f"/customers/{customer_id}/risk").json()["tiers"][1]["detail"] == "LOW"
+
+def test_customers_without_stored_assessment(tiers, client, session_factory):
+    """FAILURE TEST: customers onboarded before this table existed are unassessed; unknown ids are 404"""
+    db = session_factory()
+    try:
+        legacy = CustomerModel(name="Legacy Customer", email="legacy@gmail.com", risk_score=5)
+        db.add(legacy)
+        db.commit()
+        legacy_id = legacy.id
+    finally:
+        db.close()
+    assert client.get(f"/customers/{legacy_id}/risk").json() == {
+        "customer_id": legacy_id, "status": "unassessed", "score": None, "rules_version": None, "tiers": [],
+    }
+    assert client.get(f"/customers/{legacy_id + 1}/risk").status_code == 404
+
+    # The first update assesses every tier and stores the results
+    assert client.put(f"/customers/{legacy_id}", json={"name": "Legacy Customer"}).status_code == 200
+    assert runs(tiers) == {"blacklist", "fraud_api", "customer_data"}
+    assert client.get(f"/customers/{legacy_id}/risk").json()["status"] == "approved"
+
+def test_delete_removes_stored_assessments(tiers, client, session_factory):
+    """SUCCESS TEST: deleting a customer deletes its assessments"""
+    customer_id = onboard(client, tiers)
+    assert client.delete(f"/customers/{customer_id}").status_code == 204
+    db = session_factory()
+    try:
+        assert db.query(RiskAssessmentModel).count() == 0
+    finally:
+        db.close()
+    assert client.get(f"/customers/{customer_id}/risk").status_code == 404
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
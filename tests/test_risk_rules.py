@@ -0,0 +1,145 @@
+import sys
+import os
+import json
+import pytest
+from datetime import date, datetime
+from unittest.mock import patch, AsyncMock
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import RiskRulesSettings
+from app.core.migrations import upgrade_schema
+from app.exceptions.HighRiskError import HighRiskError
+from app.models.customer import CustomerModel, AddressModel
+from app.models.risk_assessment import RiskAssessmentModel
+from app.schemas.customer import CustomerCreate
+from app.services import risk_assessment, risk_rules
+
+LOW_RISK = {"category": "LOW", "score": 0}
+
+def legacy_score(customer):
+    """The hard-coded scoring the default rules file replaces"""
+    score = 0
+    if customer.date_of_birth:
+        age = (date.today() - datetime.strptime(customer.date_of_birth, "%Y-%m-%d").date()).days // 365
+        score += 20 if age < 25 else 10 if age < 40 else 5
+    if customer.phone and not customer.phone.startswith("07"):
+        score += 15
+    if customer.email and customer.email.endswith("@example.com"):
+        score += 25
+    return score
+
+def write_rules(path, version, threshold=30, rules=None):
+    document = {"version": version, "threshold": threshold, "rules": rules if rules is not None else [
+        {"name": "example_email", "field": "email", "op": "endswith", "value": "@example.com", "score": 25},
+    ]}
+    path.write_text(json.dumps(document))
+
+@pytest.fixture(autouse=True)
+def default_rules():
+    risk_rules.configure_risk_rules(RiskRulesSettings())
+    yield
+    risk_rules.configure_risk_rules()
+
+@pytest.mark.parametrize("dob", [None, "2000-01-01", "1990-06-15", "1960-12-31"])
+@pytest.mark.parametrize("phone", [None, "07123456789", "02012345678"])
+@pytest.mark.parametrize("email", ["a@gmail.com", "a@example.com"])
+def test_default_rules_reproduce_legacy_scoring(dob, phone, email):
+    """EQUIVALENCE TEST: the shipped rules file scores exactly like the old hard-coded rules"""
+    customer = CustomerCreate(name="Rules User", email=email, phone=phone, date_of_birth=dob)
+    assert risk_assessment.compute_risk_score_based_on_customer_data(customer) == legacy_score(customer)
+
+def test_invalid_rules_are_rejected():
+    """FAIL TEST: unknown fields and operators, values of the wrong type and non-object rules fail compilation"""
+    with pytest.raises(risk_rules.RiskRulesError):
+        risk_rules.compile_rules({"version": "x", "threshold": 1, "rules": [{"field": "salary", "op": "gt", "value": 1, "score": 1}]})
+    with pytest.raises(risk_rules.RiskRulesError):
+        risk_rules.compile_rules({"version": "x", "threshold": 1, "rules": [{"field": "email", "op": "soundslike", "value": "x", "score": 1}]})
+    for rule in (
+        {"field": "age", "op": "gt", "value": "65", "score": 1},
+        {"field": "age", "bands": [{"below": "25", "score": 1}]},
+        {"field": "country", "op": "in", "value": ["UK", 1], "score": 1},
+        {"field": "phone", "op": "startswith", "value": 7, "score": 1},
+        ["age", "gt", 65],
+        "age > 65",
+    ):
+        with pytest.raises(risk_rules.RiskRulesError):
+            risk_rules.compile_rules({"version": "x", "threshold": 1, "rules": [rule]})
+
+def test_hot_reload_swaps_rules_and_keeps_them_on_bad_file(tmp_path):
+    """RELOAD TEST: a changed file is picked up; a broken one is ignored and the last good rules stay active"""
+    path = tmp_path / "rules.json"
+    write_rules(path, "v1")
+    registry = risk_rules.RiskRulesRegistry(str(path))
+    customer = CustomerCreate(name="Reload User", email="reload@example.com")
+    assert registry.current.evaluate(customer) == (25, ["example_email"])
+    assert not registry.reload_if_changed()
+
+    write_rules(path, "v2", rules=[{"name": "example_email", "field": "email", "op": "endswith", "value": "@example.com", "score": 40}])
+    os.utime(path, ns=(1, 1))
+    assert registry.reload_if_changed()
+    assert registry.current.version == "v2"
+    assert registry.current.evaluate(customer)[0] == 40
+
+    path.write_text("{not json")
+    assert not registry.reload_if_changed()
+    assert registry.current.version == "v2"
+
+    write_rules(path, "v3", rules=[{"name": "senior", "field": "age", "op": "gt", "value": "65", "score": 10}])
+    os.utime(path, ns=(2, 2))
+    assert not registry.reload_if_changed()
+    assert registry.current.evaluate(customer)[0] == 40
+
+@pytest.mark.asyncio
+async def test_threshold_comes_from_rules_file(tmp_path):
+    """FAIL TEST: the rejection threshold is read from the rules file"""
+    path = tmp_path / "rules.json"
+    write_rules(path, "strict", threshold=10)
+    risk_rules.configure_risk_rules(RiskRulesSettings(path=str(path)))
+    customer = CustomerCreate(name="Strict User", email="strict@example.com")
+    with patch.object(risk_assessment, "compute_risk_score_based_on_blacklist", return_value=False), \
+         patch.object(risk_assessment, "compute_risk_score_based_on_fraud_api", new=AsyncMock(return_value=LOW_RISK)):
+        with pytest.raises(HighRiskError):
+            await risk_assessment.assess_customer_risk(None, customer)
+
+def test_score_and_rules_version_are_stored(setup_database, client, session_factory):
+    """SUCCESS TEST: onboarding records the score and the rule-set version that produced it"""
+    customer = {"name": "Versioned User", "email": "versioned@gmail.com", "phone": "07123456789", "date_of_birth": "1980-01-01", "addresses": []}
+    with patch("app.services.risk_assessment.compute_risk_score_based_on_fraud_api", new=AsyncMock(return_value=LOW_RISK)):
+        response = client.post("/customers/", json=customer)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["score"] == 5
+    assert body["rules_version"] == risk_rules.get_risk_rules().version
+
+    db = session_factory()
+    try:
+        stored = db.query(CustomerModel).filter_by(email="versioned@gmail.com").one()
+        assert (stored.risk_score, stored.risk_rules_version) == (5, body["rules_version"])
+        db.query(AddressModel).delete()
+        db.query(RiskAssessmentModel).delete()
+        db.query(CustomerModel).delete()
+        db.commit()
+    finally:
+        db.close()
+
+@pytest.mark.asyncio
+async def test_upgrade_schema_adds_rules_version_column(tmp_path):
+    """MIGRATION TEST: an existing customers table gains the risk_rules_version column"""
+    path = tmp_path / "legacy.db"
+    legacy = create_engine(f"sqlite:///{path}")
+    with legacy.begin() as conn:
+        conn.execute(text("CREATE TABLE customers (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, email VARCHAR NOT NULL, phone VARCHAR, date_of_birth VARCHAR, national_id VARCHAR, risk_score INTEGER)"))
+
+    upgrade_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    applied = await upgrade_schema(upgrade_engine)
+    await upgrade_engine.dispose()
+
+    assert "customers.risk_rules_version" in applied
+    assert "risk_rules_version" in {column["name"] for column in inspect(legacy).get_columns("customers")}
+    legacy.dispose()
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,97 @@
+import sys
+import os
+import pytest
+from dotenv import load_dotenv
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.main as main
+from app.main import app
+from app.core.config import ProfilingSettings
+from app.core.database import Database, configure_database
+from app.core.profiling import configure_profiling
+from app.core.startup import startup_state
+from app.services.blacklist_matcher import blacklist_matcher
+from app.services.onboarding_jobs import OnboardingWorkerPool
+
+@pytest.fixture
+def isolated_lifespan(tmp_path, monkeypatch):
+    # Run the real lifespan against a throwaway database, leaving the test process's logging alone
+    monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'startup.db'}")
+    monkeypatch.setattr(main, "configure_logging", lambda: None)
+    yield
+    blacklist_matcher.clear()
+    startup_state.begin()
+    monkeypatch.delenv("DATABASE_URL")
+    configure_database()
+
+def test_importing_the_app_has_no_startup_side_effects():
+    """SUCCESS TEST: readiness is only reported by the lifespan, not at import"""
+    response = TestClient(app).get("/health/ready")
+    assert response.status_code == 503
+    assert response.json() == {"status": "starting"}
+    assert TestClient(app).get("/health/live").status_code == 200
+
+def test_lifespan_reports_ready_with_timed_phases(isolated_lifespan):
+    """SUCCESS TEST: every startup phase is timed and readiness flips on, then off at shutdown"""
+    with TestClient(app) as client:
+        response = client.get("/health/ready")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "ready"
+        assert list(body["phases_ms"]) == ["environment", "logging", "database", "schema", "fraud_client", "blacklist", "risk_rules", "warmup", "onboarding_workers"]
+        assert 'startup_phase_duration_seconds{phase="schema"}' in client.get("/metrics").text
+    assert startup_state.status == "stopping"
+
+def test_schema_upgrade_and_warmup_can_be_skipped(isolated_lifespan, monkeypatch):
+    """SUCCESS TEST: STARTUP_SCHEMA_UPGRADE and STARTUP_WARMUP turn those phases off"""
+    monkeypatch.setenv("STARTUP_SCHEMA_UPGRADE", "false")
+    monkeypatch.setenv("STARTUP_WARMUP", "false")
+    # The blacklist and onboarding phases still need their tables
+    monkeypatch.setattr(main.blacklist_matcher, "sync", lambda db: _noop())
+    monkeypatch.setattr(OnboardingWorkerPool, "start", lambda self: _noop())
+    with TestClient(app) as client:
+        phases = client.get("/health/ready").json()["phases_ms"]
+    assert "schema" not in phases and "warmup" not in phases
+
+def test_failed_startup_tears_down_earlier_phases(isolated_lifespan, monkeypatch):
+    """FAILURE TEST: a phase that raises still closes the fraud client and database opened before it"""
+    closed = []
+    async def close_fraud_client():
+        closed.append("fraud_client")
+    def broken_rules(settings):
+        raise ValueError("bad rules file")
+    monkeypatch.setattr(main, "close_fraud_client", close_fraud_client)
+    monkeypatch.setattr(main, "configure_risk_rules", broken_rules)
+    dispose = Database.dispose
+    async def recording_dispose(self):
+        closed.append("database")
+        await dispose(self)
+    monkeypatch.setattr(Database, "dispose", recording_dispose)
+    with pytest.raises(ValueError, match="bad rules file"):
+        with TestClient(app):
+            pass
+    assert closed == ["fraud_client", "database"]
+
+def test_profiling_settings_come_from_dotenv(isolated_lifespan, tmp_path, monkeypatch):
+    """SUCCESS TEST: PROFILING_ENABLED and ADMIN_TOKEN set only in .env reach the middleware and /admin"""
+    env_file = tmp_path / ".env"
+    env_file.write_text(f"PROFILING_ENABLED=true\nPROFILING_DIR={tmp_path / 'profiles'}\nADMIN_TOKEN=from-dotenv\n")
+    monkeypatch.setattr(main, "load_dotenv", lambda: load_dotenv(env_file))
+    try:
+        with TestClient(app) as client:
+            response = client.post("/admin/tracemalloc/stop", headers={"X-Admin-Token": "from-dotenv"})
+            assert response.status_code == 200
+            response = client.get("/health/live", headers={"X-Profile": "1"})
+            assert (tmp_path / "profiles" / f"{response.headers['X-Request-ID']}.prof").exists()
+    finally:
+        for name in ("PROFILING_ENABLED", "PROFILING_DIR", "ADMIN_TOKEN"):
+            os.environ.pop(name, None)
+        configure_profiling(ProfilingSettings())
+
+async def _noop():
+    return 0
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,59 @@
+import sys
+import os
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import StorageSettings
+from app.core.database import Base, Database
+from app.models.customer import CustomerModel
+
+async def create_database(path):
+    database = Database(StorageSettings(url=f"sqlite+aiosqlite:///{path}", busy_timeout=1234))
+    async with database.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return database
+
+@pytest.mark.asyncio
+async def test_writer_connections_get_the_tuned_pragmas(tmp_path):
+    """SUCCESS TEST: WAL journaling, synchronous=NORMAL and the busy timeout are applied on connect"""
+    database = await create_database(tmp_path / "storage.db")
+    try:
+        async with database.engine.connect() as conn:
+            assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+            assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1
+            assert (await conn.execute(text("PRAGMA busy_timeout"))).scalar() == 1234
+        assert database.engine.pool.size() == 1
+    finally:
+        await database.dispose()
+
+@pytest.mark.asyncio
+async def test_read_pool_sees_commits_but_cannot_write(tmp_path):
+    """SUCCESS TEST: readers see committed rows; FAILURE TEST: a write through the read pool is refused"""
+    database = await create_database(tmp_path / "storage.db")
+    try:
+        async with database.session_factory() as db:
+            db.add(CustomerModel(name="Reader Test", email="reader@gmail.com"))
+            await db.commit()
+
+        async with database.read_session_factory() as db:
+            assert (await db.execute(text("SELECT COUNT(*) FROM customers"))).scalar() == 1
+            with pytest.raises(OperationalError, match="readonly"):
+                await db.execute(text("DELETE FROM customers"))
+    finally:
+        await database.dispose()
+
+def test_in_memory_database_shares_one_engine():
+    """SUCCESS TEST: without a file there is nothing for a second pool to read"""
+    database = Database(StorageSettings(url="sqlite+aiosqlite://"))
+    assert database.read_engine is database.engine
+
+def test_unknown_pragma_values_are_rejected(tmp_path):
+    """FAILURE TEST: pragma values from the environment are checked before they reach SQL"""
+    with pytest.raises(ValueError, match="SQLITE_JOURNAL_MODE"):
+        Database(StorageSettings(url=f"sqlite+aiosqlite:///{tmp_path / 'x.db'}", journal_mode="WAL; DROP TABLE customers"))
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])